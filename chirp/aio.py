@@ -0,0 +1,417 @@
+# Copyright 2026 The CHIRP developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Cooperative radio I/O, for driving many radios from one thread.
+
+A driver opts in by providing coroutine variants of its operations,
+named after them with an _async suffix (sync_in_async, sync_out_async,
+get_memory_async). A coroutine is a generator that yields what it is
+waiting for:
+
+    data = yield stream.wait_exact(count, timeout=1.0)
+    yield sleep(0.03)
+    mem = yield other_coroutine()
+
+and raises Return(value) to return a value. A Loop runs any number of
+them as Tasks, waiting on all of their ports at once (but only one task
+at a time should talk to any one radio). Tasks can be
+cancelled (from any thread) or given a timeout, either of which raises
+Cancelled in the coroutine at the point where it is waiting.
+
+run_blocking() runs a coroutine without a Loop, doing each wait as the
+equivalent blocking read, so that a driver's synchronous operations can
+share their protocol code with the coroutine variants.
+"""
+
+import logging
+import select
+import threading
+import time
+import types
+
+from chirp import errors, transport
+
+LOG = logging.getLogger(__name__)
+
+# Longest the loop waits without looking for cancelled tasks, and how
+# often it polls pipes that can not be waited on with select()
+POLL_INTERVAL = 0.05
+
+
+class Cancelled(errors.RadioError):
+    """A task was cancelled or ran out of time"""
+    pass
+
+
+class Return(BaseException):
+    """Raised by a coroutine to return @value to whatever is waiting on it.
+
+    This is not an Exception, so that it passes through the usual
+    "except Exception" handlers in drivers."""
+
+    def __init__(self, value=None):
+        BaseException.__init__(self)
+        self.value = value
+
+
+class _Wait(object):
+    def __init__(self, timeout):
+        if timeout is None:
+            self.deadline = None
+        else:
+            self.deadline = time.time() + timeout
+
+    def ready(self):
+        """Return (True, value) if the wait is over"""
+        return False, None
+
+    def expired(self):
+        """Return the exception for a wait that has run out of time"""
+        return None
+
+    def block(self):
+        """Wait in the calling thread, returning the value or raising the
+        error that the coroutine would be resumed with"""
+        raise NotImplementedError()
+
+
+class _Sleep(_Wait):
+    def ready(self):
+        return time.time() >= self.deadline, None
+
+    def block(self):
+        time.sleep(max(0, self.deadline - time.time()))
+
+
+class _Read(_Wait):
+    def __init__(self, stream, timeout, count=None, delimiter=None,
+                 partial=False, attempts=None):
+        _Wait.__init__(self, timeout)
+        self.stream = stream
+        self.count = count
+        self.delimiter = delimiter
+        self.partial = partial
+        self.attempts = attempts
+
+    def ready(self):
+        self.stream.poll()
+        if self.delimiter is not None:
+            data = self.stream.take_until(self.delimiter)
+            return data is not None, data
+        if len(self.stream) >= self.count:
+            return True, self.stream.take(self.count)
+        return False, None
+
+    def expired(self):
+        if self.partial:
+            return Return(self.stream.take(self.count))
+        self.stream.stats.timeouts += 1
+        if self.delimiter is not None:
+            # As with read_until(), give back whatever did arrive
+            return Return(self.stream.take(len(self.stream)))
+        return errors.RadioError(
+            "Timed out reading from radio (%i/%i bytes)" % (len(self.stream),
+                                                            self.count))
+
+    def block(self):
+        if self.partial:
+            # The pipe's own timeout stands in for ours
+            return self.stream.read(self.count)
+        if self.attempts:
+            deadline = None
+        else:
+            deadline = self.deadline
+        if self.delimiter is not None:
+            return self.stream.read_until(self.delimiter, deadline=deadline,
+                                          attempts=self.attempts or 1)
+        return self.stream.read_exact(self.count, deadline=deadline,
+                                      attempts=self.attempts or 1)
+
+
+def sleep(secs):
+    """Return a wait for a coroutine to yield to pause for @secs"""
+    return _Sleep(secs)
+
+
+class AsyncTransport(transport.SerialTransport):
+    """A SerialTransport whose reads are waited for by yielding them from
+    a coroutine, instead of blocking"""
+
+    def fileno(self):
+        """Return the pipe's file descriptor, or None if it has none"""
+        try:
+            return self.pipe.fileno()
+        except Exception:
+            return None
+
+    def poll(self):
+        """Take whatever the pipe has received, without blocking"""
+        waiting = self._waiting()
+        if waiting:
+            self._fill(waiting)
+
+    def take(self, count):
+        """Return up to @count buffered bytes"""
+        return self._take(min(count, len(self)))
+
+    def take_until(self, delimiter):
+        """Return the buffered data up to and including @delimiter, or
+        None if it has not arrived yet"""
+        index = self._buf.find(delimiter, self._start, self._end)
+        if index < 0:
+            return None
+        return self._take(index + len(delimiter) - self._start)
+
+    def wait_exact(self, count, timeout=1.0, attempts=None):
+        """Return a wait for exactly @count bytes. RadioError is raised if
+        they do not arrive within @timeout seconds (or, under
+        run_blocking(), after @attempts reads of the pipe if given)."""
+        return _Read(self, timeout, count=count, attempts=attempts)
+
+    def wait_until(self, delimiter, timeout=1.0, attempts=None):
+        """Return a wait for the data up to and including @delimiter.
+        Whatever did arrive is returned if it does not come within
+        @timeout seconds (or @attempts reads, as for wait_exact())."""
+        return _Read(self, timeout, delimiter=delimiter, attempts=attempts)
+
+    def wait_read(self, count, timeout=0.25):
+        """Return a wait for up to @count bytes, giving back whatever
+        arrived (possibly nothing) after @timeout seconds. Like read(),
+        this does a single read of the pipe under run_blocking()."""
+        return _Read(self, timeout, count=count, partial=True)
+
+
+class Task(object):
+    """A coroutine being run by a Loop"""
+
+    def __init__(self, coro, timeout=None, name=None):
+        self.name = name or getattr(coro, "__name__", "task")
+        self.result = None
+        self.error = None
+        self._stack = [coro]
+        self._wait = None
+        self._cancel = None
+        self._done = threading.Event()
+        self._callbacks = []
+        if timeout is None:
+            self.deadline = None
+        else:
+            self.deadline = time.time() + timeout
+
+    def __str__(self):
+        return self.name
+
+    def done(self):
+        """Return True if the task has finished, one way or another"""
+        return self._done.is_set()
+
+    def cancel(self, reason="Cancelled"):
+        """Ask the task to stop, at the next point where it waits"""
+        if not self.done():
+            self._cancel = Cancelled(reason)
+
+    def wait(self, timeout=None):
+        """Block until the task finishes (when the loop runs in another
+        thread), returning True if it did"""
+        return self._done.wait(timeout)
+
+    def add_done_callback(self, callback):
+        """Call @callback(task) when the task finishes"""
+        if self.done():
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+    def _finish(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self._wait = None
+        self._done.set()
+        for callback in self._callbacks:
+            try:
+                callback(self)
+            except Exception:
+                LOG.exception("Done callback for %s failed" % self)
+
+    def _step(self, value=None, error=None):
+        """Run the coroutine until it waits or finishes"""
+        self._wait = None
+        while self._stack:
+            coro = self._stack[-1]
+            try:
+                if error is not None:
+                    exc, error = error, None
+                    waiting_on = coro.throw(exc)
+                else:
+                    waiting_on = coro.send(value)
+            except Return, e:
+                self._stack.pop()
+                value = e.value
+                continue
+            except StopIteration:
+                self._stack.pop()
+                value = None
+                continue
+            except Exception, e:
+                self._stack.pop()
+                error = e
+                continue
+
+            value = None
+            if isinstance(waiting_on, types.GeneratorType):
+                self._stack.append(waiting_on)
+            elif isinstance(waiting_on, _Wait):
+                self._wait = waiting_on
+                return
+            else:
+                error = TypeError("%s yielded %r" % (self, waiting_on))
+
+        if error is not None:
+            self._finish(error=error)
+        else:
+            self._finish(value)
+
+    def _poll(self, now):
+        """Resume the task if what it waits for is done, returning True if
+        it made progress"""
+        if self._cancel is not None:
+            error, self._cancel = self._cancel, None
+            self._step(error=error)
+            return True
+        if self.deadline is not None and now >= self.deadline:
+            self.deadline = None
+            self._step(error=Cancelled("Timed out"))
+            return True
+
+        ready, value = self._wait.ready()
+        if ready:
+            self._step(value)
+            return True
+        if self._wait.deadline is not None and now >= self._wait.deadline:
+            error = self._wait.expired()
+            if isinstance(error, Return):
+                self._step(error.value)
+            else:
+                self._step(error=error)
+            return True
+        return False
+
+
+class Loop(object):
+    """Runs Tasks, waiting on all of their pipes at once"""
+
+    def __init__(self):
+        self._tasks = []
+        self._lock = threading.Lock()
+
+    def spawn(self, coro, timeout=None, name=None):
+        """Start running @coro, returning its Task. With @timeout, the task
+        is cancelled if it has not finished in that many seconds."""
+        task = Task(coro, timeout, name)
+        with self._lock:
+            self._tasks.append(task)
+        return task
+
+    def _next_wake(self, tasks, now):
+        """Wait until something may have changed for @tasks"""
+        wake = now + POLL_INTERVAL
+        fds = []
+        polled = False
+        for task in tasks:
+            if task._wait is None:
+                # Spawned since the tasks were run
+                return
+            for deadline in (task.deadline, task._wait.deadline):
+                if deadline is not None:
+                    wake = min(wake, deadline)
+            if isinstance(task._wait, _Read):
+                fd = task._wait.stream.fileno()
+                if fd is None:
+                    polled = True
+                else:
+                    fds.append(fd)
+        timeout = max(0, wake - now)
+        if fds and not polled:
+            try:
+                select.select(fds, [], [], timeout)
+                return
+            except (select.error, ValueError, TypeError):
+                pass
+        time.sleep(min(timeout, POLL_INTERVAL / 10))
+
+    def run_once(self):
+        """Resume every task that can make progress, then wait for more to
+        happen if none could"""
+        with self._lock:
+            tasks = list(self._tasks)
+        now = time.time()
+        progress = False
+        for task in tasks:
+            if task._wait is None and not task.done():
+                # Not started yet
+                if task._cancel is not None:
+                    task._finish(error=task._cancel)
+                else:
+                    task._step()
+                progress = True
+            elif task._poll(now):
+                progress = True
+        with self._lock:
+            self._tasks = [t for t in self._tasks if not t.done()]
+            tasks = list(self._tasks)
+        if tasks and not progress:
+            self._next_wake(tasks, now)
+
+    def run(self, until=None):
+        """Run until every task (or just @until) is done"""
+        while True:
+            with self._lock:
+                if not self._tasks:
+                    break
+            if until is not None and until.done():
+                break
+            self.run_once()
+
+    def run_until_complete(self, coro, timeout=None):
+        """Run @coro (and any other tasks) until it finishes, returning its
+        result or raising its error"""
+        task = self.spawn(coro, timeout)
+        self.run(until=task)
+        if task.error:
+            raise task.error
+        return task.result
+
+
+def run_blocking(coro):
+    """Run @coro in the calling thread, blocking on each thing it waits
+    for instead of using a Loop. Returns its result or raises its error."""
+    task = Task(coro)
+    task._step()
+    while not task.done():
+        try:
+            value = task._wait.block()
+        except Exception, e:
+            task._step(error=e)
+        else:
+            task._step(value)
+    if task.error:
+        raise task.error
+    return task.result
+
+
+def supports(radio, operation):
+    """Return True if @radio has a coroutine variant of @operation (such
+    as "sync_in")"""
+    return callable(getattr(radio, "%s_async" % operation, None))
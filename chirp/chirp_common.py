@@ -14,11 +14,12 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import base64
+import hashlib
 import json
 import logging
 import math
 import sys
-from chirp import errors, memmap, CHIRP_VERSION
+from chirp import errors, memmap, radioblocks, CHIRP_VERSION
 
 LOG = logging.getLogger(__name__)
 
@@ -201,6 +202,22 @@ class PowerLevel:
         return "%s (%i dBm)" % (self._label, self._power)
 
 
+def nearest_power_level(levels, power):
+    """Return the member of @levels closest in absolute terms to @power"""
+    deltas = [abs(power - level) for level in levels]
+    return levels[deltas.index(min(deltas))]
+
+
+def make_power_level_map(src_levels, dst_levels):
+    """Returns a dict mapping each of @src_levels (by its integral dBm
+    value) to the nearest of @dst_levels, for converting many memories
+    between the same pair of radios"""
+    if not dst_levels:
+        return {}
+    return dict((int(level), nearest_power_level(dst_levels, level))
+                for level in src_levels)
+
+
 def parse_freq(freqstr):
     """Parse a frequency string and return the value in integral Hz"""
     freqstr = freqstr.strip()
@@ -309,6 +326,9 @@ class Memory:
         "dv_code":        [x for x in range(0, 100)],
     }
 
+    # Hashed copies of _valid_map for fast validation in __setattr__
+    _valid_sets = dict((k, frozenset(v)) for k, v in _valid_map.items())
+
     def __repr__(self):
         return "Memory[%i]" % self.number
 
@@ -340,9 +360,16 @@ class Memory:
             raise ImmutableValueError("Field %s is not " % name +
                                       "mutable on this memory")
 
-        if name in self._valid_map and val not in self._valid_map[name]:
-            raise ValueError("`%s' is not in valid list: %s" %
-                             (val, self._valid_map[name]))
+        if name in self._valid_sets:
+            try:
+                valid = val in self._valid_sets[name]
+            except TypeError:
+                valid = False
+            # Bitwise elements compare equal to plain values without
+            # hashing like them, so check those the slow way
+            if not valid and val not in self._valid_map[name]:
+                raise ValueError("`%s' is not in valid list: %s" %
+                                 (val, self._valid_map[name]))
 
         self.__dict__[name] = val
 
@@ -623,6 +650,22 @@ class MappingModel(object):
         """Return a list of mappings that @memory is in"""
         raise NotImplementedError()
 
+    def get_mapping_numbers(self, mapping):
+        """Return the numbers of the memories in @mapping. Models that can
+        tell without fetching the memories should override this"""
+        return [memory.number
+                for memory in self.get_mapping_memories(mapping)]
+
+    def get_all_memberships(self):
+        """Return a dict of memory number => list of the mappings that
+        memory is in, for every memory in any mapping. Models that can
+        read the whole table in one pass should override this"""
+        memberships = {}
+        for mapping in self.get_mappings():
+            for number in self.get_mapping_numbers(mapping):
+                memberships.setdefault(number, []).append(mapping)
+        return memberships
+
 
 class Bank(MemoryMapping):
     """Base class for a radio's Bank"""
@@ -714,6 +757,7 @@ class RadioFeatures:
         "has_nostep_tuning":    BOOLEAN,
         "has_comment":          BOOLEAN,
         "has_settings":         BOOLEAN,
+        "has_settings_delta":   BOOLEAN,
 
         # Attributes
         "valid_modes":          [],
@@ -825,6 +869,9 @@ class RadioFeatures:
                   "with each memory")
         self.init("has_settings", False,
                   "Indicates that the radio supports general settings")
+        self.init("has_settings_delta", False,
+                  "Indicates that set_settings() accepts just the " +
+                  "settings that have changed")
 
         self.init("valid_modes", list(MODES),
                   "Supported emission (or receive) modes")
@@ -1055,8 +1102,23 @@ class Radio(Alias):
         self.set_memory(mem)
 
     def get_memories(self, lo=None, hi=None):
-        """Get all the memories between @lo and @hi"""
-        pass
+        """Get all the memories between @lo and @hi, which default to the
+        radio's memory bounds. Drivers that can fetch a range of memories
+        faster than one at a time should override this"""
+        if lo is None or hi is None:
+            bounds = self.get_features().memory_bounds
+            if lo is None:
+                lo = bounds[0]
+            if hi is None:
+                hi = bounds[1]
+
+        memories = []
+        for number in range(lo, hi + 1):
+            try:
+                memories.append(self.get_memory(number))
+            except errors.InvalidMemoryLocation:
+                pass
+        return memories
 
     def set_memory(self, memory):
         """Set the memory object @memory"""
@@ -1106,7 +1168,10 @@ class Radio(Alias):
     def set_settings(self, settings):
         """Accepts the top-level RadioSettingGroup returned from get_settings()
         and adjusts the values in the radio accordingly. This function expects
-        the entire RadioSettingGroup hierarchy returned from get_settings().
+        the entire RadioSettingGroup hierarchy returned from get_settings(),
+        unless the has_settings_delta RadioFeatures flag is True, in which
+        case it may be given only the settings that have changed (see
+        RadioSettings.get_changed()).
         If this function is implemented, the has_settings RadioFeatures flag
         should be True and get_settings() must be implemented as well."""
         pass
@@ -1214,6 +1279,10 @@ class CloneModeRadio(FileBackedRadio):
     an image of the radio into an image file"""
 
     _memsize = 0
+    # Drivers that can upload individual blocks of the image set this to
+    # the size of those blocks, and honor sync_out(incremental=True,
+    # verify=True)
+    _dirty_block_size = 0
 
     def __init__(self, pipe):
         self.errors = []
@@ -1245,12 +1314,104 @@ class CloneModeRadio(FileBackedRadio):
         # memories of the same size.
         return len(filedata) == cls._memsize
 
+    @classmethod
+    def can_upload_incremental(cls):
+        """Return True if this driver can upload only the changed blocks
+        of an image and verify them (see sync_out())"""
+        return cls._dirty_block_size > 0
+
+    def get_dirty_blocks(self):
+        """Return the sorted numbers of the blocks of the image that have
+        changed since it was loaded, downloaded or last uploaded"""
+        return self._mmap.get_dirty_blocks(self._dirty_block_size)
+
+    def add_dirty_block(self, memobj):
+        """Mark the block(s) holding @memobj (a bitwise element, or an
+        address in the image) as changed"""
+        if isinstance(memobj, int):
+            self._mmap.mark_dirty(memobj)
+        else:
+            self._mmap.mark_dirty(memobj.get_offset(),
+                                  max(1, memobj.size() / 8))
+
+    def mark_dirty_from(self, other):
+        """Mark the parts of the image that differ from @other, an image of
+        the same model (such as the one the radio holds), as changed"""
+        self._mmap.mark_dirty_from(other.get_mmap().get_packed())
+
+    def _block_digest(self, addr, length):
+        return hashlib.sha1(self._mmap.get(addr, length)).digest()
+
+    def _remember_blocks(self, record, start, length):
+        end = min(start + length, len(self._mmap))
+        for addr in range(start, end, self._dirty_block_size):
+            size = min(self._dirty_block_size, end - addr)
+            record.set(addr, size, self._block_digest(addr, size))
+
+    def remember_blocks(self, start, length):
+        """Record that the radio on this port holds the image's @length
+        bytes from @start, in chunks of _dirty_block_size (see
+        radioblocks)"""
+        record = radioblocks.get_record(self)
+        self._remember_blocks(record, start, length)
+        record.save()
+
+    def forget_sent_blocks(self, incremental=False):
+        """Drop the record of the chunks that sync_out(@incremental) is
+        about to send, as the radio may not end up holding them.
+        verify_block() records them again as they are confirmed"""
+        record = radioblocks.get_record(self)
+        for addr, (size, digest) in record.items():
+            if not incremental or self._mmap.is_dirty(addr, size):
+                record.forget(addr)
+        record.save()
+
+    def mark_dirty_from_radio(self):
+        """Mark the chunks of the image that the radio on this port is not
+        known to hold (see remember_blocks()) as changed. Returns False,
+        marking nothing, if nothing is known about the radio"""
+        record = radioblocks.get_record(self)
+        if record.is_empty():
+            return False
+        known = set()
+        for addr, (size, digest) in record.items():
+            if self._block_digest(addr, size) == digest:
+                known.update(range(addr, addr + size))
+        for pos in range(0, len(self._mmap)):
+            if pos not in known:
+                self._mmap.mark_dirty(pos)
+        return True
+
+    def verify_block(self, addr, data):
+        """Compare @data, read back from the radio, with the image at
+        @addr. Matching chunks are remembered as held by the radio, and
+        mismatched ones are marked as changed, so that they are sent
+        again. Returns True if all match"""
+        record = radioblocks.get_record(self)
+        ok = True
+        for offset in range(0, len(data), self._dirty_block_size):
+            chunk = data[offset:offset + self._dirty_block_size]
+            if self._mmap.get(addr + offset, len(chunk)) == chunk:
+                self._remember_blocks(record, addr + offset, len(chunk))
+            else:
+                LOG.error("Radio has different data at 0x%04x" % (
+                    addr + offset))
+                record.forget(addr + offset)
+                self._mmap.mark_dirty(addr + offset, len(chunk))
+                ok = False
+        record.save()
+        return ok
+
     def sync_in(self):
         "Initiate a radio-to-PC clone operation"
         pass
 
-    def sync_out(self):
-        "Initiate a PC-to-radio clone operation"
+    def sync_out(self, incremental=False, verify=False):
+        """Initiate a PC-to-radio clone operation. If @incremental, drivers
+        that support it only send the blocks that have changed (see
+        get_dirty_blocks()). If @verify, drivers that support it read the
+        blocks sent back from the radio, raising RadioError if any
+        differ"""
         pass
 
 
@@ -1468,50 +1629,72 @@ def from_kHz(val):
     return val / 100
 
 
-def split_tone_decode(mem, txtone, rxtone):
-    """
-    Set tone mode and values on @mem based on txtone and rxtone specs like:
-    None, None, None
-    "Tone", 123.0, None
-    "DTCS", 23, "N"
-    """
+def _split_tone_fields(txtone, rxtone):
+    """Return the list of (attribute, value) pairs that split_tone_decode()
+    sets for @txtone and @rxtone"""
     txmode, txval, txpol = txtone
     rxmode, rxval, rxpol = rxtone
 
-    mem.dtcs_polarity = "%s%s" % (txpol or "N", rxpol or "N")
+    fields = [("dtcs_polarity", "%s%s" % (txpol or "N", rxpol or "N"))]
 
     if not txmode and not rxmode:
         # No tone
-        return
+        return fields
 
     if txmode == "Tone" and not rxmode:
-        mem.tmode = "Tone"
-        mem.rtone = txval
-        return
+        fields += [("tmode", "Tone"), ("rtone", txval)]
+        return fields
 
     if txmode == rxmode == "Tone" and txval == rxval:
         # TX and RX same tone -> TSQL
-        mem.tmode = "TSQL"
-        mem.ctone = txval
-        return
+        fields += [("tmode", "TSQL"), ("ctone", txval)]
+        return fields
 
     if txmode == rxmode == "DTCS" and txval == rxval:
-        mem.tmode = "DTCS"
-        mem.dtcs = txval
-        return
+        fields += [("tmode", "DTCS"), ("dtcs", txval)]
+        return fields
 
-    mem.tmode = "Cross"
-    mem.cross_mode = "%s->%s" % (txmode or "", rxmode or "")
+    fields += [("tmode", "Cross"),
+               ("cross_mode", "%s->%s" % (txmode or "", rxmode or ""))]
 
     if txmode == "Tone":
-        mem.rtone = txval
+        fields.append(("rtone", txval))
     elif txmode == "DTCS":
-        mem.dtcs = txval
+        fields.append(("dtcs", txval))
 
     if rxmode == "Tone":
-        mem.ctone = rxval
+        fields.append(("ctone", rxval))
     elif rxmode == "DTCS":
-        mem.rx_dtcs = rxval
+        fields.append(("rx_dtcs", rxval))
+
+    return fields
+
+
+# Decoded split tone fields, keyed by (txtone, rxtone)
+_SPLIT_TONE_CACHE = {}
+_SPLIT_TONE_TYPES = (type(None), str, unicode, int, long, float)
+
+
+def split_tone_decode(mem, txtone, rxtone):
+    """
+    Set tone mode and values on @mem based on txtone and rxtone specs like:
+    None, None, None
+    "Tone", 123.0, None
+    "DTCS", 23, "N"
+    """
+    # Key on the types too, so that 23 and 23.0 are remembered separately
+    key = tuple((type(x), x) for x in tuple(txtone) + tuple(rxtone))
+    try:
+        fields = _SPLIT_TONE_CACHE[key]
+    except (KeyError, TypeError):
+        fields = _split_tone_fields(txtone, rxtone)
+        # Only plain values are worth remembering; drivers sometimes
+        # pass bitwise elements, which would never be seen again
+        if all(t in _SPLIT_TONE_TYPES for t, x in key):
+            _SPLIT_TONE_CACHE[key] = fields
+
+    for name, value in fields:
+        setattr(mem, name, value)
 
 
 def split_tone_encode(mem):
@@ -1560,6 +1743,82 @@ def split_tone_encode(mem):
             (rxmode, rxval, rxpol))
 
 
+def _text_key(value):
+    if isinstance(value, unicode):
+        value = value.encode("utf-8")
+    return str(value).rstrip()
+
+
+def _tone_key(tone):
+    mode, val, pol = tone
+    if mode == "Tone":
+        val = float(val)
+    elif mode == "DTCS":
+        val = int(val)
+    return (mode or "", val, pol)
+
+
+def memory_key(mem):
+    """Return a tuple of (field, value) pairs describing the channel
+    stored in @mem, or None if it is empty. Values that have no effect on
+    the channel (such as the offset of a simplex channel or the tone of a
+    carrier squelch one) are left out and the rest are converted to
+    plain types, so equivalent memories from different radios match"""
+    if mem.empty:
+        return None
+
+    if mem.duplex in ("", "off"):
+        offset = None
+    else:
+        offset = int(mem.offset)
+
+    txtone, rxtone = split_tone_encode(mem)
+
+    if mem.power is None:
+        power = None
+    else:
+        power = int(mem.power)
+
+    fields = [("freq", int(mem.freq)),
+              ("duplex", mem.duplex),
+              ("offset", offset),
+              ("tx_tone", _tone_key(txtone)),
+              ("rx_tone", _tone_key(rxtone)),
+              ("mode", mem.mode),
+              ("power", power),
+              ("tuning_step", float(mem.tuning_step)),
+              ("skip", mem.skip),
+              ("name", _text_key(mem.name)),
+              ("comment", _text_key(mem.comment)),
+              ]
+
+    if isinstance(mem, DVMemory):
+        fields += [("dv_urcall", _text_key(mem.dv_urcall)),
+                   ("dv_rpt1call", _text_key(mem.dv_rpt1call)),
+                   ("dv_rpt2call", _text_key(mem.dv_rpt2call)),
+                   ("dv_code", int(mem.dv_code)),
+                   ]
+
+    return tuple(fields)
+
+
+def memory_fingerprint(mem):
+    """Return a stable hex digest of the channel stored in @mem (see
+    memory_key()), or None if it is empty"""
+    key = memory_key(mem)
+    if key is None:
+        return None
+    return hashlib.sha1(repr(key)).hexdigest()
+
+
+def channel_set_fingerprint(mems):
+    """Return a stable hex digest of the distinct channels in @mems,
+    regardless of the locations they are stored in"""
+    prints = set([memory_fingerprint(mem) for mem in mems])
+    prints.discard(None)
+    return hashlib.sha1("".join(sorted(prints))).hexdigest()
+
+
 def sanitize_string(astring, validcharset=CHARSET_ASCII, replacechar='*'):
     myfilter = ''.join(
         [
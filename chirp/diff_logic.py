@@ -0,0 +1,218 @@
+# Copyright 2026 The CHIRP developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+from chirp import chirp_common, directory
+
+LOG = logging.getLogger(__name__)
+
+
+def _format_tone(tone):
+    mode, val, pol = tone
+    if mode == "Tone":
+        return "Tone %.1f" % val
+    elif mode == "DTCS":
+        return "DTCS %03i%s" % (val, pol)
+    return "None"
+
+
+def _format_value(field, value):
+    if value is None:
+        return "-"
+    elif field in ("freq", "offset"):
+        return chirp_common.format_freq(value)
+    elif field in ("tx_tone", "rx_tone"):
+        return _format_tone(value)
+    elif field == "power":
+        return "%i dBm" % value
+    return "%s" % (value,)
+
+
+def _describe(mem):
+    return "%s (%s)" % (chirp_common.format_freq(mem.freq), mem.name.rstrip())
+
+
+class RadioDiff(object):
+    """The differences between two sets of memories, A and B"""
+
+    def __init__(self):
+        # Memories of B at locations that are empty in A
+        self.added = []
+        # Memories of A at locations that are empty in B
+        self.removed = []
+        # (mem_a, mem_b, [(field, value_a, value_b), ...]) for locations
+        # whose contents differ
+        self.changed = []
+        # (mem_a, mem_b) for identical channels at different locations
+        self.moved = []
+        # The number of locations with identical contents
+        self.unchanged = 0
+
+    def __nonzero__(self):
+        return bool(self.added or self.removed or
+                    self.changed or self.moved)
+
+    def __str__(self):
+        lines = []
+        for mem_a, mem_b in self.moved:
+            lines.append("Moved    %s -> %s: %s" % (mem_a.number,
+                                                    mem_b.number,
+                                                    _describe(mem_b)))
+        for mem in self.removed:
+            lines.append("Removed  %s: %s" % (mem.number, _describe(mem)))
+        for mem in self.added:
+            lines.append("Added    %s: %s" % (mem.number, _describe(mem)))
+        for mem_a, mem_b, fields in self.changed:
+            lines.append("Changed  %s: %s" % (mem_a.number, ", ".join(
+                ["%s %s -> %s" % (field,
+                                  _format_value(field, a),
+                                  _format_value(field, b))
+                 for field, a, b in fields])))
+        return "\n".join(lines)
+
+
+def _index(mems):
+    index = {}
+    for mem in mems:
+        key = chirp_common.memory_key(mem)
+        if key is not None:
+            index[mem.number] = (key, mem)
+    return index
+
+
+def diff_memories(mems_a, mems_b):
+    """Compare the memories in @mems_a with those in @mems_b location by
+    location and return a RadioDiff describing how to get from A to B"""
+    index_a = _index(mems_a)
+    index_b = _index(mems_b)
+    diff = RadioDiff()
+
+    # Identical locations are skipped by comparing their keys only,
+    # leaving the rest for move detection and field comparison
+    pending_a = {}
+    pending_b = {}
+    for number in set(index_a.keys()) | set(index_b.keys()):
+        key_a, mem_a = index_a.get(number, (None, None))
+        key_b, mem_b = index_b.get(number, (None, None))
+        if key_a is not None and key_a == key_b:
+            diff.unchanged += 1
+            continue
+        if mem_a is not None:
+            pending_a[number] = (key_a, mem_a)
+        if mem_b is not None:
+            pending_b[number] = (key_b, mem_b)
+
+    # Bucket the remaining channels of B by content so that a channel of
+    # A found elsewhere in B is reported as a move
+    buckets = {}
+    for number in sorted(pending_b.keys()):
+        buckets.setdefault(pending_b[number][0], []).append(number)
+
+    for number in sorted(pending_a.keys()):
+        key_a, mem_a = pending_a[number]
+        if buckets.get(key_a):
+            dest = buckets[key_a].pop(0)
+            diff.moved.append((mem_a, pending_b.pop(dest)[1]))
+            del pending_a[number]
+
+    for number in sorted(set(pending_a.keys()) | set(pending_b.keys())):
+        if number in pending_a and number in pending_b:
+            key_a, mem_a = pending_a[number]
+            key_b, mem_b = pending_b[number]
+            fields = [(field, a, b)
+                      for (field, a), (_field, b) in zip(key_a, key_b)
+                      if a != b]
+            # A DV memory compared with a plain one has extra fields
+            for field, b in key_b[len(key_a):]:
+                fields.append((field, None, b))
+            for field, a in key_a[len(key_b):]:
+                fields.append((field, a, None))
+            diff.changed.append((mem_a, mem_b, fields))
+        elif number in pending_a:
+            diff.removed.append(pending_a[number][1])
+        else:
+            diff.added.append(pending_b[number][1])
+
+    return diff
+
+
+def _get_memories(radio, lo, hi):
+    bounds = radio.get_features().memory_bounds
+    if lo is None:
+        lo = bounds[0]
+    if hi is None:
+        hi = bounds[1]
+    return radio.get_memories(lo, hi)
+
+
+def diff_radios(radio_a, radio_b, lo=None, hi=None):
+    """Compare the memories of @radio_a and @radio_b between @lo and @hi
+    (by default, each radio's full memory bounds)"""
+    return diff_memories(_get_memories(radio_a, lo, hi),
+                         _get_memories(radio_b, lo, hi))
+
+
+def get_channel_set(radio):
+    """Return the set of fingerprints of the channels stored in @radio"""
+    prints = set([chirp_common.memory_fingerprint(mem)
+                  for mem in _get_memories(radio, None, None)])
+    prints.discard(None)
+    return frozenset(prints)
+
+
+def similarity(set_a, set_b):
+    """Return the similarity (from 0.0 to 1.0) of two channel sets"""
+    if not set_a and not set_b:
+        return 1.0
+    return len(set_a & set_b) / float(len(set_a | set_b))
+
+
+def cluster_images(filenames, threshold=1.0):
+    """Group the image files in @filenames whose channel sets are at least
+    @threshold similar to another member of the group. Returns a list of
+    groups (lists of filenames), largest first. Files that cannot be
+    opened as an image are skipped"""
+    # Images with identical channel sets share a bucket, so only one
+    # member of each needs comparing with the others
+    buckets = {}
+    for filename in filenames:
+        try:
+            radio = directory.get_radio_by_image(filename)
+            channels = get_channel_set(radio)
+        except Exception, e:
+            LOG.warning("Skipping %s: %s" % (filename, e))
+            continue
+        buckets.setdefault(channels, []).append(filename)
+
+    sets = buckets.keys()
+    parent = range(0, len(sets))
+
+    def _find(i):
+        while parent[i] != i:
+            i = parent[i]
+        return i
+
+    if threshold < 1.0:
+        for i in range(0, len(sets)):
+            for j in range(i + 1, len(sets)):
+                if similarity(sets[i], sets[j]) >= threshold:
+                    parent[_find(j)] = _find(i)
+
+    clusters = {}
+    for i, channels in enumerate(sets):
+        clusters.setdefault(_find(i), []).extend(buckets[channels])
+
+    return sorted([sorted(c) for c in clusters.values()],
+                  key=lambda c: (-len(c), c))
@@ -173,6 +173,31 @@ def _ident_radio(radio):
     raise errors.RadioError("Radio did not respond")
 
 
+def _read_block(radio, addr, size):
+    """Read the block of @size bytes at @addr"""
+    frame = _make_frame("S", addr, size)
+    # DEBUG
+    LOG.info("Request sent:")
+    LOG.debug(util.hexprint(frame))
+
+    # sending the read request
+    _rawsend(radio, frame)
+
+    if radio._ack_block:
+        ack = _rawrecv(radio, 1)
+        if ack != "\x06":
+            raise errors.RadioError(
+                "Radio refused to send block 0x%04x" % addr)
+
+    # now we read
+    d = _recv(radio, addr, size)
+
+    _rawsend(radio, "\x06")
+    time.sleep(0.05)
+
+    return d
+
+
 def _download(radio):
     """Get the memory map"""
     # put radio in program mode
@@ -202,25 +227,7 @@ def _download(radio):
 
     data = ""
     for addr in range(0, radio._mem_size, radio._recv_block_size):
-        frame = _make_frame("S", addr, radio._recv_block_size)
-        # DEBUG
-        LOG.info("Request sent:")
-        LOG.debug(util.hexprint(frame))
-
-        # sending the read request
-        _rawsend(radio, frame)
-
-        if radio._ack_block:
-            ack = _rawrecv(radio, 1)
-            if ack != "\x06":
-                raise errors.RadioError(
-                    "Radio refused to send block 0x%04x" % addr)
-
-        # now we read
-        d = _recv(radio, addr, radio._recv_block_size)
-
-        _rawsend(radio, "\x06")
-        time.sleep(0.05)
+        d = _read_block(radio, addr, radio._recv_block_size)
 
         # aggregate the data
         data += d
@@ -235,8 +242,40 @@ def _download(radio):
     return data
 
 
-def _upload(radio):
-    """Upload procedure"""
+def _verify(radio, written, status):
+    """Read back the blocks holding the blocks sent at the addresses in
+    @written and compare them with the image"""
+    size = radio._recv_block_size
+    blocks = {}
+    for addr in written:
+        base = addr - (addr % size)
+        blocks.setdefault(base, []).append(addr - base)
+
+    status.cur = 0
+    status.max = len(blocks)
+    status.msg = "Verifying..."
+    radio.status_fn(status)
+
+    ok = True
+    for base in sorted(blocks.keys()):
+        d = _read_block(radio, base, size)
+        for offset in blocks[base]:
+            chunk = d[offset:offset + radio._send_block_size]
+            if not radio.verify_block(base + offset, chunk):
+                ok = False
+
+        # UI Update
+        status.cur += 1
+        radio.status_fn(status)
+
+    if not ok:
+        raise errors.RadioError("Verification failed, the radio did not "
+                                "store all of the image")
+
+
+def _upload(radio, incremental=False, verify=False):
+    """Upload procedure, of only the changed blocks if @incremental, and
+    reading them back afterwards if @verify"""
     # put radio in program mode
     _ident_radio(radio)
 
@@ -271,8 +310,14 @@ def _upload(radio):
     radio.status_fn(status)
 
     # the fun start here
+    written = []
     for start, end in _ranges:
         for addr in range(start, end, radio._send_block_size):
+            if incremental and \
+                    not radio.get_mmap().is_dirty(addr,
+                                                  radio._send_block_size):
+                continue
+
             # sending the data
             data = radio.get_mmap()[addr:addr + radio._send_block_size]
 
@@ -286,12 +331,17 @@ def _upload(radio):
             if ack != "\x06":
                 msg = "Bad ack writing block 0x%04x" % addr
                 raise errors.RadioError(msg)
+            radio.get_mmap().mark_clean(addr, radio._send_block_size)
+            written.append(addr)
 
             # UI Update
             status.cur = addr / radio._send_block_size
             status.msg = "Cloning to radio..."
             radio.status_fn(status)
 
+    if verify:
+        _verify(radio, written, status)
+
 
 def _split(rf, f1, f2):
     """Returns False if the two freqs are in the same band (no split)
@@ -313,6 +363,7 @@ class BaofengCommonHT(chirp_common.CloneModeRadio,
     VENDOR = "Baofeng"
     MODEL = ""
     IDENT = ""
+    _dirty_block_size = 0x10
 
     def sync_in(self):
         """Download from radio"""
@@ -328,12 +379,14 @@ class BaofengCommonHT(chirp_common.CloneModeRadio,
             raise errors.RadioError('Unexpected error communicating '
                                     'with the radio')
         self._mmap = memmap.MemoryMap(data)
+        self.remember_blocks(0, len(data))
         self.process_mmap()
 
-    def sync_out(self):
+    def sync_out(self, incremental=False, verify=False):
         """Upload to radio"""
+        self.forget_sent_blocks(incremental)
         try:
-            _upload(self)
+            _upload(self, incremental, verify)
         except errors.RadioError:
             raise
         except Exception, e:
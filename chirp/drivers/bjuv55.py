@@ -26,7 +26,8 @@ from chirp import bitwise
 from chirp.settings import RadioSetting, RadioSettingGroup, \
     RadioSettingValueInteger, RadioSettingValueList, \
     RadioSettingValueBoolean, RadioSettingValueString, \
-    RadioSettingValueFloat, InvalidValueError, RadioSettings
+    RadioSettingValueFloat, InvalidValueError, RadioSettings, \
+    SettingPaths
 from textwrap import dedent
 
 LOG = logging.getLogger(__name__)
@@ -251,6 +252,8 @@ class BaojieBJUV55Radio(uv5r.BaofengUV5R):
 
     def process_mmap(self):
         self._memobj = bitwise.parse(MEM_FORMAT % self._mem_params, self._mmap)
+        self._setting_paths = SettingPaths(self._memobj,
+                                           self._memobj.settings)
 
     def set_memory(self, mem):
         super(BaojieBJUV55Radio, self).set_memory(mem)
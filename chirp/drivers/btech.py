@@ -19,13 +19,13 @@ import time
 import struct
 import logging
 
-from time import sleep
 from chirp import chirp_common, directory, memmap
-from chirp import bitwise, errors, util
+from chirp import bitwise, errors, pacing, util
 from chirp.settings import RadioSettingGroup, RadioSetting, \
     RadioSettingValueBoolean, RadioSettingValueList, \
     RadioSettingValueString, RadioSettingValueInteger, \
-    RadioSettingValueFloat, RadioSettings, InvalidValueError
+    RadioSettingValueFloat, RadioSettings, InvalidValueError, \
+    SettingPaths
 from textwrap import dedent
 
 LOG = logging.getLogger(__name__)
@@ -317,9 +317,15 @@ def _rawrecv(radio, amount):
     return data
 
 
+def _get_pacer(radio):
+    """Get the adaptive inter-byte delay for the radio"""
+    return pacing.get_pacer(radio, "byte_delay", 0.002, 0.0005)
+
+
 def _send(radio, data):
     """Send data to the radio device"""
 
+    pacer = _get_pacer(radio)
     try:
         for byte in data:
             radio.pipe.write(byte)
@@ -333,7 +339,10 @@ def _send(radio, data):
             # Finally, a static delay was chosen as simplest of all solutions
             # (Michael Wagner, OE4AMW)
             # (for details, see issue 3993)
-            sleep(0.002)
+            #
+            # The pacer starts from that delay and only shortens it while
+            # the radio keeps acknowledging our blocks.
+            pacer.wait()
 
         # DEBUG
         if debug is True:
@@ -381,6 +390,39 @@ def _recv(radio, addr):
     return block[5:]
 
 
+def _read_block(radio, addr):
+    """Request and get the block at @addr, asking again (once) if a shorter
+    delay was being tried when that failed"""
+    pacer = _get_pacer(radio)
+    _send(radio, _make_frame("S", addr, BLOCK_SIZE))
+    try:
+        block = _recv(radio, addr)
+    except errors.RadioError, e:
+        if not pacer.failed():
+            raise
+        LOG.warning("Retrying block 0x%04x: %s" % (addr, e))
+        _clean_buffer(radio)
+        _send(radio, _make_frame("S", addr, BLOCK_SIZE))
+        block = _recv(radio, addr)
+    pacer.ok()
+    return block
+
+
+def _write_block(radio, addr, frame):
+    """Send the @frame for the block at @addr and check the radio's ACK"""
+    _send(radio, frame)
+
+    # receiving the response
+    ack = _rawrecv(radio, 1)
+
+    # basic check
+    if len(ack) != 1:
+        raise errors.RadioError("No ACK when writing block 0x%04x" % addr)
+
+    if ack not in "\x06\x05":
+        raise errors.RadioError("Bad ACK writing block 0x%04x:" % addr)
+
+
 def _start_clone_mode(radio, status):
     """Put the radio in clone mode and get the ident string, 3 tries"""
 
@@ -549,16 +591,12 @@ def _download(radio):
     # cleaning the serial buffer
     _clean_buffer(radio)
 
+    _get_pacer(radio).start()
+
     data = ""
     for addr in range(0, MEM_SIZE, BLOCK_SIZE):
-        # sending the read request
-        _send(radio, _make_frame("S", addr, BLOCK_SIZE))
-
-        # read
-        d = _recv(radio, addr)
-
         # aggregate the data
-        data += d
+        data += _read_block(radio, addr)
 
         # UI Update
         status.cur = addr / BLOCK_SIZE
@@ -568,8 +606,39 @@ def _download(radio):
     return data
 
 
-def _upload(radio):
-    """Upload procedure"""
+def _verify(radio, written, status):
+    """Read back the blocks holding the TX blocks at the addresses in
+    @written and compare them with the image"""
+    blocks = {}
+    for addr in written:
+        base = addr - (addr % BLOCK_SIZE)
+        blocks.setdefault(base, []).append(addr - base)
+
+    status.max = len(blocks)
+    status.cur = 0
+    status.msg = "Verifying..."
+    radio.status_fn(status)
+
+    ok = True
+    for base in sorted(blocks.keys()):
+        d = _read_block(radio, base)
+        for offset in blocks[base]:
+            if not radio.verify_block(base + offset,
+                                      d[offset:offset + TX_BLOCK_SIZE]):
+                ok = False
+
+        # UI Update
+        status.cur += 1
+        radio.status_fn(status)
+
+    if not ok:
+        raise errors.RadioError("Verification failed, the radio did not "
+                                "store all of the image")
+
+
+def _upload(radio, incremental=False, verify=False):
+    """Upload procedure, of only the changed blocks if @incremental, and
+    reading them back afterwards if @verify"""
 
     # The UPLOAD mem is restricted to lower than 0x3100,
     # so we will overide that here localy
@@ -597,8 +666,16 @@ def _upload(radio):
     # cleaning the serial buffer
     _clean_buffer(radio)
 
+    pacer = _get_pacer(radio)
+    pacer.start()
+
     # the fun start here
+    first = True
+    written = []
     for addr in range(0, MEM_SIZE, TX_BLOCK_SIZE):
+        if incremental and not data.is_dirty(addr, TX_BLOCK_SIZE):
+            continue
+
         # getting the block of data to send
         d = data[addr:addr + TX_BLOCK_SIZE]
 
@@ -607,27 +684,32 @@ def _upload(radio):
 
         # first block must not send the ACK at the beginning for the
         # ones that has the extra id, since this have to do a extra step
-        if addr == 0 and radio._id2 is not False:
+        if first and radio._id2 is not False:
             frame = frame[1:]
+        first = False
 
-        # send the frame
-        _send(radio, frame)
-
-        # receiving the response
-        ack = _rawrecv(radio, 1)
-
-        # basic check
-        if len(ack) != 1:
-            raise errors.RadioError("No ACK when writing block 0x%04x" % addr)
-
-        if ack not in "\x06\x05":
-            raise errors.RadioError("Bad ACK writing block 0x%04x:" % addr)
+        # send the frame, again (once) if a shorter delay was being tried
+        # when that failed
+        try:
+            _write_block(radio, addr, frame)
+        except errors.RadioError, e:
+            if not pacer.failed():
+                raise
+            LOG.warning("Retrying block 0x%04x: %s" % (addr, e))
+            _clean_buffer(radio)
+            _write_block(radio, addr, frame)
+        pacer.ok()
+        data.mark_clean(addr, TX_BLOCK_SIZE)
+        written.append(addr)
 
         # UI Update
         status.cur = addr / TX_BLOCK_SIZE
         status.msg = "Cloning to radio..."
         radio.status_fn(status)
 
+    if verify:
+        _verify(radio, written, status)
+
 
 def model_match(cls, data):
     """Match the opened/downloaded image to the correct version"""
@@ -665,6 +747,45 @@ def _split(rf, f1, f2):
     return True
 
 
+def _dtmf_to_string(dtmf_mem):
+    """Returns the DTMF digits stored in @dtmf_mem"""
+    dtmf_string = ""
+    for digit in dtmf_mem:
+        if digit != 255:
+            index = LIST_DTMF_VALUES.index(digit)
+            dtmf_string = dtmf_string + LIST_DTMF_DIGITS[index]
+    return dtmf_string
+
+
+def _apply_dtmf_frame(setting, obj):
+    LOG.debug("Setting DTMF-Code: " + str(setting.value))
+    val_string = str(setting.value)
+    for i in range(0, 16):
+        obj[i] = 255
+    i = 0
+    for current_char in val_string:
+        current_char = current_char.upper()
+        index = LIST_DTMF_DIGITS.index(current_char)
+        obj[i] = LIST_DTMF_VALUES[index]
+        i = i + 1
+
+
+def _apply_list_value(setting, obj):
+    options = setting.value.get_options()
+    obj.set_value(options.index(str(setting.value)))
+
+
+def _2tone_validate(value):
+    if value == 0:
+        return 65535
+    if value == 65535:
+        return value
+    if not (300 <= value and value <= 3000):
+        msg = ("2 Tone Frequency: Must be between 300 and 3000 Hz")
+        raise InvalidValueError(msg)
+    return value
+
+
 class BTechMobileCommon(chirp_common.CloneModeRadio,
                         chirp_common.ExperimentalRadio):
     """BTECH's UV-5001 and alike radios"""
@@ -676,6 +797,7 @@ class BTechMobileCommon(chirp_common.CloneModeRadio,
     COLOR_LCD2 = False
     NAME_LENGTH = 6
     UPLOAD_MEM_SIZE = 0X3100
+    _dirty_block_size = TX_BLOCK_SIZE
     _power_levels = [chirp_common.PowerLevel("High", watts=25),
                      chirp_common.PowerLevel("Low", watts=10)]
     _vhf_range = (130000000, 180000000)
@@ -727,6 +849,7 @@ class BTechMobileCommon(chirp_common.CloneModeRadio,
 
         rf = chirp_common.RadioFeatures()
         rf.has_settings = True
+        rf.has_settings_delta = True
         rf.has_bank = False
         rf.has_tuning_step = False
         rf.can_odd_split = True
@@ -777,12 +900,14 @@ class BTechMobileCommon(chirp_common.CloneModeRadio,
         """Download from radio"""
         data = _download(self)
         self._mmap = memmap.MemoryMap(data)
+        self.remember_blocks(0, len(data))
         self.process_mmap()
 
-    def sync_out(self):
+    def sync_out(self, incremental=False, verify=False):
         """Upload to radio"""
+        self.forget_sent_blocks(incremental)
         try:
-            _upload(self)
+            _upload(self, incremental, verify)
         except errors.RadioError:
             raise
         except Exception, e:
@@ -2120,6 +2245,30 @@ class BTechMobileCommon(chirp_common.CloneModeRadio,
                                               "DTMF Decoding Settings")
         top.append(dtmf_enc_settings)
         top.append(dtmf_dec_settings)
+
+        # The DTMF, 5 Tone and 2 Tone groups hold hundreds of settings
+        # between them, so they are only built when they are looked at
+        dtmf_enc_settings.set_loader(self._get_dtmf_enc_settings)
+        dtmf_dec_settings.set_loader(self._get_dtmf_dec_settings)
+
+        # 5 Tone Settings
+        group_5tone = RadioSettingGroup("group_5tone", "5 Tone Settings")
+        group_5tone.set_loader(self._get_5tone_settings)
+        top.append(group_5tone)
+
+        # 2 Tone
+        encode_2tone = RadioSettingGroup("encode_2tone", "2 Tone Encode")
+        decode_2tone = RadioSettingGroup("decode_2tone", "2 Code Decode")
+        encode_2tone.set_loader(self._get_2tone_encode_settings)
+        decode_2tone.set_loader(self._get_2tone_decode_settings)
+        top.append(encode_2tone)
+        top.append(decode_2tone)
+
+        return top
+
+    def _get_dtmf_enc_settings(self, dtmf_enc_settings):
+        """Fill in the DTMF encoding settings"""
+        _mem = self._memobj
         txdisable = RadioSetting("dtmf_settings.txdisable",
                                  "TX-Disable",
                                  RadioSettingValueBoolean(
@@ -2148,50 +2297,33 @@ class BTechMobileCommon(chirp_common.CloneModeRadio,
                                       _mem.dtmf_settings.dtmfspeed_off]))
         dtmf_enc_settings.append(dtmfspeed_off)
 
-        def memory2string(dmtf_mem):
-            dtmf_string = ""
-            for digit in dmtf_mem:
-                if digit != 255:
-                    index = LIST_DTMF_VALUES.index(digit)
-                    dtmf_string = dtmf_string + LIST_DTMF_DIGITS[index]
-            return dtmf_string
-
-        def apply_dmtf_frame(setting, obj):
-            LOG.debug("Setting DTMF-Code: " + str(setting.value))
-            val_string = str(setting.value)
-            for i in range(0, 16):
-                obj[i] = 255
-            i = 0
-            for current_char in val_string:
-                current_char = current_char.upper()
-                index = LIST_DTMF_DIGITS.index(current_char)
-                obj[i] = LIST_DTMF_VALUES[index]
-                i = i + 1
-
         codes = self._memobj.dtmf_codes
         i = 1
         for dtmfcode in codes:
-            val = RadioSettingValueString(0, 16, memory2string(
+            val = RadioSettingValueString(0, 16, _dtmf_to_string(
                                               dtmfcode.code),
                                           False, CHARSET_DTMF_DIGITS)
             line = RadioSetting("dtmf_code_" + str(i) + "_code",
                                 "DMTF Code " + str(i), val)
-            line.set_apply_callback(apply_dmtf_frame, dtmfcode.code)
+            line.set_apply_callback(_apply_dtmf_frame, dtmfcode.code)
             dtmf_enc_settings.append(line)
             i = i + 1
 
+    def _get_dtmf_dec_settings(self, dtmf_dec_settings):
+        """Fill in the DTMF decoding settings"""
+        _mem = self._memobj
         line = RadioSetting("dtmf_settings.mastervice",
                             "Master and Vice ID",
                             RadioSettingValueBoolean(
                                 _mem.dtmf_settings.mastervice))
         dtmf_dec_settings.append(line)
 
-        val = RadioSettingValueString(0, 16, memory2string(
+        val = RadioSettingValueString(0, 16, _dtmf_to_string(
                                           _mem.dtmf_settings.masterid),
                                       False, CHARSET_DTMF_DIGITS)
         line = RadioSetting("dtmf_settings.masterid",
                             "Master Control ID ", val)
-        line.set_apply_callback(apply_dmtf_frame,
+        line.set_apply_callback(_apply_dtmf_frame,
                                 _mem.dtmf_settings.masterid)
         dtmf_dec_settings.append(line)
 
@@ -2225,12 +2357,12 @@ class BTechMobileCommon(chirp_common.CloneModeRadio,
                                 _mem.dtmf_settings.mrevive))
         dtmf_dec_settings.append(line)
 
-        val = RadioSettingValueString(0, 16, memory2string(
+        val = RadioSettingValueString(0, 16, _dtmf_to_string(
                                           _mem.dtmf_settings.viceid),
                                       False, CHARSET_DTMF_DIGITS)
         line = RadioSetting("dtmf_settings.viceid",
                             "Vice Control ID ", val)
-        line.set_apply_callback(apply_dmtf_frame,
+        line.set_apply_callback(_apply_dtmf_frame,
                                 _mem.dtmf_settings.viceid)
         dtmf_dec_settings.append(line)
 
@@ -2264,57 +2396,57 @@ class BTechMobileCommon(chirp_common.CloneModeRadio,
                                 _mem.dtmf_settings.vrevive))
         dtmf_dec_settings.append(line)
 
-        val = RadioSettingValueString(0, 16, memory2string(
+        val = RadioSettingValueString(0, 16, _dtmf_to_string(
                                           _mem.dtmf_settings.inspection),
                                       False, CHARSET_DTMF_DIGITS)
         line = RadioSetting("dtmf_settings.inspection",
                             "Inspection", val)
-        line.set_apply_callback(apply_dmtf_frame,
+        line.set_apply_callback(_apply_dtmf_frame,
                                 _mem.dtmf_settings.inspection)
         dtmf_dec_settings.append(line)
 
-        val = RadioSettingValueString(0, 16, memory2string(
+        val = RadioSettingValueString(0, 16, _dtmf_to_string(
                                           _mem.dtmf_settings.alarmcode),
                                       False, CHARSET_DTMF_DIGITS)
         line = RadioSetting("dtmf_settings.alarmcode",
                             "Alarm", val)
-        line.set_apply_callback(apply_dmtf_frame,
+        line.set_apply_callback(_apply_dtmf_frame,
                                 _mem.dtmf_settings.alarmcode)
         dtmf_dec_settings.append(line)
 
-        val = RadioSettingValueString(0, 16, memory2string(
+        val = RadioSettingValueString(0, 16, _dtmf_to_string(
                                           _mem.dtmf_settings.kill),
                                       False, CHARSET_DTMF_DIGITS)
         line = RadioSetting("dtmf_settings.kill",
                             "Kill", val)
-        line.set_apply_callback(apply_dmtf_frame,
+        line.set_apply_callback(_apply_dtmf_frame,
                                 _mem.dtmf_settings.kill)
         dtmf_dec_settings.append(line)
 
-        val = RadioSettingValueString(0, 16, memory2string(
+        val = RadioSettingValueString(0, 16, _dtmf_to_string(
                                           _mem.dtmf_settings.monitor),
                                       False, CHARSET_DTMF_DIGITS)
         line = RadioSetting("dtmf_settings.monitor",
                             "Monitor", val)
-        line.set_apply_callback(apply_dmtf_frame,
+        line.set_apply_callback(_apply_dtmf_frame,
                                 _mem.dtmf_settings.monitor)
         dtmf_dec_settings.append(line)
 
-        val = RadioSettingValueString(0, 16, memory2string(
+        val = RadioSettingValueString(0, 16, _dtmf_to_string(
                                           _mem.dtmf_settings.stun),
                                       False, CHARSET_DTMF_DIGITS)
         line = RadioSetting("dtmf_settings.stun",
                             "Stun", val)
-        line.set_apply_callback(apply_dmtf_frame,
+        line.set_apply_callback(_apply_dtmf_frame,
                                 _mem.dtmf_settings.stun)
         dtmf_dec_settings.append(line)
 
-        val = RadioSettingValueString(0, 16, memory2string(
+        val = RadioSettingValueString(0, 16, _dtmf_to_string(
                                           _mem.dtmf_settings.revive),
                                       False, CHARSET_DTMF_DIGITS)
         line = RadioSetting("dtmf_settings.revive",
                             "Revive", val)
-        line.set_apply_callback(apply_dmtf_frame,
+        line.set_apply_callback(_apply_dtmf_frame,
                                 _mem.dtmf_settings.revive)
         dtmf_dec_settings.append(line)
 
@@ -2370,20 +2502,14 @@ class BTechMobileCommon(chirp_common.CloneModeRadio,
                                       _mem.dtmf_settings.delayproctime]))
         dtmf_dec_settings.append(line)
 
-        # 5 Tone Settings
+    def _get_5tone_settings(self, group_5tone):
+        """Fill in the 5 Tone settings"""
+        _mem = self._memobj
         stds_5tone = RadioSettingGroup("stds_5tone", "Standards")
         codes_5tone = RadioSettingGroup("codes_5tone", "Codes")
-
-        group_5tone = RadioSettingGroup("group_5tone", "5 Tone Settings")
         group_5tone.append(stds_5tone)
         group_5tone.append(codes_5tone)
 
-        top.append(group_5tone)
-
-        def apply_list_value(setting, obj):
-            options = setting.value.get_options()
-            obj.set_value(options.index(str(setting.value)))
-
         _5tone_standards = self._memobj._5tone_std_settings
         i = 0
         for standard in _5tone_standards:
@@ -2403,7 +2529,7 @@ class BTechMobileCommon(chirp_common.CloneModeRadio,
                     "Period (ms)", RadioSettingValueList
                     (LIST_5TONE_STANDARD_PERIODS,
                      LIST_5TONE_STANDARD_PERIODS[period]))
-                line.set_apply_callback(apply_list_value, standard.period)
+                line.set_apply_callback(_apply_list_value, standard.period)
                 std_5tone.append(line)
             else:
                 LOG.debug("Invalid value for 5tone period! Disabling.")
@@ -2421,7 +2547,7 @@ class BTechMobileCommon(chirp_common.CloneModeRadio,
                     RadioSettingValueList(LIST_5TONE_DIGITS,
                                           LIST_5TONE_DIGITS[
                                               group_tone]))
-                line.set_apply_callback(apply_list_value,
+                line.set_apply_callback(_apply_list_value,
                                         standard.group_tone)
                 std_5tone.append(line)
             else:
@@ -2440,7 +2566,7 @@ class BTechMobileCommon(chirp_common.CloneModeRadio,
                     RadioSettingValueList(LIST_5TONE_DIGITS,
                                           LIST_5TONE_DIGITS[
                                               repeat_tone]))
-                line.set_apply_callback(apply_list_value,
+                line.set_apply_callback(_apply_list_value,
                                         standard.repeat_tone)
                 std_5tone.append(line)
             else:
@@ -2667,13 +2793,8 @@ class BTechMobileCommon(chirp_common.CloneModeRadio,
         else:
             LOG.debug("Invalid value decode reset time! Disabling.")
 
-        # 2 Tone
-        encode_2tone = RadioSettingGroup("encode_2tone", "2 Tone Encode")
-        decode_2tone = RadioSettingGroup("decode_2tone", "2 Code Decode")
-
-        top.append(encode_2tone)
-        top.append(decode_2tone)
-
+    def _get_2tone_encode_settings(self, encode_2tone):
+        """Fill in the 2 Tone encoding settings"""
         duration_1st_tone = self._memobj._2tone.duration_1st_tone
         if duration_1st_tone == 255:
             LOG.debug("Duration of first 2 Tone digit is not yet " +
@@ -2715,16 +2836,6 @@ class BTechMobileCommon(chirp_common.CloneModeRadio,
                                                           duration_gap]))
             encode_2tone.append(line)
 
-        def _2tone_validate(value):
-            if value == 0:
-                return 65535
-            if value == 65535:
-                return value
-            if not (300 <= value and value <= 3000):
-                msg = ("2 Tone Frequency: Must be between 300 and 3000 Hz")
-                raise InvalidValueError(msg)
-            return value
-
         def apply_2tone_freq(setting, obj):
             val = int(setting.value)
             if (val == 0) or (val == 65535):
@@ -2760,6 +2871,9 @@ class BTechMobileCommon(chirp_common.CloneModeRadio,
 
             i = i + 1
 
+    def _get_2tone_decode_settings(self, decode_2tone):
+        """Fill in the 2 Tone decoding settings"""
+        _mem = self._memobj
         decode_reset_time = _mem._2tone.reset_time
         if decode_reset_time == 255:
             decode_reset_time = 59
@@ -2813,7 +2927,7 @@ class BTechMobileCommon(chirp_common.CloneModeRadio,
                         "Dec " + str(j), RadioSettingValueList
                         (LIST_2TONE_DEC,
                          LIST_2TONE_DEC[val]))
-                    line.set_apply_callback(apply_list_value, dec.dec)
+                    line.set_apply_callback(_apply_list_value, dec.dec)
                     _2tone_dec_code.append(line)
                 else:
                     LOG.debug("Invalid value for 2tone dec! Disabling.")
@@ -2830,7 +2944,7 @@ class BTechMobileCommon(chirp_common.CloneModeRadio,
                         "Response " + str(j), RadioSettingValueList
                         (LIST_2TONE_RESPONSE,
                          LIST_2TONE_RESPONSE[val]))
-                    line.set_apply_callback(apply_list_value, dec.response)
+                    line.set_apply_callback(_apply_list_value, dec.response)
                     _2tone_dec_code.append(line)
                 else:
                     LOG.debug("Invalid value for 2tone response! Disabling.")
@@ -2847,7 +2961,7 @@ class BTechMobileCommon(chirp_common.CloneModeRadio,
                         "Alert " + str(j), RadioSettingValueList
                         (PTTIDCODE_LIST,
                          PTTIDCODE_LIST[val]))
-                    line.set_apply_callback(apply_list_value, dec.alert)
+                    line.set_apply_callback(_apply_list_value, dec.alert)
                     _2tone_dec_code.append(line)
                 else:
                     LOG.debug("Invalid value for 2tone alert! Disabling.")
@@ -2877,10 +2991,7 @@ class BTechMobileCommon(chirp_common.CloneModeRadio,
 
             i = i + 1
 
-        return top
-
     def set_settings(self, settings):
-        _settings = self._memobj.settings
         for element in settings:
             if not isinstance(element, RadioSetting):
                 if element.get_name() == "fm_preset":
@@ -2890,21 +3001,8 @@ class BTechMobileCommon(chirp_common.CloneModeRadio,
                     continue
             else:
                 try:
-                    name = element.get_name()
-                    if "." in name:
-                        bits = name.split(".")
-                        obj = self._memobj
-                        for bit in bits[:-1]:
-                            if "/" in bit:
-                                bit, index = bit.split("/", 1)
-                                index = int(index)
-                                obj = getattr(obj, bit)[index]
-                            else:
-                                obj = getattr(obj, bit)
-                        setting = bits[-1]
-                    else:
-                        obj = _settings
-                        setting = element.get_name()
+                    obj, setting = self._setting_paths.resolve(
+                        element.get_name())
 
                     if element.has_apply_callback():
                         LOG.debug("Using apply callback")
@@ -3263,6 +3361,8 @@ class BTech(BTechMobileCommon):
 
         # Get it
         self._memobj = bitwise.parse(MEM_FORMAT, self._mmap)
+        self._setting_paths = SettingPaths(self._memobj,
+                                           self._memobj.settings)
 
         # load specific parameters from the radio image
         self.set_options()
@@ -3719,6 +3819,8 @@ class BTechColor(BTechMobileCommon):
 
         # Get it
         self._memobj = bitwise.parse(COLOR_MEM_FORMAT, self._mmap)
+        self._setting_paths = SettingPaths(self._memobj,
+                                           self._memobj.settings)
 
         # load specific parameters from the radio image
         self.set_options()
@@ -4149,6 +4251,8 @@ class BTechGMRS(BTechMobileCommon):
 
         # Get it
         self._memobj = bitwise.parse(GMRS_MEM_FORMAT, self._mmap)
+        self._setting_paths = SettingPaths(self._memobj,
+                                           self._memobj.settings)
 
         # load specific parameters from the radio image
         self.set_options()
@@ -548,6 +548,9 @@ class FT1BankModel(chirp_common.BankModel):
 
         return banks
 
+    def get_mapping_numbers(self, bank):
+        return sorted(self._channel_numbers_in_bank(bank))
+
 
 # Note: other radios like FTM3200Radio subclass this radio
 @directory.register
@@ -515,6 +515,11 @@ class FT7800BankModel(chirp_common.BankModel):
         return [self._radio.get_memory(n)
                 for n in self.__b2m_cache[bank.index]]
 
+    def get_mapping_numbers(self, bank):
+        self.__precache()
+
+        return list(self.__b2m_cache[bank.index])
+
     def get_memory_mappings(self, memory):
         self.__precache()
 
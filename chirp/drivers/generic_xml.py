@@ -124,7 +124,7 @@ class XMLRadio(chirp_common.FileBackedRadio, chirp_common.IcomDstarSupport):
 
     def get_memories(self, lo=0, hi=999):
         mems = []
-        for i in range(lo, hi):
+        for i in range(lo, hi + 1):
             try:
                 mems.append(xml_ll.get_memory(self.doc, i))
             except errors.InvalidMemoryLocation:
@@ -111,8 +111,6 @@ class IC2200Radio(icf.IcomCloneModeRadio, chirp_common.IcomDstarSupport):
     _endframe = "Icom Inc\x2eD8"
     _can_hispeed = True
 
-    _memories = []
-
     _ranges = [(0x0000, 0x1340, 32),
                (0x1340, 0x1360, 16),
                (0x1360, 0x136B,  8),
@@ -216,10 +214,6 @@ class IC2200Radio(icf.IcomCloneModeRadio, chirp_common.IcomDstarSupport):
 
         return mem
 
-    def get_memories(self, lo=0, hi=199):
-
-        return [m for m in self._memories if m.number >= lo and m.number <= hi]
-
     def set_memory(self, mem):
         if isinstance(mem.number, str):
             number = _get_special()[mem.number]
@@ -182,8 +182,9 @@ class IC9xRadio(icf.IcomLiveRadio):
             except errors.InvalidMemoryLocation:
                 pass
             except errors.InvalidDataError, e:
+                # Not a partial list, which would look like empty memories
                 LOG.error("Error talking to radio: %s" % e)
-                break
+                raise
 
         return memories
 
@@ -511,11 +511,8 @@ class IcomBankModel(chirp_common.BankModel):
         self._radio._set_bank(memory.number, None)
 
     def get_mapping_memories(self, bank):
-        memories = []
-        for i in range(*self._radio.get_features().memory_bounds):
-            if self._radio._get_bank(i) == bank.index:
-                memories.append(self._radio.get_memory(i))
-        return memories
+        return [self._radio.get_memory(i)
+                for i in self.get_mapping_numbers(bank)]
 
     def get_memory_mappings(self, memory):
         index = self._radio._get_bank(memory.number)
@@ -524,6 +521,21 @@ class IcomBankModel(chirp_common.BankModel):
         else:
             return [self.get_mappings()[index]]
 
+    def get_mapping_numbers(self, bank):
+        lo, hi = self._radio.get_features().memory_bounds
+        return [i for i in range(lo, hi + 1)
+                if self._radio._get_bank(i) == bank.index]
+
+    def get_all_memberships(self):
+        banks = self.get_mappings()
+        lo, hi = self._radio.get_features().memory_bounds
+        memberships = {}
+        for i in range(lo, hi + 1):
+            index = self._radio._get_bank(i)
+            if index is not None:
+                memberships[i] = [banks[index]]
+        return memberships
+
 
 class IcomIndexedBankModel(IcomBankModel,
                            chirp_common.MappingModelIndexInterface):
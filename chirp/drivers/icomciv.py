@@ -1,8 +1,9 @@
 
 import struct
 import logging
+import time
 from chirp.drivers import icf
-from chirp import chirp_common, util, errors, bitwise, directory
+from chirp import chirp_common, util, errors, bitwise, directory, transport
 from chirp.memmap import MemoryMap
 from chirp.settings import RadioSetting, RadioSettingGroup, \
     RadioSettingValueList, RadioSettingValueBoolean
@@ -234,6 +235,9 @@ class IcomCIVRadio(icf.IcomLiveRadio):
     MODEL = "CIV Radio"
     _model = "\x00"
     _template = 0
+    # Number of requests get_memories() keeps in flight on interfaces
+    # without echo (a one-wire CI-V bus only carries one at a time)
+    _pipeline_depth = transport.PIPELINE_DEPTH
 
     # complete list of modes from CI-V documentation
     # each radio supports a subset
@@ -335,8 +339,7 @@ class IcomCIVRadio(icf.IcomLiveRadio):
     def _set_bank(self, loc, bank):
         pass
 
-    def get_memory(self, number):
-        LOG.debug("Getting %i" % number)
+    def _get_memory_frame(self, number):
         f = self._classes["mem"]()
         if self._rf.has_bank:
             ch, bnk = self.mem_to_ch_bnk(number)
@@ -344,13 +347,86 @@ class IcomCIVRadio(icf.IcomLiveRadio):
             LOG.debug("Bank %i, Channel %02i" % (bnk, ch))
         else:
             f.set_location(number)
+        return f
+
+    def get_memory(self, number):
+        LOG.debug("Getting %i" % number)
+        f = self._get_memory_frame(number)
         self._send_frame(f)
+        return self._parse_memory_frame(number, self._recv_frame(f))
+
+    def get_memories(self, lo=None, hi=None):
+        bounds = self.get_features().memory_bounds
+        if lo is None:
+            lo = bounds[0]
+        if hi is None:
+            hi = bounds[1]
+
+        requests = [(n, self._get_memory_frame(n))
+                    for n in range(lo, hi + 1)]
+        if not requests:
+            return []
+        # The radio's response starts with the location requested
+        locations = dict([(str(f.get_data()), n) for n, f in requests])
+        loc_len = len(str(requests[0][1].get_data()))
+        stream = transport.SerialTransport(self.pipe)
+
+        def send(f):
+            f.send(ord(self._model), 0xE0, stream, willecho=False)
+
+        def receive(oldest):
+            while True:
+                data = stream.read_until(chr(0xFD),
+                                         deadline=time.time() + 1)
+                if not data.endswith(chr(0xFD)):
+                    raise errors.RadioError("Timeout")
+                data = data[data.rfind("\xFE\xFE"):]
+                # Skip the echo of our own requests and anything else
+                # not addressed to us
+                if len(data) >= 6 and data[2] == "\xE0":
+                    break
+            if data[4] in "\xFA\xFB":
+                # A bare NG (or OK) status, as sent for a location the
+                # radio can not read, answers the oldest request
+                return oldest, None
+            f = self._classes["mem"]()
+            f.set_data(data[6:-1])
+            if data[4:6] != "\x1A\x00":
+                return None, f
+            return locations.get(data[6:6 + loc_len]), f
+
+        def flush():
+            stream.flush_input()
+            while self.pipe.read(256):
+                pass
+
+        depth = self._willecho and 1 or self._pipeline_depth
+        frames = transport.Pipeline(send, receive, depth, flush).run(
+            requests)
+
+        memories = []
+        for number in range(lo, hi + 1):
+            if number in frames and frames[number] is None:
+                mem = chirp_common.Memory()
+                mem.number = number
+                mem.empty = True
+                memories.append(mem)
+                continue
+            elif number in frames:
+                memories.append(self._parse_memory_frame(number,
+                                                         frames[number]))
+                continue
+            try:
+                memories.append(self.get_memory(number))
+            except errors.InvalidMemoryLocation:
+                pass
+        return memories
 
+    def _parse_memory_frame(self, number, f):
         mem = chirp_common.Memory()
         mem.number = number
         mem.immutable = []
 
-        f = self._recv_frame(f)
         if len(f.get_data()) == 0:
             raise errors.RadioError("Radio reported error")
         if f.get_data() and f.get_data()[-1] == "\xFF":
@@ -19,7 +19,7 @@ import sys
 import time
 import logging
 
-from chirp import chirp_common, errors, directory, util
+from chirp import chirp_common, errors, directory, util, transport, aio
 from chirp.settings import RadioSetting, RadioSettingGroup, \
     RadioSettingValueInteger, RadioSettingValueBoolean, \
     RadioSettingValueString, RadioSettingValueList, RadioSettings
@@ -51,7 +51,6 @@ RADIO_IDS = {
 }
 
 LOCK = threading.Lock()
-COMMAND_RESP_BUFSIZE = 8
 LAST_BAUD = 4800
 LAST_DELIMITER = ("\r", " ")
 
@@ -60,32 +59,33 @@ LAST_DELIMITER = ("\r", " ")
 # fields, but others do.
 
 
+def _format_command(cmd, args):
+    if args:
+        cmd += LAST_DELIMITER[1] + LAST_DELIMITER[1].join(args)
+    return cmd + LAST_DELIMITER[0]
+
+
 def command(ser, cmd, *args):
     """Send @cmd to radio via @ser"""
-    global LOCK, LAST_DELIMITER, COMMAND_RESP_BUFSIZE
+    global LOCK, LAST_DELIMITER
 
     start = time.time()
 
     LOCK.acquire()
 
-    if args:
-        cmd += LAST_DELIMITER[1] + LAST_DELIMITER[1].join(args)
-    cmd += LAST_DELIMITER[0]
+    cmd = _format_command(cmd, args)
 
     LOG.debug("PC->RADIO: %s" % cmd.strip())
     ser.write(cmd)
 
-    result = ""
-    while not result.endswith(LAST_DELIMITER[0]):
-        result += ser.read(COMMAND_RESP_BUFSIZE)
-        if (time.time() - start) > 0.5:
-            LOG.error("Timeout waiting for data")
-            break
+    stream = transport.SerialTransport(ser)
+    result = stream.read_until(LAST_DELIMITER[0], deadline=start + 0.5)
 
     if result.endswith(LAST_DELIMITER[0]):
         LOG.debug("RADIO->PC: %s" % result.strip())
         result = result[:-1]
     else:
+        LOG.error("Timeout waiting for data")
         LOG.error("Giving up")
 
     LOCK.release()
@@ -93,6 +93,69 @@ def command(ser, cmd, *args):
     return result.strip()
 
 
+def command_async(ser, cmd, *args):
+    """A coroutine (see chirp.aio) doing what command() does. The radio
+    must not also be used from another thread meanwhile."""
+    cmd = _format_command(cmd, args)
+
+    LOG.debug("PC->RADIO: %s" % cmd.strip())
+    stream = aio.AsyncTransport(ser)
+    stream.write(cmd)
+
+    result = yield stream.wait_until(LAST_DELIMITER[0], timeout=0.5)
+
+    if result.endswith(LAST_DELIMITER[0]):
+        LOG.debug("RADIO->PC: %s" % result.strip())
+        result = result[:-1]
+    else:
+        LOG.error("Timeout waiting for data")
+
+    raise aio.Return(result.strip())
+
+
+def pipeline(ser, commands, depth=transport.PIPELINE_DEPTH):
+    """Send @commands (a list of (cmd, args) pairs) to the radio via @ser,
+    keeping up to @depth of them in flight, and return the responses in
+    order. Responses that could not be read are None, and should be
+    retried with command()"""
+    stream = transport.SerialTransport(ser)
+
+    def send(index):
+        cmd = _format_command(commands[index][0], commands[index][1:])
+        LOG.debug("PC->RADIO: %s" % cmd.strip())
+        stream.write(cmd)
+
+    def receive(index):
+        result = stream.read_until(LAST_DELIMITER[0],
+                                   deadline=time.time() + 0.5)
+        if not result.endswith(LAST_DELIMITER[0]):
+            raise errors.RadioError("Timeout waiting for data")
+        result = result[:-1].strip()
+        LOG.debug("RADIO->PC: %s" % result)
+
+        # The radio answers in order, so this should be the response to
+        # the oldest command, which it echoes along with the location
+        expected = _format_command(commands[index][0], commands[index][1:])
+        if iserr(result) or result == "E" or \
+                result.startswith(expected[:-1]):
+            return index, result
+        return None, result
+
+    def flush():
+        stream.flush_input()
+        while ser.read(256):
+            pass
+
+    LOCK.acquire()
+    try:
+        responses = transport.Pipeline(send, receive, depth, flush).run(
+            [(i, i) for i in range(0, len(commands))])
+    finally:
+        LOCK.release()
+
+    return [responses.get(i) for i in range(0, len(commands))]
+
+
 def get_id(ser):
     """Get the ID of the radio attached to @ser"""
     global LAST_BAUD
@@ -152,6 +215,9 @@ class KenwoodLiveRadio(chirp_common.LiveRadio):
     _upper = 200
     _kenwood_split = False
     _kenwood_valid_tones = list(chirp_common.TONES)
+    # Number of commands get_memories() keeps in flight (0 to fetch each
+    # memory with get_memory() instead)
+    _pipeline_depth = transport.PIPELINE_DEPTH
 
     def __init__(self, *args, **kwargs):
         chirp_common.LiveRadio.__init__(self, *args, **kwargs)
@@ -190,19 +256,11 @@ class KenwoodLiveRadio(chirp_common.LiveRadio):
     def get_raw_memory(self, number):
         return command(self.pipe, *self._cmd_get_memory(number))
 
-    def get_memory(self, number):
-        if number < 0 or number > self._upper:
-            raise errors.InvalidMemoryLocation(
-                "Number must be between 0 and %i" % self._upper)
-        if number in self._memcache and not NOCACHE:
-            return self._memcache[number]
-
-        result = command(self.pipe, *self._cmd_get_memory(number))
+    def _parse_memory_result(self, number, result):
         if result == "N" or result == "E":
             mem = chirp_common.Memory()
             mem.number = number
             mem.empty = True
-            self._memcache[mem.number] = mem
             return mem
         elif " " not in result:
             LOG.error("Not sure what to do with this: `%s'" % result)
@@ -211,10 +269,9 @@ class KenwoodLiveRadio(chirp_common.LiveRadio):
         value = result.split(" ")[1]
         spec = value.split(",")
 
-        mem = self._parse_mem_spec(spec)
-        self._memcache[mem.number] = mem
+        return self._parse_mem_spec(spec)
 
-        result = command(self.pipe, *self._cmd_get_memory_name(number))
+    def _parse_name_result(self, mem, result):
         if " " in result:
             value = result.split(" ", 1)[1]
             if value.count(",") == 2:
@@ -222,14 +279,110 @@ class KenwoodLiveRadio(chirp_common.LiveRadio):
             else:
                 _loc, mem.name = value.split(",")
 
+    def _parse_split_result(self, mem, result):
+        if " " in result:
+            value = result.split(" ", 1)[1]
+            self._parse_split_spec(mem, value.split(","))
+
+    def get_memory(self, number):
+        if number < 0 or number > self._upper:
+            raise errors.InvalidMemoryLocation(
+                "Number must be between 0 and %i" % self._upper)
+        if number in self._memcache and not NOCACHE:
+            return self._memcache[number]
+
+        result = command(self.pipe, *self._cmd_get_memory(number))
+        mem = self._parse_memory_result(number, result)
+        if mem.empty:
+            self._memcache[mem.number] = mem
+            return mem
+
+        result = command(self.pipe, *self._cmd_get_memory_name(number))
+        self._parse_name_result(mem, result)
+
         if mem.duplex == "" and self._kenwood_split:
             result = command(self.pipe, *self._cmd_get_split(number))
-            if " " in result:
-                value = result.split(" ", 1)[1]
-                self._parse_split_spec(mem, value.split(","))
+            self._parse_split_result(mem, result)
 
+        self._memcache[mem.number] = mem
         return mem
 
+    def get_memory_async(self, number):
+        """A coroutine (see chirp.aio) variant of get_memory()"""
+        if number < 0 or number > self._upper:
+            raise errors.InvalidMemoryLocation(
+                "Number must be between 0 and %i" % self._upper)
+        if number in self._memcache and not NOCACHE:
+            raise aio.Return(self._memcache[number])
+
+        result = yield command_async(self.pipe, *self._cmd_get_memory(number))
+        mem = self._parse_memory_result(number, result)
+        if not mem.empty:
+            result = yield command_async(
+                self.pipe, *self._cmd_get_memory_name(number))
+            self._parse_name_result(mem, result)
+
+            if mem.duplex == "" and self._kenwood_split:
+                result = yield command_async(
+                    self.pipe, *self._cmd_get_split(number))
+                self._parse_split_result(mem, result)
+
+        self._memcache[mem.number] = mem
+        raise aio.Return(mem)
+
+    def _pipeline(self, numbers, get_cmd, parse, mems):
+        results = pipeline(self.pipe, [get_cmd(n) for n in numbers],
+                           self._pipeline_depth)
+        for number, result in zip(numbers, results):
+            if result is None:
+                # Left for get_memory() to fetch
+                del mems[number]
+            else:
+                parse(mems[number], result)
+
+    def get_memories(self, lo=None, hi=None):
+        if not self._pipeline_depth:
+            return chirp_common.LiveRadio.get_memories(self, lo, hi)
+
+        bounds = self.get_features().memory_bounds
+        if lo is None:
+            lo = bounds[0]
+        if hi is None:
+            hi = bounds[1]
+
+        # Fetch the memories, then the names (and splits) of those that
+        # are not empty, with several commands in flight at a time
+        numbers = [n for n in range(max(lo, 0), min(hi, self._upper) + 1)
+                   if NOCACHE or n not in self._memcache]
+        results = pipeline(self.pipe,
+                           [self._cmd_get_memory(n) for n in numbers],
+                           self._pipeline_depth)
+        mems = {}
+        for number, result in zip(numbers, results):
+            if result is not None:
+                mems[number] = self._parse_memory_result(number, result)
+
+        self._pipeline([n for n in sorted(mems) if not mems[n].empty],
+                       self._cmd_get_memory_name, self._parse_name_result,
+                       mems)
+        if self._kenwood_split:
+            self._pipeline([n for n in sorted(mems)
+                            if not mems[n].empty and mems[n].duplex == ""],
+                           self._cmd_get_split, self._parse_split_result,
+                           mems)
+        self._memcache.update(mems)
+
+        memories = []
+        for number in range(lo, hi + 1):
+            if number in mems:
+                memories.append(mems[number])
+                continue
+            try:
+                memories.append(self.get_memory(number))
+            except errors.InvalidMemoryLocation:
+                pass
+        return memories
+
     def _make_mem_spec(self, mem):
         pass
 
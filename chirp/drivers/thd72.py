@@ -220,7 +220,7 @@ class THD72Radio(chirp_common.CloneModeRadio):
     mem_upper_limit = 1022
     _memsize = 65536
     _model = ""  # FIXME: REMOVE
-    _dirty_blocks = []
+    _dirty_block_size = 256
 
     _LCD_CONTRAST = ["Level %d" % x for x in range(1, 16)]
     _LAMP_CONTROL = ["Manual", "Auto"]
@@ -254,7 +254,6 @@ class THD72Radio(chirp_common.CloneModeRadio):
 
     def process_mmap(self):
         self._memobj = bitwise.parse(mem_format, self._mmap)
-        self._dirty_blocks = []
 
     def _detect_baud(self):
         for baud in [9600, 19200, 38400, 57600]:
@@ -276,13 +275,6 @@ class THD72Radio(chirp_common.CloneModeRadio):
     def get_special_locations(self):
         return sorted(THD72_SPECIAL.keys())
 
-    def add_dirty_block(self, memobj):
-        block = memobj._offset / 256
-        if block not in self._dirty_blocks:
-            self._dirty_blocks.append(block)
-        self._dirty_blocks.sort()
-        print("dirty blocks: ", self._dirty_blocks)
-
     def get_channel_name(self, number):
         if number < 999:
             name = str(self._memobj.channel_name[number].name) + '\xff'
@@ -405,14 +397,20 @@ class THD72Radio(chirp_common.CloneModeRadio):
     def sync_in(self):
         self._detect_baud()
         self._mmap = self.download()
+        self.remember_blocks(0, len(self._mmap))
         self.process_mmap()
 
-    def sync_out(self):
+    def sync_out(self, incremental=True, verify=False):
+        # This radio has always sent only the changed blocks, when there
+        # are any
         self._detect_baud()
-        if len(self._dirty_blocks):
-            self.upload(self._dirty_blocks)
+        blocks = [b for b in self.get_dirty_blocks()
+                  if b < (self._memsize / 256) - 2]
+        self.forget_sent_blocks(incremental and bool(blocks))
+        if incremental and blocks:
+            self.upload(blocks, verify)
         else:
-            self.upload()
+            self.upload(verify=verify)
 
     def read_block(self, block, count=256):
         self.pipe.write(struct.pack("<cBHB", "R", 0, block, 0))
@@ -482,7 +480,7 @@ class THD72Radio(chirp_common.CloneModeRadio):
             return data
         return memmap.MemoryMap(data)
 
-    def upload(self, blocks=None):
+    def upload(self, blocks=None, verify=False):
         if blocks is None:
             blocks = range((self._memsize / 256) - 2)
         else:
@@ -512,9 +510,28 @@ class THD72Radio(chirp_common.CloneModeRadio):
                 s.cur = count
                 self.status_fn(s)
 
+        if isinstance(self._mmap, memmap.MemoryMap):
+            for i in blocks:
+                self._mmap.mark_clean(i * 256, 256)
+
+        verified = True
+        if verify:
+            count = 0
+            for i in blocks:
+                if not self.verify_block(i * 256, self.read_block(i)):
+                    verified = False
+                count += 1
+                if self.status_fn:
+                    s = chirp_common.Status()
+                    s.msg = "Verifying"
+                    s.max = total
+                    s.cur = count
+                    self.status_fn(s)
+
         self.pipe.write("E")
-        # clear out blocks we uploaded from the dirty blocks list
-        self._dirty_blocks = [b for b in self._dirty_blocks if b not in blocks]
+        if not verified:
+            raise errors.RadioError("Verification failed, the radio did "
+                                    "not store all of the image")
 
     def command(self, cmd, timeout=0.5):
         start = time.time()
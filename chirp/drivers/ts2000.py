@@ -39,6 +39,10 @@ class TS2000Radio(KenwoodLiveRadio):
     _upper = 289
     _kenwood_split = True
     _kenwood_valid_tones = list(TS2000_TONES)
+    # get_memory() is specific to this radio, so get_memories() uses it
+    # and there is no coroutine variant of it
+    _pipeline_depth = 0
+    get_memory_async = None
 
     def get_features(self):
         rf = chirp_common.RadioFeatures()
@@ -63,6 +63,10 @@ class TS850Radio(KenwoodLiveRadio):
 
     _upper = 99
     _kenwood_valid_tones = list(TS850_TONES)
+    # get_memory() is specific to this radio, so get_memories() uses it
+    # and there is no coroutine variant of it
+    _pipeline_depth = 0
+    get_memory_async = None
 
     def get_features(self):
         rf = chirp_common.RadioFeatures()
@@ -19,11 +19,12 @@ import os
 import logging
 
 from chirp import chirp_common, errors, util, directory, memmap
-from chirp import bitwise
+from chirp import bitwise, pacing
 from chirp.settings import RadioSetting, RadioSettingGroup, \
     RadioSettingValueInteger, RadioSettingValueList, \
     RadioSettingValueBoolean, RadioSettingValueString, \
-    RadioSettingValueFloat, InvalidValueError, RadioSettings
+    RadioSettingValueFloat, InvalidValueError, RadioSettings, \
+    SettingPaths
 from textwrap import dedent
 
 LOG = logging.getLogger(__name__)
@@ -457,7 +458,12 @@ def _do_ident(radio, magic, secondack=True):
     return ident
 
 
-def _read_block(radio, start, size, first_command=False):
+def _get_pacer(radio):
+    """Get the adaptive delay between blocks for the radio"""
+    return pacing.get_pacer(radio, "block_delay", 0.05, 0.01)
+
+
+def __read_block(radio, start, size, first_command=False):
     msg = struct.pack(">BHB", ord("S"), start, size)
     radio.pipe.write(msg)
 
@@ -485,11 +491,27 @@ def _read_block(radio, start, size, first_command=False):
         raise errors.RadioError("Radio sent incomplete block 0x%04x" % start)
 
     radio.pipe.write("\x06")
-    time.sleep(0.05)
+    _get_pacer(radio).wait()
 
     return chunk
 
 
+def _read_block(radio, start, size, first_command=False):
+    pacer = _get_pacer(radio)
+    try:
+        chunk = __read_block(radio, start, size, first_command)
+    except errors.RadioError, e:
+        if not pacer.failed():
+            raise
+        # A shorter delay was being tried, so ask again at the last one
+        # that worked
+        LOG.warning("Retrying block 0x%04x: %s" % (start, e))
+        pacer.wait()
+        chunk = __read_block(radio, start, size, first_command)
+    pacer.ok()
+    return chunk
+
+
 def _get_radio_firmware_version(radio):
     if radio.MODEL == "BJ-UV55":
         block = _read_block(radio, 0x1FF0, 0x40, True)
@@ -540,6 +562,7 @@ def _ident_radio(radio):
 
 def _do_download(radio):
     data = _ident_radio(radio)
+    _get_pacer(radio).start()
 
     radio_version = _get_radio_firmware_version(radio)
     LOG.info("Radio Version is %s" % repr(radio_version))
@@ -587,18 +610,57 @@ def _do_download(radio):
     return memmap.MemoryMap(data)
 
 
-def _send_block(radio, addr, data):
+def __send_block(radio, addr, data):
     msg = struct.pack(">BHB", ord("X"), addr, len(data))
     radio.pipe.write(msg + data)
-    time.sleep(0.05)
+    _get_pacer(radio).wait()
 
     ack = radio.pipe.read(1)
     if ack != "\x06":
         raise errors.RadioError("Radio refused to accept block 0x%04x" % addr)
 
 
-def _do_upload(radio):
+def _send_block(radio, addr, data):
+    pacer = _get_pacer(radio)
+    try:
+        __send_block(radio, addr, data)
+    except errors.RadioError, e:
+        if not pacer.failed():
+            raise
+        # A shorter delay was being tried, so send it again at the last one
+        # that worked
+        LOG.warning("Retrying block 0x%04x: %s" % (addr, e))
+        pacer.wait()
+        __send_block(radio, addr, data)
+    pacer.ok()
+
+
+def _verify_blocks(radio, written):
+    """Read back the blocks holding the (radio address, image address)
+    chunks in @written and compare them with the image"""
+    blocks = {}
+    for radio_addr, image_addr in written:
+        base = radio_addr - (radio_addr % 0x40)
+        blocks.setdefault(base, []).append((radio_addr - base, image_addr))
+
+    ok = True
+    first = True
+    for base in sorted(blocks.keys()):
+        data = _read_block(radio, base, 0x40, first)
+        first = False
+        for offset, image_addr in blocks[base]:
+            if not radio.verify_block(image_addr, data[offset:offset + 0x10]):
+                ok = False
+        _do_status(radio, base)
+
+    if not ok:
+        raise errors.RadioError("Verification failed, the radio did not "
+                                "store all of the image")
+
+
+def _do_upload(radio, incremental=False, verify=False):
     ident = _ident_radio(radio)
+    _get_pacer(radio).start()
     radio_upper_band = ident[3:4]
     image_upper_band = _upper_band_from_image(radio)
 
@@ -649,22 +711,38 @@ def _do_upload(radio):
                "of the radio (%s).")
         raise errors.RadioError(msg % (image_version, radio_version))
 
+    mmap = radio.get_mmap()
+    written = []
+
     # Main block
     for start_addr, end_addr in ranges_main:
         for i in range(start_addr, end_addr, 0x10):
-            _send_block(radio, i - 0x08, radio.get_mmap()[i:i + 0x10])
+            if incremental and not mmap.is_dirty(i, 0x10):
+                continue
+            _send_block(radio, i - 0x08, mmap[i:i + 0x10])
+            mmap.mark_clean(i, 0x10)
+            written.append((i - 0x08, i))
             _do_status(radio, i)
         _do_status(radio, radio.get_memsize())
 
-    if len(radio.get_mmap().get_packed()) == 0x1808:
+    if len(mmap.get_packed()) == 0x1808:
         LOG.info("Old image, not writing aux block")
+        if verify:
+            _verify_blocks(radio, written)
         return  # Old image, no aux block
 
     # Auxiliary block at radio address 0x1EC0, our offset 0x1808
     for start_addr, end_addr in ranges_aux:
         for i in range(start_addr, end_addr, 0x10):
             addr = 0x1808 + (i - 0x1EC0)
-            _send_block(radio, i, radio.get_mmap()[addr:addr + 0x10])
+            if incremental and not mmap.is_dirty(addr, 0x10):
+                continue
+            _send_block(radio, i, mmap[addr:addr + 0x10])
+            mmap.mark_clean(addr, 0x10)
+            written.append((i, addr))
+
+    if verify:
+        _verify_blocks(radio, written)
 
     if not image_matched_radio:
         msg = ("Upload finished, but the 'Other Settings' "
@@ -709,6 +787,7 @@ class BaofengUV5R(chirp_common.CloneModeRadio,
     BAUD_RATE = 9600
 
     _memsize = 0x1808
+    _dirty_block_size = 0x10
     _basetype = BASETYPE_UV5R
     _idents = [UV5R_MODEL_291,
                UV5R_MODEL_ORIG
@@ -759,6 +838,7 @@ class BaofengUV5R(chirp_common.CloneModeRadio,
     def get_features(self):
         rf = chirp_common.RadioFeatures()
         rf.has_settings = True
+        rf.has_settings_delta = True
         rf.has_bank = False
         rf.has_cross = True
         rf.has_rx_dtcs = True
@@ -802,6 +882,8 @@ class BaofengUV5R(chirp_common.CloneModeRadio,
 
     def process_mmap(self):
         self._memobj = bitwise.parse(MEM_FORMAT % self._mem_params, self._mmap)
+        self._setting_paths = SettingPaths(self._memobj,
+                                           self._memobj.settings)
 
     def sync_in(self):
         try:
@@ -810,11 +892,14 @@ class BaofengUV5R(chirp_common.CloneModeRadio,
             raise
         except Exception, e:
             raise errors.RadioError("Failed to communicate with radio: %s" % e)
+        # The image starts with the radio's ident
+        self.remember_blocks(0x08, len(self._mmap) - 0x08)
         self.process_mmap()
 
-    def sync_out(self):
+    def sync_out(self, incremental=False, verify=False):
+        self.forget_sent_blocks(incremental)
         try:
-            _do_upload(self)
+            _do_upload(self, incremental, verify)
         except errors.RadioError:
             raise
         except Exception, e:
@@ -1674,7 +1759,6 @@ class BaofengUV5R(chirp_common.CloneModeRadio,
             return None
 
     def set_settings(self, settings):
-        _settings = self._memobj.settings
         for element in settings:
             if not isinstance(element, RadioSetting):
                 if element.get_name() == "fm_preset":
@@ -1684,21 +1768,8 @@ class BaofengUV5R(chirp_common.CloneModeRadio,
                     continue
             else:
                 try:
-                    name = element.get_name()
-                    if "." in name:
-                        bits = name.split(".")
-                        obj = self._memobj
-                        for bit in bits[:-1]:
-                            if "/" in bit:
-                                bit, index = bit.split("/", 1)
-                                index = int(index)
-                                obj = getattr(obj, bit)[index]
-                            else:
-                                obj = getattr(obj, bit)
-                        setting = bits[-1]
-                    else:
-                        obj = _settings
-                        setting = element.get_name()
+                    obj, setting = self._setting_paths.resolve(
+                        element.get_name())
 
                     if element.has_apply_callback():
                         LOG.debug("Using apply callback")
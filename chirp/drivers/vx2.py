@@ -266,6 +266,9 @@ class VX2BankModel(chirp_common.BankModel):
 
         return banks
 
+    def get_mapping_numbers(self, bank):
+        return sorted(self._get_channel_numbers_in_bank(bank))
+
 
 def _wipe_memory(mem):
     mem.set_raw("\x00" * (mem.size() / 8))
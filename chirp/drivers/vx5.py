@@ -137,27 +137,30 @@ class VX5BankModel(chirp_common.BankModel):
         if not remaining_members:
             _bank_used.current_member = 0xFF
 
-    def get_mapping_memories(self, bank):
-        memories = []
+    def get_mapping_numbers(self, bank):
+        numbers = []
 
         _members = self._radio._memobj.bank_groups[bank.index].members
         _bank_used = self._radio._memobj.bank_used[bank.index]
 
         if _bank_used.current_member == 0xFF:
-            return memories
+            return numbers
 
         for member in _members:
             if member.status == 0xFF:
                 continue
-            memories.append(self._radio.get_memory(member.channel+1))
-        return memories
+            numbers.append(member.channel+1)
+        return numbers
+
+    def get_mapping_memories(self, bank):
+        return [self._radio.get_memory(number)
+                for number in self.get_mapping_numbers(bank)]
 
     def get_memory_mappings(self, memory):
         banks = []
         for bank in self.get_mappings():
-            if memory.number in [x.number for x in
-                                 self.get_mapping_memories(bank)]:
-                    banks.append(bank)
+            if memory.number in self.get_mapping_numbers(bank):
+                banks.append(bank)
         return banks
 
 
@@ -308,6 +308,9 @@ class VX6BankModel(chirp_common.BankModel):
 
         return banks
 
+    def get_mapping_numbers(self, bank):
+        return sorted(self._get_channel_numbers_in_bank(bank))
+
 
 @directory.register
 class VX6Radio(yaesu_clone.YaesuCloneModeRadio):
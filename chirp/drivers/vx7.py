@@ -145,26 +145,29 @@ class VX7BankModel(chirp_common.BankModel):
         if not remaining_members:
             _bank_used.in_use = 0xFFFF
 
-    def get_mapping_memories(self, bank):
-        memories = []
+    def get_mapping_numbers(self, bank):
+        numbers = []
 
         _members = self._radio._memobj.bank_members[bank.index].members
         _bank_used = self._radio._memobj.bank_used[bank.index]
 
         if _bank_used.in_use == 0xFFFF:
-            return memories
+            return numbers
 
         for number in _members:
             if number == 0xFFFF:
                 continue
-            memories.append(self._radio.get_memory(number+1))
-        return memories
+            numbers.append(number+1)
+        return numbers
+
+    def get_mapping_memories(self, bank):
+        return [self._radio.get_memory(number)
+                for number in self.get_mapping_numbers(bank)]
 
     def get_memory_mappings(self, memory):
         banks = []
         for bank in self.get_mappings():
-            if memory.number in [x.number for x in
-                                 self.get_mapping_memories(bank)]:
+            if memory.number in self.get_mapping_numbers(bank):
                 banks.append(bank)
         return banks
 
@@ -491,6 +491,9 @@ class VX8BankModel(chirp_common.BankModel):
 
         return banks
 
+    def get_mapping_numbers(self, bank):
+        return sorted(self._channel_numbers_in_bank(bank))
+
 
 def _wipe_memory(mem):
     mem.set_raw("\x00" * (mem.size() / 8))
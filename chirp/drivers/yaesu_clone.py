@@ -18,60 +18,36 @@ import os
 import logging
 from textwrap import dedent
 
-from chirp import chirp_common, util, memmap, errors
+from chirp import chirp_common, util, memmap, errors, aio
 
 LOG = logging.getLogger(__name__)
 
 CMD_ACK = 0x06
 
 
-def _safe_read(pipe, count):
-    buf = ""
-    first = True
-    for _i in range(0, 60):
-        buf += pipe.read(count - len(buf))
-        # LOG.debug("safe_read: %i/%i\n" % (len(buf), count))
-        if buf:
-            if first and buf[0] == chr(CMD_ACK):
-                # LOG.debug("Chewed an ack")
-                buf = buf[1:]  # Chew an echo'd ack if using a 2-pin cable
-            first = False
-        if len(buf) == count:
-            break
-    LOG.debug(util.hexprint(buf))
-    return buf
-
-
-def _chunk_read(pipe, count, status_fn):
-    timer = time.time()
+def _chunk_read(stream, count, status_fn):
+    """A coroutine reading @count bytes, 32 at a time"""
     block = 32
     data = ""
+    status = chirp_common.Status()
+    status.msg = "Cloning from radio"
+    status.max = count
     while len(data) < count:
         # Don't read past the end of our block if we're not on a 32-byte
-        # boundary
+        # boundary.  Give up if it's been two seconds since we last saw
+        # data from the radio.
         chunk_size = min(block, count - len(data))
-        chunk = pipe.read(chunk_size)
-        if chunk:
-            timer = time.time()
-            data += chunk
-            if data[0] == chr(CMD_ACK):
-                data = data[1:]  # Chew an echo'd ack if using a 2-pin cable
-        # LOG.debug("Chewed an ack")
-        if time.time() - timer > 2:
-            # It's been two seconds since we last saw data from the radio,
-            # so it's time to give up.
-            raise errors.RadioError("Timed out reading from radio")
-        status = chirp_common.Status()
-        status.msg = "Cloning from radio"
-        status.max = count
+        data += yield stream.wait_exact(chunk_size, timeout=2)
         status.cur = len(data)
         status_fn(status)
         LOG.debug("Read %i/%i" % (len(data), count))
-    return data
+    raise aio.Return(data)
 
 
-def __clone_in(radio):
-    pipe = radio.pipe
+def _clone_in_async(radio):
+    """A coroutine (see chirp.aio) reading the image from the radio"""
+    # The transport chews the echo'd acks if using a 2-pin cable
+    stream = aio.AsyncTransport(radio.pipe, echo=True)
 
     status = chirp_common.Status()
     status.msg = "Cloning from radio"
@@ -84,12 +60,12 @@ def __clone_in(radio):
     for block in radio._block_lengths:
         blocks += 1
         if blocks == len(radio._block_lengths):
-            chunk = _chunk_read(pipe, block, radio.status_fn)
+            chunk = yield _chunk_read(stream, block, radio.status_fn)
         else:
-            chunk = _safe_read(pipe, block)
-            pipe.write(chr(CMD_ACK))
-        if not chunk:
-            raise errors.RadioError("No response from radio")
+            # Give the user time to start the clone on the radio
+            chunk = yield stream.wait_exact(block, timeout=15, attempts=60)
+            LOG.debug(util.hexprint(chunk))
+            stream.write(chr(CMD_ACK))
         if radio.status_fn:
             status.cur = len(data)
             radio.status_fn(status)
@@ -98,46 +74,51 @@ def __clone_in(radio):
     if len(data) != radio.get_memsize():
         raise errors.RadioError("Received incomplete image from radio")
 
-    LOG.debug("Clone completed in %i seconds" % (time.time() - start))
+    LOG.debug("Clone completed in %i seconds (%s)" % (time.time() - start,
+                                                      stream.stats))
 
-    return memmap.MemoryMap(data)
+    raise aio.Return(memmap.MemoryMap(data))
 
 
 def _clone_in(radio):
     try:
-        return __clone_in(radio)
+        return aio.run_blocking(_clone_in_async(radio))
     except Exception, e:
         raise errors.RadioError("Failed to communicate with the radio: %s" % e)
 
 
-def _chunk_write(pipe, data, status_fn, block):
-    delay = 0.03
-    count = 0
-    for i in range(0, len(data), block):
-        chunk = data[i:i+block]
-        pipe.write(chunk)
-        count += len(chunk)
-        LOG.debug("@_chunk_write, count: %i, blocksize: %i" % (count, block))
-        time.sleep(delay)
-
-        status = chirp_common.Status()
-        status.msg = "Cloning to radio"
-        status.max = len(data)
-        status.cur = count
-        status_fn(status)
-
-
-def __clone_out(radio):
-    pipe = radio.pipe
-    block_lengths = radio._block_lengths
-    total_written = 0
+def _check_first_ack(stream, chunk):
+    """A coroutine reading the radio's answer to the first block, @chunk,
+    returning True if the cable echoed it back (as 2-pin cables do)"""
+    buf = yield stream.wait_exact(1, attempts=1)
+    if buf == chr(CMD_ACK) and chunk[0] != chr(CMD_ACK):
+        raise aio.Return(False)
+    if buf != chunk[0]:
+        raise Exception("Radio did not ack block 1")
+    if buf == chr(CMD_ACK):
+        # Either the ack, or the echo of a block that starts like one.
+        # Only an echo has more to come before we send anything else
+        buf = yield stream.wait_read(len(chunk))
+        if not buf:
+            raise aio.Return(False)
+        if len(buf) < len(chunk):
+            buf += yield stream.wait_exact(len(chunk) - len(buf), attempts=1)
+    else:
+        buf = yield stream.wait_exact(len(chunk), attempts=1)
+    if buf != chunk[1:] + chr(CMD_ACK):
+        raise Exception("Radio did not ack block 1")
+    raise aio.Return(True)
+
+
+def _clone_out_async(radio):
+    """A coroutine (see chirp.aio) writing the image to the radio"""
+    # Echo cancellation is turned on once the first block shows that the
+    # cable echoes, so that an ack is never mistaken for an echo
+    stream = aio.AsyncTransport(radio.pipe)
 
-    def _status():
-        status = chirp_common.Status()
-        status.msg = "Cloning to radio"
-        status.max = block_lengths[0] + block_lengths[1] + block_lengths[2]
-        status.cur = total_written
-        radio.status_fn(status)
+    status = chirp_common.Status()
+    status.msg = "Cloning to radio"
+    status.max = radio.get_memsize()
 
     start = time.time()
 
@@ -147,25 +128,35 @@ def __clone_out(radio):
         blocks += 1
         if blocks != len(radio._block_lengths):
             LOG.debug("Sending %i-%i" % (pos, pos+block))
-            pipe.write(radio.get_mmap()[pos:pos+block])
-            buf = pipe.read(1)
-            if buf and buf[0] != chr(CMD_ACK):
-                buf = pipe.read(block)
-            if not buf or buf[-1] != chr(CMD_ACK):
-                raise Exception("Radio did not ack block %i" % blocks)
+            chunk = radio.get_mmap()[pos:pos+block]
+            stream.write(chunk)
+            if blocks == 1:
+                stream.echo = yield _check_first_ack(stream, chunk)
+                LOG.debug("Cable echoes: %s" % stream.echo)
+            else:
+                buf = yield stream.wait_exact(1, attempts=1)
+                if buf != chr(CMD_ACK):
+                    raise Exception("Radio did not ack block %i" % blocks)
         else:
-            _chunk_write(pipe, radio.get_mmap()[pos:],
-                         radio.status_fn, radio._block_size)
+            data = radio.get_mmap()[pos:]
+            for i in range(0, len(data), radio._block_size):
+                chunk = data[i:i+radio._block_size]
+                stream.write(chunk)
+                yield aio.sleep(0.03)
+                status.cur = pos + i + len(chunk)
+                radio.status_fn(status)
         pos += block
 
-    pipe.read(pos)  # Chew the echo if using a 2-pin cable
+    # Chew the echo if using a 2-pin cable
+    yield stream.wait_read(pos)
 
-    LOG.debug("Clone completed in %i seconds" % (time.time() - start))
+    LOG.debug("Clone completed in %i seconds (%s)" % (time.time() - start,
+                                                      stream.stats))
 
 
 def _clone_out(radio):
     try:
-        return __clone_out(radio)
+        return aio.run_blocking(_clone_out_async(radio))
     except Exception, e:
         raise errors.RadioError("Failed to communicate with the radio: %s" % e)
 
@@ -250,6 +241,29 @@ class YaesuCloneModeRadio(chirp_common.CloneModeRadio):
         self.update_checksums()
         _clone_out(self)
 
+    def sync_in_async(self):
+        """A coroutine (see chirp.aio) variant of sync_in()"""
+        try:
+            self._mmap = yield _clone_in_async(self)
+        except aio.Cancelled:
+            raise
+        except Exception, e:
+            raise errors.RadioError(
+                "Failed to communicate with the radio: %s" % e)
+        self.check_checksums()
+        self.process_mmap()
+
+    def sync_out_async(self):
+        """A coroutine (see chirp.aio) variant of sync_out()"""
+        self.update_checksums()
+        try:
+            yield _clone_out_async(self)
+        except aio.Cancelled:
+            raise
+        except Exception, e:
+            raise errors.RadioError(
+                "Failed to communicate with the radio: %s" % e)
+
     @classmethod
     def match_model(cls, filedata, filename):
         return filedata[:5] == cls._model and len(filedata) == cls._memsize
@@ -0,0 +1,178 @@
+# Copyright 2026 The CHIRP developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import threading
+import time
+
+import serial
+
+from chirp import chirp_common, directory, errors
+
+LOG = logging.getLogger(__name__)
+
+
+def open_serial(rclass, port):
+    """Open @port for a radio of class @rclass"""
+    return serial.Serial(port=port,
+                         baudrate=rclass.BAUD_RATE,
+                         rtscts=rclass.HARDWARE_FLOW,
+                         timeout=0.25)
+
+
+def _done():
+    status = chirp_common.Status()
+    status.cur = status.max = 1
+    return status
+
+
+class PortResult(object):
+    """The outcome of cloning with the radio on one port"""
+
+    def __init__(self, port):
+        self.port = port
+        self.attempts = 0
+        # Seconds spent on each attempt
+        self.times = []
+        # The error from the last attempt, or None if it succeeded
+        self.error = None
+        # The radio object of the last attempt
+        self.radio = None
+
+    def __str__(self):
+        if self.error:
+            result = "FAILED: %s" % self.error
+        else:
+            result = "OK"
+        return "%s: %s (%i attempt%s, %.1fs)" % (
+            self.port, result, self.attempts,
+            self.attempts != 1 and "s" or "", sum(self.times))
+
+
+class Fleet(object):
+    """Clone to or from radios of the same model on several ports at
+    once, one thread and radio object per port.
+
+    For uploads, @image is the file sent to every radio (incrementally
+    from @base, if given, or if @incremental from what each radio is known
+    to hold, and with read-back if @verify). For downloads,
+    the radio objects in the results hold the images. Ports that fail
+    are retried up to @retries times once the others are done. Progress
+    is reported to @status_fn as one Status for the whole fleet.
+    """
+
+    def __init__(self, rclass, ports, upload=True, image=None, base=None,
+                 verify=False, retries=1, status_fn=None,
+                 open_pipe=open_serial, incremental=False):
+        self.rclass = rclass
+        self.ports = list(ports)
+        self.upload = upload
+        self.image = image
+        self.base = base
+        self.incremental = incremental
+        self.verify = verify
+        self.retries = retries
+        self.status_fn = status_fn
+        self._open_pipe = open_pipe
+        self._lock = threading.Lock()
+        self._progress = {}
+        self._base_radio = None
+
+        if upload and image is None:
+            raise errors.InvalidValueError("An image is needed to upload")
+        if ((base or incremental or verify) and
+                not rclass.can_upload_incremental()):
+            raise errors.InvalidValueError(
+                "%s can only upload whole images" % rclass.get_name())
+
+    def _status(self, port, status):
+        with self._lock:
+            try:
+                self._progress[port] = min(1.0, status.cur /
+                                           float(status.max))
+            except ZeroDivisionError:
+                pass
+            if not self.status_fn:
+                return
+            fleet_status = chirp_common.Status()
+            fleet_status.msg = "Cloning %s %i radios" % (
+                self.upload and "to" or "from", len(self._progress))
+            fleet_status.max = len(self._progress) * 100
+            fleet_status.cur = int(sum(self._progress.values()) * 100)
+            self.status_fn(fleet_status)
+
+    def _clone(self, result):
+        start = time.time()
+        result.attempts += 1
+        result.error = None
+        pipe = None
+        try:
+            pipe = self._open_pipe(self.rclass, result.port)
+            radio = self.rclass(pipe)
+            radio.status_fn = lambda s: self._status(result.port, s)
+            result.radio = radio
+            if not self.upload:
+                radio.sync_in()
+            else:
+                radio.load_mmap(self.image)
+                incremental = False
+                if self.base:
+                    radio.mark_dirty_from(self._base_radio)
+                    incremental = True
+                elif self.incremental:
+                    incremental = radio.mark_dirty_from_radio()
+                if incremental or self.verify:
+                    radio.sync_out(incremental=incremental,
+                                   verify=self.verify)
+                else:
+                    radio.sync_out()
+            self._status(result.port, _done())
+        except Exception, e:
+            LOG.error("Clone with %s failed: %s" % (result.port, e))
+            result.error = e
+        finally:
+            if pipe is not None and hasattr(pipe, "close"):
+                pipe.close()
+            result.times.append(time.time() - start)
+
+    def _run_all(self, results):
+        threads = []
+        for result in results:
+            self._progress[result.port] = 0.0
+            thread = threading.Thread(target=self._clone, args=(result,),
+                                      name="Fleet %s" % result.port)
+            thread.daemon = True
+            threads.append(thread)
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def run(self):
+        """Clone with every port, returning a list of PortResults"""
+        if self.base:
+            self._base_radio = directory.get_radio_by_image(self.base)
+
+        results = [PortResult(port) for port in self.ports]
+        pending = results
+        for attempt in range(0, self.retries + 1):
+            if attempt:
+                LOG.info("Retrying %s" % ", ".join(
+                    [r.port for r in pending]))
+            self._run_all(pending)
+            pending = [r for r in results if r.error]
+            if not pending:
+                break
+
+        return results
@@ -13,6 +13,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import copy
 import logging
 from chirp import chirp_common, errors
 
@@ -29,39 +30,67 @@ class DestNotCompatible(ImportError):
     pass
 
 
-def ensure_has_calls(radio, memory):
-    """Make sure @radio has the necessary D-STAR callsigns for @memory"""
-    ulist_changed = rlist_changed = False
+def _add_calls(calls, needed):
+    """Place each callsign in @needed that is not already in @calls into
+    an empty slot of @calls. Returns the ones that did not fit"""
+    present = set(calls)
+    empty = (i for i, call in enumerate(calls) if not call.strip())
+    missing = []
+
+    for call in needed:
+        if call in present:
+            continue
+        try:
+            calls[next(empty)] = call
+        except StopIteration:
+            missing.append(call)
+            continue
+        present.add(call)
+
+    return missing
+
+
+def _dv_calls(memory):
+    """Return the callsigns set in @memory, if it is a DV memory"""
+    if not isinstance(memory, chirp_common.DVMemory):
+        return []
+    return [call for call in (memory.dv_urcall,
+                              memory.dv_rpt1call,
+                              memory.dv_rpt2call) if call]
+
+
+def _needed_calls(memories):
+    ucalls = []
+    rcalls = []
+    for memory in memories:
+        if memory.dv_urcall and memory.dv_urcall not in ucalls:
+            ucalls.append(memory.dv_urcall)
+        for call in (memory.dv_rpt1call, memory.dv_rpt2call):
+            if call and call not in rcalls:
+                rcalls.append(call)
 
+    return ucalls, rcalls
+
+
+def _reconcile_calls(radio, memories):
     ulist = radio.get_urcall_list()
     rlist = radio.get_repeater_call_list()
+    ucalls, rcalls = _needed_calls(memories)
+
+    uorig = list(ulist)
+    rorig = list(rlist)
+    missing = _add_calls(ulist, ucalls) + _add_calls(rlist, rcalls)
 
-    if memory.dv_urcall and memory.dv_urcall not in ulist:
-        for i in range(0, len(ulist)):
-            if not ulist[i].strip():
-                ulist[i] = memory.dv_urcall
-                ulist_changed = True
-                break
-        if not ulist_changed:
-            raise errors.RadioError("No room to add callsign %s" %
-                                    memory.dv_urcall)
-
-    rlist_add = []
-    if memory.dv_rpt1call and memory.dv_rpt1call not in rlist:
-        rlist_add.append(memory.dv_rpt1call)
-    if memory.dv_rpt2call and memory.dv_rpt2call not in rlist:
-        rlist_add.append(memory.dv_rpt2call)
-
-    while rlist_add:
-        call = rlist_add.pop()
-        for i in range(0, len(rlist)):
-            if not rlist[i].strip():
-                rlist[i] = call
-                call = None
-                rlist_changed = True
-                break
-        if call:
-            raise errors.RadioError("No room to add callsign %s" % call)
+    return ulist, ulist != uorig, rlist, rlist != rorig, missing
+
+
+def ensure_has_calls(radio, memory):
+    """Make sure @radio has the necessary D-STAR callsigns for @memory"""
+    ulist, ulist_changed, rlist, rlist_changed, missing = \
+        _reconcile_calls(radio, [memory])
+
+    if missing:
+        raise errors.RadioError("No room to add callsign %s" % missing[0])
 
     if ulist_changed:
         radio.set_urcall_list(ulist)
@@ -69,6 +98,42 @@ def ensure_has_calls(radio, memory):
         radio.set_repeater_call_list(rlist)
 
 
+def ensure_has_all_calls(radio, memories):
+    """Make sure @radio has the D-STAR callsigns needed by all of the
+    DV memories in @memories, writing each call list at most once.
+    Returns the set of callsigns that could not be added for lack of
+    room in the radio's lists. The memories needing one of those can't
+    be imported, so no callsign used only by them is added"""
+    memories = [m for m in memories if isinstance(m, chirp_common.DVMemory)]
+    if not memories:
+        return set()
+
+    uorig = radio.get_urcall_list()
+    rorig = radio.get_repeater_call_list()
+    missing = set()
+    while True:
+        ucalls, rcalls = _needed_calls(memories)
+        ulist = list(uorig)
+        rlist = list(rorig)
+        left_out = _add_calls(ulist, ucalls) + _add_calls(rlist, rcalls)
+        if not left_out:
+            break
+        missing.update(left_out)
+        memories = [m for m in memories
+                    if not missing.intersection(_dv_calls(m))]
+
+    if ulist != uorig:
+        radio.set_urcall_list(ulist)
+    if rlist != rorig:
+        radio.set_repeater_call_list(rlist)
+
+    if missing:
+        LOG.warning("No room to add callsigns %s" %
+                    ", ".join(sorted(missing)))
+
+    return missing
+
+
 # Filter the name according to the destination's rules
 def _import_name(dst_radio, _srcrf, mem):
     mem.name = dst_radio.filter_name(mem.name)
@@ -91,8 +156,10 @@ def _import_power(dst_radio, _srcrf, mem):
     # and calculate the different between it and all the levels of the
     # destination, choosing the one that matches most closely.
 
-    deltas = [abs(mem.power - power) for power in levels]
-    mem.power = levels[deltas.index(min(deltas))]
+    if hasattr(dst_radio, "nearest_power"):
+        mem.power = dst_radio.nearest_power(mem.power)
+    else:
+        mem.power = chirp_common.nearest_power_level(levels, mem.power)
 
 
 def _import_tone(dst_radio, srcrf, mem):
@@ -190,16 +257,65 @@ def _import_duplex(dst_radio, srcrf, mem):
                                             "offset is abnormally large.")
 
 
-def import_mem(dst_radio, src_features, src_mem, overrides={}):
-    """Perform import logic to create a destination memory from
-    src_mem that will be compatible with @dst_radio"""
-    dst_rf = dst_radio.get_features()
+# The destination features that are only ever tested for membership
+_SET_FEATURES = ["valid_modes", "valid_tmodes", "valid_duplexes",
+                 "valid_tuning_steps", "valid_cross_modes",
+                 "valid_dtcs_pols", "valid_dtcs_codes", "valid_special_chans"]
+
+
+class _ImportDestination(object):
+    """Stands in for the destination radio during a batch import,
+    answering the questions asked by the import helpers from lookups
+    computed once instead of once per memory"""
+
+    def __init__(self, radio, src_features):
+        self.radio = radio
+        features = radio.get_features()
+        self._features = copy.copy(features)
+        for name in _SET_FEATURES:
+            # Bypassing RadioFeatures' checks, which only allow lists
+            self._features.__dict__[name] = frozenset(getattr(features,
+                                                              name))
+        # Radio.validate_memory() just validates against get_features(),
+        # so use ours instead unless the driver adds checks of its own
+        if getattr(radio.validate_memory, "im_func", None) is \
+                chirp_common.Radio.validate_memory.im_func:
+            self._validate = self._features.validate_memory
+        else:
+            self._validate = radio.validate_memory
+        self._names = {}
+        self._powers = chirp_common.make_power_level_map(
+            src_features.valid_power_levels,
+            self._features.valid_power_levels)
+
+    def get_features(self):
+        return self._features
+
+    def filter_name(self, name):
+        if name not in self._names:
+            self._names[name] = self.radio.filter_name(name)
+        return self._names[name]
+
+    def nearest_power(self, power):
+        dbm = int(power)
+        if dbm not in self._powers:
+            self._powers[dbm] = chirp_common.nearest_power_level(
+                self._features.valid_power_levels, power)
+        return self._powers[dbm]
+
+    def validate_memory(self, mem):
+        return self._validate(mem)
+
+
+def _import_mem(dst_radio, dst, src_features, src_mem, overrides,
+                calls=True, warnings=None):
+    dst_rf = dst.get_features()
 
     if isinstance(src_mem, chirp_common.DVMemory):
         if not isinstance(dst_radio, chirp_common.IcomDstarSupport):
             raise DestNotCompatible(
                 "Destination radio does not support D-STAR")
-        if dst_rf.requires_call_lists:
+        if dst_rf.requires_call_lists and calls:
             ensure_has_calls(dst_radio, src_mem)
 
     dst_mem = src_mem.dupe()
@@ -216,17 +332,95 @@ def import_mem(dst_radio, src_features, src_mem, overrides={}):
                ]
 
     for helper in helpers:
-        helper(dst_radio, src_features, dst_mem)
+        helper(dst, src_features, dst_mem)
 
-    msgs = dst_radio.validate_memory(dst_mem)
+    msgs = dst.validate_memory(dst_mem)
     errs = [x for x in msgs if isinstance(x, chirp_common.ValidationError)]
     if errs:
         raise DestNotCompatible("Unable to create import memory: %s" %
                                 ", ".join(errs))
+    if warnings is not None:
+        warnings.extend(msgs)
 
     return dst_mem
 
 
+def import_mem(dst_radio, src_features, src_mem, overrides={}):
+    """Perform import logic to create a destination memory from
+    src_mem that will be compatible with @dst_radio"""
+    return _import_mem(dst_radio, dst_radio, src_features, src_mem,
+                       overrides)
+
+
+def _convert_mems(dst_radio, dst, src_features, mems, overrides):
+    for src_mem in mems:
+        warnings = []
+        try:
+            dst_mem = _import_mem(dst_radio, dst, src_features, src_mem,
+                                  overrides.get(src_mem.number, {}),
+                                  False, warnings)
+        except ImportError, e:
+            LOG.debug("Unable to import memory %s: %s" % (src_mem.number, e))
+            yield src_mem, None, e, []
+            continue
+        yield src_mem, dst_mem, None, warnings
+
+
+def _import_mems(dst_radio, src_features, mems, overrides, calls=True):
+    dst = _ImportDestination(dst_radio, src_features)
+    results = _convert_mems(dst_radio, dst, src_features, mems, overrides)
+
+    if not calls or not dst.get_features().requires_call_lists or \
+            not isinstance(dst_radio, chirp_common.IcomDstarSupport):
+        # Nothing to add to the call lists (or, when previewing, left
+        # alone as if every callsign were present)
+        for result in results:
+            yield result
+        return
+
+    # Convert the whole set first, so that the call lists are read and
+    # written only once, with just the callsigns of the memories that
+    # can be imported
+    results = list(results)
+    missing = ensure_has_all_calls(
+        dst_radio, [dst_mem for _src, dst_mem, _e, _w in results if dst_mem])
+
+    for src_mem, dst_mem, error, warnings in results:
+        calls = missing.intersection(_dv_calls(dst_mem))
+        if calls:
+            error = DestNotCompatible(
+                "No room in the destination for callsign %s" %
+                sorted(calls)[0])
+            LOG.debug("Unable to import memory %s: %s" % (src_mem.number,
+                                                          error))
+            dst_mem = None
+            warnings = []
+        yield src_mem, dst_mem, error, warnings
+
+
+def import_mems(dst_radio, src_features, mems, overrides={}):
+    """Perform import logic on each memory in the iterable @mems,
+    generating (src_mem, dst_mem, error) for each one in turn. On
+    success error is None, otherwise dst_mem is None and error is the
+    ImportError that prevented the import (including a D-STAR callsign
+    that doesn't fit in the destination's call lists). A RadioError from
+    the destination radio itself is raised. @overrides optionally maps a
+    source memory number to the overrides for that memory"""
+    for src_mem, dst_mem, error, _warnings in _import_mems(
+            dst_radio, src_features, mems, overrides):
+        yield src_mem, dst_mem, error
+
+
+def preview_mems(dst_radio, src_features, mems):
+    """Like import_mems(), but generating (src_mem, dst_mem, error,
+    warnings), where warnings are the messages from validating dst_mem
+    against @dst_radio. The memories are consumed lazily, so a caller
+    can show each result as soon as it is ready. The destination's
+    D-STAR call lists are not changed; import_mems() adds the callsigns
+    needed by the memories actually imported"""
+    return _import_mems(dst_radio, src_features, mems, {}, calls=False)
+
+
 def _get_bank_model(radio):
     for model in radio.get_mapping_models():
         if isinstance(model, chirp_common.BankModel):
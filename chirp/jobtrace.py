@@ -0,0 +1,162 @@
+# Copyright 2026 The CHIRP developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import collections
+import json
+import threading
+
+# Most recent events kept
+MAX_EVENTS = 20000
+
+# Kinds of event
+JOB = "job"
+CALLBACK = "callback"
+
+
+def result_size(result):
+    """Return the length of @result, if it has one, otherwise None"""
+    try:
+        return len(result)
+    except Exception:
+        return None
+
+
+class TraceEvent(object):
+    """One job run on a radio thread, or one callback run in the UI"""
+
+    def __init__(self, kind, name, start, end, queued=None, priority=None,
+                 size=None, thread=None):
+        self.kind = kind
+        self.name = name
+        self.start = start
+        self.end = end
+        # When the job was submitted, if known
+        self.queued = queued
+        self.priority = priority
+        self.size = size
+        self.thread = thread or threading.current_thread().name
+
+    @property
+    def wait(self):
+        """Seconds the job spent in the queue"""
+        if self.queued is None:
+            return 0.0
+        return max(0.0, self.start - self.queued)
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+
+class JobStats(object):
+    """Totals for the events of one kind and name"""
+
+    def __init__(self, kind, name):
+        self.kind = kind
+        self.name = name
+        self.count = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.total_size = 0
+
+    def add(self, event):
+        self.count += 1
+        self.total_wait += event.wait
+        self.max_wait = max(self.max_wait, event.wait)
+        self.total_time += event.duration
+        self.max_time = max(self.max_time, event.duration)
+        self.total_size += event.size or 0
+
+    @property
+    def avg_wait(self):
+        return self.count and self.total_wait / self.count
+
+    @property
+    def avg_time(self):
+        return self.count and self.total_time / self.count
+
+
+class JobTrace(object):
+    """Records the most recent jobs and callbacks, for finding out where
+    the time goes"""
+
+    def __init__(self, max_events=MAX_EVENTS):
+        self._events = collections.deque(maxlen=max_events)
+        self._lock = threading.Lock()
+
+    def record(self, event):
+        with self._lock:
+            self._events.append(event)
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+
+    def get_events(self):
+        with self._lock:
+            return list(self._events)
+
+    def summary(self):
+        """Return JobStats by kind and name, the most time spent first"""
+        stats = {}
+        for event in self.get_events():
+            key = (event.kind, event.name)
+            if key not in stats:
+                stats[key] = JobStats(event.kind, event.name)
+            stats[key].add(event)
+        return sorted(stats.values(), key=lambda s: s.total_time,
+                      reverse=True)
+
+    def to_chrome_trace(self):
+        """Return the events in Chrome's trace event format (which can be
+        loaded in chrome://tracing or Perfetto)"""
+        events = self.get_events()
+        if not events:
+            return {"traceEvents": []}
+        origin = min([e.queued or e.start for e in events])
+        threads = {}
+
+        def usecs(secs):
+            return int((secs - origin) * 1000000)
+
+        trace = []
+        for event in events:
+            tid = threads.setdefault(event.thread, len(threads) + 1)
+            args = {"wait_ms": round(event.wait * 1000, 3)}
+            if event.priority is not None:
+                args["priority"] = event.priority
+            if event.size is not None:
+                args["size"] = event.size
+            trace.append({"name": event.name, "cat": event.kind,
+                          "ph": "X", "pid": 1, "tid": tid,
+                          "ts": usecs(event.start),
+                          "dur": usecs(event.end) - usecs(event.start),
+                          "args": args})
+        for name, tid in threads.items():
+            trace.append({"name": "thread_name", "ph": "M", "pid": 1,
+                          "tid": tid, "args": {"name": name}})
+        return {"traceEvents": trace}
+
+    def save(self, filename):
+        """Write the trace to @filename as Chrome trace JSON"""
+        trace_file = file(filename, "w")
+        json.dump(self.to_chrome_trace(), trace_file)
+        trace_file.close()
+
+
+# The trace of the UI's radio threads
+TRACE = JobTrace()
@@ -23,6 +23,15 @@ class MemoryMap:
 
     def __init__(self, data):
         self._data = list(data)
+        # Positions written with a new value since the map was created
+        # or last marked clean
+        self._dirty = set()
+        # A count of calls to set(), and the count at which each position
+        # last changed. Unlike the dirty positions these are never
+        # forgotten, so several observers can each find what changed
+        # since they last looked
+        self._changes = 0
+        self._changed_at = {}
 
     def printable(self, start=None, end=None):
         """Return a printable representation of the memory map"""
@@ -46,14 +55,19 @@ class MemoryMap:
     def set(self, pos, value):
         """Set a chunk of memory at @pos to @value"""
         if isinstance(value, int):
-            self._data[pos] = chr(value)
-        elif isinstance(value, str):
-            for byte in value:
-                self._data[pos] = byte
-                pos += 1
-        else:
+            value = chr(value)
+        elif not isinstance(value, str):
             raise ValueError("Unsupported type %s for value" %
                              type(value).__name__)
+        if pos < 0:
+            pos += len(self._data)
+        self._changes += 1
+        for byte in value:
+            if self._data[pos] != byte:
+                self._data[pos] = byte
+                self._dirty.add(pos)
+                self._changed_at[pos] = self._changes
+            pos += 1
 
     def get_packed(self):
         """Return the entire memory map as raw data"""
@@ -84,6 +98,56 @@ class MemoryMap:
     def truncate(self, size):
         """Truncate the memory map to @size"""
         self._data = self._data[:size]
+        self._dirty = set([pos for pos in self._dirty if pos < size])
+        self._changed_at = dict([(pos, mark)
+                                 for pos, mark in self._changed_at.items()
+                                 if pos < size])
+
+    def is_dirty(self, start, length=1):
+        """Return True if any of the @length bytes from @start have changed
+        since the map was created or last marked clean"""
+        if len(self._dirty) < length:
+            return any([start <= pos < start + length
+                        for pos in self._dirty])
+        return any([pos in self._dirty
+                    for pos in range(start, start + length)])
+
+    def get_change_mark(self):
+        """Return a mark to pass to changed_since() later"""
+        return self._changes
+
+    def changed_since(self, mark, start, length=1):
+        """Return True if any of the @length bytes from @start have changed
+        since get_change_mark() returned @mark"""
+        if len(self._changed_at) < length:
+            return any([changed > mark and start <= pos < start + length
+                        for pos, changed in self._changed_at.items()])
+        return any([self._changed_at.get(pos, 0) > mark
+                    for pos in range(start, start + length)])
+
+    def get_dirty_blocks(self, block_size):
+        """Return the sorted numbers of the @block_size blocks that have
+        changed since the map was created or last marked clean"""
+        return sorted(set([pos / block_size for pos in self._dirty]))
+
+    def mark_dirty(self, start, length=1):
+        """Mark the @length bytes from @start as changed"""
+        self._dirty.update(range(start, min(start + length,
+                                            len(self._data))))
+
+    def mark_dirty_from(self, data):
+        """Mark the bytes that differ from @data (another image of the same
+        size, such as the one the radio holds) as changed"""
+        self._dirty.update([pos for pos, byte in enumerate(self._data)
+                            if pos >= len(data) or data[pos] != byte])
+
+    def mark_clean(self, start=None, length=1):
+        """Forget about the changes to the @length bytes from @start, or
+        to the whole map"""
+        if start is None:
+            self._dirty = set()
+        else:
+            self._dirty.difference_update(range(start, start + length))
 
 
 # Py3 branch compatibility
@@ -0,0 +1,193 @@
+# Copyright 2026 The CHIRP developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import os
+import threading
+import time
+from ConfigParser import ConfigParser
+
+from chirp import platform
+
+LOG = logging.getLogger(__name__)
+
+CONFIG_FILE = "pacing.config"
+
+# Set to False (or set "adaptive = False" in the [global] section of the
+# config file) to always use the drivers' fixed delays
+ADAPTIVE = True
+
+# Number of clean exchanges needed at a delay before trying a shorter one
+PROBE_INTERVAL = 16
+# Fraction of the current delay tried next when probing
+PROBE_STEP = 0.8
+
+_CONFIG = None
+_PACERS = {}
+# Pacers may be used (and their config saved) by several clones at once
+_LOCK = threading.RLock()
+
+
+def _config_path():
+    return platform.get_platform().config_file(CONFIG_FILE)
+
+
+def _get_config():
+    global _CONFIG
+
+    if _CONFIG is None:
+        _CONFIG = ConfigParser()
+        path = _config_path()
+        if os.path.exists(path):
+            _CONFIG.read(path)
+    return _CONFIG
+
+
+def _save_config():
+    config = _get_config()
+    cfg_file = file(_config_path(), "w")
+    config.write(cfg_file)
+    cfg_file.close()
+
+
+def _adaptive():
+    config = _get_config()
+    if config.has_option("global", "adaptive"):
+        return config.get("global", "adaptive") == "True"
+    return ADAPTIVE
+
+
+class Pacer(object):
+    """An inter-byte or inter-block delay that adapts to the link.
+
+    The delay starts at the last value learned for this radio and port
+    (or @default, the driver's proven-safe delay). After PROBE_INTERVAL
+    clean exchanges, a shorter delay is tried, down to @minimum. Any
+    failure returns to the last delay known to work, or to @default if
+    that was the one that failed, and stops probing until the next
+    session is started.
+
+    Drivers retry an exchange that failed while probing (see failed())
+    at the delay returned to, so a failed probe costs one retry rather
+    than the clone.
+    """
+
+    def __init__(self, name, default, minimum=None, section=None,
+                 adaptive=True):
+        self.name = name
+        self.default = default
+        self.minimum = minimum if minimum is not None else default
+        self.section = section
+        self.adaptive = adaptive and self.minimum < default
+        self.good = default
+        self.delay = default
+        self._probing = self.adaptive
+        self._clean = 0
+
+        if self.adaptive and self.section:
+            self.good = self.delay = self._load()
+
+    def _load(self):
+        config = _get_config()
+        if not config.has_option(self.section, self.name):
+            return self.default
+        try:
+            delay = float(config.get(self.section, self.name))
+        except ValueError:
+            LOG.warning("Ignoring invalid %s for %s" % (self.name,
+                                                        self.section))
+            return self.default
+        return min(max(delay, self.minimum), self.default)
+
+    def _store(self):
+        if not self.section:
+            return
+        with _LOCK:
+            config = _get_config()
+            if not config.has_section(self.section):
+                config.add_section(self.section)
+            config.set(self.section, self.name, "%.6f" % self.good)
+            try:
+                _save_config()
+            except Exception, e:
+                LOG.warning("Unable to save pacing config: %s" % e)
+
+    def start(self):
+        """Start a new session (a clone), resuming probing from the last
+        delay known to work"""
+        self.delay = self.good
+        self._probing = self.adaptive
+        self._clean = 0
+
+    def wait(self):
+        """Sleep for the current delay"""
+        time.sleep(self.delay)
+
+    def ok(self):
+        """Record a clean exchange (a good ack or echo)"""
+        if not self._probing:
+            return
+        self._clean += 1
+        if self._clean < PROBE_INTERVAL:
+            return
+        self._clean = 0
+        if self.delay < self.good:
+            self.good = self.delay
+            self._store()
+        probe = max(self.delay * PROBE_STEP, self.minimum)
+        if probe < self.delay:
+            LOG.debug("Pacing %s: trying %.4fs" % (self.name, probe))
+            self.delay = probe
+
+    def failed(self):
+        """Record a failed exchange, backing off to a known-good delay.
+        Returns True if the delay was backed off, in which case the
+        exchange should be retried (once) at the new delay"""
+        if not self._probing:
+            return False
+        self._clean = 0
+        self._probing = False
+        if self.delay >= self.good:
+            if self.good == self.default:
+                return False
+            # The learned delay itself is not safe
+            self.good = self.default
+            self._store()
+        LOG.debug("Pacing %s: failure at %.4fs, returning to %.4fs" % (
+            self.name, self.delay, self.good))
+        self.delay = self.good
+        return True
+
+
+def get_pacer(radio, name, default, minimum=None):
+    """Return the Pacer for the delay @name of @radio, whose fixed delay
+    is @default. Learned delays are kept per model and serial port."""
+    port = getattr(radio.pipe, "port", None)
+    if port and isinstance(port, basestring):
+        section = "%s %s %s" % (radio.VENDOR, radio.MODEL, port)
+    else:
+        # Nothing to identify the link by, so don't persist anything
+        section = None
+
+    key = (radio.__class__, port, name)
+    with _LOCK:
+        pacer = _PACERS.get(key)
+        if pacer is None:
+            adaptive = ADAPTIVE
+            if section and adaptive:
+                adaptive = _adaptive()
+            pacer = Pacer(name, default, minimum, section, adaptive)
+            _PACERS[key] = pacer
+    return pacer
@@ -0,0 +1,140 @@
+# Copyright 2026 The CHIRP developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import os
+import threading
+from ConfigParser import RawConfigParser
+
+from chirp import platform
+
+LOG = logging.getLogger(__name__)
+
+CONFIG_FILE = "radioblocks.config"
+
+_CONFIG = None
+_RECORDS = {}
+# Records may be updated (and saved) by several clones at once
+_LOCK = threading.RLock()
+
+
+def _config_path():
+    return platform.get_platform().config_file(CONFIG_FILE)
+
+
+def _get_config():
+    global _CONFIG
+
+    if _CONFIG is None:
+        _CONFIG = RawConfigParser()
+        path = _config_path()
+        if os.path.exists(path):
+            try:
+                _CONFIG.read(path)
+            except Exception, e:
+                LOG.warning("Ignoring invalid %s: %s" % (path, e))
+                _CONFIG = RawConfigParser()
+    return _CONFIG
+
+
+def _save_config():
+    config = _get_config()
+    cfg_file = file(_config_path(), "w")
+    config.write(cfg_file)
+    cfg_file.close()
+
+
+class BlockRecord(object):
+    """The digests of the chunks of an image (by address) that a radio is
+    known to hold, from its last download or a verified upload.
+
+    Unlike the radio object, which is replaced whenever an image is
+    loaded, the record lasts as long as the process, and is saved in
+    the config directory under @section (if not None).
+    """
+
+    def __init__(self, section=None):
+        self.section = section
+        self._blocks = {}
+
+        if self.section:
+            self._load()
+
+    def _load(self):
+        config = _get_config()
+        if not config.has_section(self.section):
+            return
+        for option, value in config.items(self.section):
+            try:
+                size, digest = value.split(" ")
+                self._blocks[int(option, 16)] = (int(size),
+                                                 digest.decode("hex"))
+            except (ValueError, TypeError):
+                LOG.warning("Ignoring invalid block %s for %s" % (
+                    option, self.section))
+
+    def items(self):
+        """Return the recorded (addr, (size, digest)) pairs"""
+        return sorted(self._blocks.items())
+
+    def is_empty(self):
+        """Return True if nothing is known about the radio"""
+        return not self._blocks
+
+    def set(self, addr, size, digest):
+        """Record that the radio holds @size bytes with @digest at @addr"""
+        self._blocks[addr] = (size, digest)
+
+    def forget(self, addr):
+        """Drop what is recorded at @addr"""
+        self._blocks.pop(addr, None)
+
+    def save(self):
+        """Write the record to the config file"""
+        if not self.section:
+            return
+        with _LOCK:
+            config = _get_config()
+            config.remove_section(self.section)
+            config.add_section(self.section)
+            for addr, (size, digest) in self.items():
+                config.set(self.section, "%04x" % addr,
+                           "%i %s" % (size, digest.encode("hex")))
+            try:
+                _save_config()
+            except Exception, e:
+                LOG.warning("Unable to save radio blocks: %s" % e)
+
+
+def get_record(radio):
+    """Return the BlockRecord of the radio attached to @radio's pipe. Like
+    learned delays (see pacing), records are kept per model and serial
+    port."""
+    port = getattr(radio.pipe, "port", None)
+    if port and isinstance(port, basestring):
+        section = "%s %s %s" % (radio.VENDOR, radio.MODEL, port)
+    else:
+        # Nothing to identify the link by, so don't persist anything
+        section = None
+
+    # By model rather than driver class, as the section is, so that every
+    # driver for a model shares what is known about the radio
+    key = (radio.VENDOR, radio.MODEL, port)
+    with _LOCK:
+        record = _RECORDS.get(key)
+        if record is None:
+            record = BlockRecord(section)
+            _RECORDS[key] = record
+    return record
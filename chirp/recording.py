@@ -0,0 +1,203 @@
+# Copyright 2026 The CHIRP developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import time
+
+from chirp import errors, util
+
+LOG = logging.getLogger(__name__)
+
+HEADER = "# CHIRP serial recording"
+READ = "r"
+WRITE = "w"
+
+
+def save_recording(events, filename):
+    """Save @events, a list of (time, kind, data), to @filename"""
+    rec_file = file(filename, "w")
+    print >>rec_file, HEADER
+    for stamp, kind, data in events:
+        print >>rec_file, "%.6f %s %s" % (stamp, kind, data.encode("hex"))
+    rec_file.close()
+
+
+def load_recording(filename):
+    """Return the list of (time, kind, data) events saved in @filename"""
+    events = []
+    rec_file = file(filename)
+    for line in rec_file:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            stamp, kind, data = line.split(" ")
+            events.append((float(stamp), kind, data.decode("hex")))
+        except (ValueError, TypeError):
+            rec_file.close()
+            raise errors.InvalidDataError("Invalid recording line: %s" %
+                                          line)
+    rec_file.close()
+    return events
+
+
+class RecordingPipe(object):
+    """Wraps a serial pipe, recording the data read from and written to
+    it along with the time (from the start of the recording) of each
+    transfer. Everything else is passed through to @pipe."""
+
+    def __init__(self, pipe):
+        self.__dict__["_pipe"] = pipe
+        self.__dict__["_start"] = time.time()
+        self.__dict__["events"] = []
+
+    def __getattr__(self, name):
+        return getattr(self._pipe, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._pipe, name, value)
+
+    def _record(self, kind, data):
+        self.events.append((time.time() - self._start, kind, data))
+
+    def read(self, size=1):
+        data = self._pipe.read(size)
+        if data:
+            self._record(READ, data)
+        return data
+
+    def write(self, data):
+        self._record(WRITE, data)
+        return self._pipe.write(data)
+
+    def save(self, filename):
+        """Save the recording to @filename"""
+        save_recording(self.events, filename)
+
+
+class ReplayPipe(object):
+    """A serial pipe that plays back a recording.
+
+    Data recorded as read after a write becomes available once the driver
+    has made that write, and reads return "" (a timeout) when no more is
+    available. The driver's writes must match the recorded ones, or
+    RadioError is raised. With @realtime, data becomes available only as
+    long after the write before it as it did when it was recorded, so
+    that the replay takes about as long as the radio would.
+    """
+
+    def __init__(self, events, realtime=False):
+        self.events = list(events)
+        self.realtime = realtime
+        self.timeout = 0.25
+        self.baudrate = 9600
+        self._pos = 0
+        self._rbuf = ""
+        self._wbuf = ""
+        # Times of the last matched write, when recorded and replayed
+        self._last_write = (0.0, time.time())
+
+    def _release(self, wait=False):
+        """Make the recorded reads up to the next write available. With
+        @wait, block (in realtime) until at least one is, if any are
+        pending"""
+        while self._pos < len(self.events):
+            stamp, kind, data = self.events[self._pos]
+            if kind != READ:
+                break
+            if self.realtime:
+                due = self._last_write[1] + stamp - self._last_write[0]
+                delay = due - time.time()
+                if delay > 0:
+                    if not (wait and not self._rbuf):
+                        break
+                    time.sleep(delay)
+            self._rbuf += data
+            self._pos += 1
+
+    @property
+    def in_waiting(self):
+        self._release()
+        return len(self._rbuf)
+
+    def inWaiting(self):
+        return self.in_waiting
+
+    def read(self, size=1):
+        self._release(wait=True)
+        data = self._rbuf[:size]
+        self._rbuf = self._rbuf[size:]
+        return data
+
+    def write(self, data):
+        remaining = data
+        while remaining:
+            if not self._wbuf:
+                self._release()
+                if (self._pos >= len(self.events) or
+                        self.events[self._pos][1] != WRITE):
+                    raise errors.RadioError(
+                        "Replay: unexpected write:\n%s" %
+                        util.hexprint(remaining))
+                self._wbuf = self.events[self._pos][2]
+                self._last_write = (self.events[self._pos][0], time.time())
+                self._pos += 1
+            count = min(len(remaining), len(self._wbuf))
+            if remaining[:count] != self._wbuf[:count]:
+                raise errors.RadioError(
+                    "Replay: wrote\n%sinstead of\n%s" % (
+                        util.hexprint(remaining[:count]),
+                        util.hexprint(self._wbuf[:count])))
+            remaining = remaining[count:]
+            self._wbuf = self._wbuf[count:]
+
+    def is_done(self):
+        """Return True if the whole recording has been played back"""
+        return (self._pos >= len(self.events) and not self._rbuf and
+                not self._wbuf)
+
+    # The rest of the pyserial interface used by drivers
+    def setBaudrate(self, rate):
+        self.baudrate = rate
+
+    def setTimeout(self, timeout):
+        self.timeout = timeout
+
+    def setParity(self, parity):
+        pass
+
+    def setRTS(self, value=True):
+        pass
+
+    def setDTR(self, value=True):
+        pass
+
+    def flush(self):
+        pass
+
+    def flushInput(self):
+        pass
+
+    def flushOutput(self):
+        pass
+
+    def reset_input_buffer(self):
+        pass
+
+    def reset_output_buffer(self):
+        pass
+
+    def close(self):
+        pass
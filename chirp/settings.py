@@ -48,6 +48,10 @@ class RadioSettingValue:
         """Returns True if the setting has been changed since init"""
         return self._has_changed
 
+    def clear_changed(self):
+        """Forget that the setting has been changed"""
+        self._has_changed = False
+
     def set_validate_callback(self, callback):
         self._validate_callback = callback
 
@@ -286,6 +290,44 @@ def zero_indexed_seq_map(user_options):
     return zip(user_options, mem_vals)
 
 
+class SettingPaths(object):
+
+    """Resolves setting names to the object and attribute they set.
+
+    Names with dots are paths from @root, like "settings.squelch" or
+    "fm_presets/2.freq" (an index into an array); names without one are
+    attributes of @default. Each path is walked once and remembered, so
+    @root must be the radio's current memory object."""
+
+    def __init__(self, root, default):
+        self._root = root
+        self._default = default
+        self._paths = {}
+
+    def resolve(self, name):
+        """Returns (object, attribute) for setting @name"""
+        try:
+            return self._paths[name]
+        except KeyError:
+            pass
+
+        if "." in name:
+            bits = name.split(".")
+            obj = self._root
+            for bit in bits[:-1]:
+                if "/" in bit:
+                    bit, index = bit.split("/", 1)
+                    obj = getattr(obj, bit)[int(index)]
+                else:
+                    obj = getattr(obj, bit)
+            path = (obj, bits[-1])
+        else:
+            path = (self._default, name)
+
+        self._paths[name] = path
+        return path
+
+
 class RadioSettings(list):
 
     def __init__(self, *groups):
@@ -295,6 +337,25 @@ class RadioSettings(list):
         items = [str(self[i]) for i in range(0, len(self))]
         return "\n".join(items)
 
+    def changed(self):
+        """Returns True if any setting has been changed"""
+        for group in self:
+            if group.changed():
+                return True
+        return False
+
+    def clear_changed(self):
+        """Forget which settings have been changed"""
+        for group in self:
+            group.clear_changed()
+
+    def get_changed(self):
+        """Returns a RadioSettings with only the settings that have been
+        changed, in (copies of) the groups that contain them"""
+        groups = [group.get_changed() for group in self]
+        return RadioSettings(*[group for group in groups
+                               if group is not None])
+
 
 class RadioSettingGroup(object):
 
@@ -311,6 +372,7 @@ class RadioSettingGroup(object):
         self.__doc__ = name          # Longer explanation/documentation
         self._elements = {}
         self._element_order = []
+        self._loader = None
 
         for element in elements:
             self._validate(element)
@@ -328,7 +390,23 @@ class RadioSettingGroup(object):
         """Sets the docstring for the group"""
         self.__doc__ = doc
 
+    def set_loader(self, loader, *args):
+        """Has @loader(group, *args) append the group's elements the first
+        time they are needed, instead of building them up front"""
+        self._loader = lambda: loader(self, *args)
+
+    def is_loaded(self):
+        """Returns True if the group's elements have been built"""
+        return self._loader is None
+
+    def load(self):
+        """Builds the group's elements, if that has not happened yet"""
+        if self._loader is not None:
+            loader, self._loader = self._loader, None
+            loader()
+
     def __str__(self):
+        self.load()
         string = "group '%s': {\n" % self._name
         for element in sorted(self._elements.values()):
             string += "\t" + str(element) + "\n"
@@ -365,12 +443,15 @@ class RadioSettingGroup(object):
     # Dictionary interface
 
     def __len__(self):
+        self.load()
         return len(self._elements)
 
     def __getitem__(self, name):
+        self.load()
         return self._elements[name]
 
     def __setitem__(self, name, value):
+        self.load()
         if name in self._element_order:
             raise KeyError("Duplicate item %s" % name)
         self._elements[name] = value
@@ -378,16 +459,55 @@ class RadioSettingGroup(object):
 
     def items(self):
         """Returns a key=>value set of elements, like a dict"""
+        self.load()
         return [(name, self._elements[name]) for name in self._element_order]
 
     def keys(self):
         """Returns a list of string element names"""
+        self.load()
         return self._element_order
 
     def values(self):
         """Returns the list of elements"""
+        self.load()
         return [self._elements[name] for name in self._element_order]
 
+    # Change tracking
+
+    def changed(self):
+        """Returns True if any setting in the group has been changed"""
+        if not self.is_loaded():
+            # Nothing can have changed in what has not been built
+            return False
+        for element in self.values():
+            if element.changed():
+                return True
+        return False
+
+    def clear_changed(self):
+        """Forget which settings in the group have been changed"""
+        if not self.is_loaded():
+            return
+        for element in self.values():
+            element.clear_changed()
+
+    def get_changed(self):
+        """Returns a copy of the group with only the settings (and
+        subgroups) that have been changed, or None if none have"""
+        if not self.changed():
+            return None
+        group = self.__class__(self._name, self._shortname)
+        group.__doc__ = self.__doc__
+        for element in self.values():
+            if isinstance(element, RadioSetting):
+                if element.changed():
+                    group.append(element)
+            else:
+                subgroup = element.get_changed()
+                if subgroup is not None:
+                    group.append(subgroup)
+        return group
+
 
 class RadioSetting(RadioSettingGroup):
 
@@ -419,6 +539,11 @@ class RadioSetting(RadioSettingGroup):
                 return True
         return False
 
+    def get_changed(self):
+        if self.changed():
+            return self
+        return None
+
     def __str__(self):
         return "%s:%s" % (self._name, self.value)
 
@@ -0,0 +1,257 @@
+# Copyright 2026 The CHIRP developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import collections
+import logging
+import time
+
+from chirp import errors
+
+LOG = logging.getLogger(__name__)
+
+BUFSIZE = 4096
+
+# Number of requests a Pipeline keeps in flight by default
+PIPELINE_DEPTH = 4
+
+
+class TransportStats(object):
+    """Byte-level counters for a SerialTransport"""
+
+    def __init__(self):
+        self.start = time.time()
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.reads = 0
+        self.writes = 0
+        self.echo_bytes = 0
+        self.timeouts = 0
+
+    def elapsed(self):
+        """Return the number of seconds since the transport was opened"""
+        return time.time() - self.start
+
+    def read_rate(self):
+        """Return the average receive rate in bytes per second"""
+        elapsed = self.elapsed()
+        if elapsed <= 0:
+            return 0.0
+        return self.bytes_read / elapsed
+
+    def __str__(self):
+        return ("%i bytes in %i reads, %i bytes in %i writes, "
+                "%i echo bytes, %i timeouts, %.0f B/s" % (
+                    self.bytes_read, self.reads,
+                    self.bytes_written, self.writes,
+                    self.echo_bytes, self.timeouts,
+                    self.read_rate()))
+
+
+class SerialTransport(object):
+    """A buffered wrapper around a serial pipe for radio drivers.
+
+    Received data is kept in a preallocated buffer, so that drivers can
+    ask for exactly the bytes they need (read_exact) or for a delimited
+    response (read_until) without building strings a few bytes at a time.
+    With @echo, everything written is expected to be echoed back by the
+    cable (as with 2-pin cables) and is removed from the received data.
+    """
+
+    def __init__(self, pipe, echo=False, bufsize=BUFSIZE):
+        self.pipe = pipe
+        self.echo = echo
+        self.stats = TransportStats()
+        self._buf = bytearray(bufsize)
+        self._start = 0
+        self._end = 0
+        self._echo = bytearray()
+
+    def __len__(self):
+        return self._end - self._start
+
+    def _append(self, data):
+        if len(self._buf) - self._end < len(data):
+            # Move the unread data to the front of the buffer, growing
+            # it only if that does not make enough room
+            pending = self._end - self._start
+            if len(self._buf) - pending < len(data):
+                self._buf.extend(bytearray(pending + len(data) -
+                                           len(self._buf)))
+            self._buf[0:pending] = self._buf[self._start:self._end]
+            self._start = 0
+            self._end = pending
+        self._buf[self._end:self._end + len(data)] = data
+        self._end += len(data)
+
+    def _cancel_echo(self, data):
+        matched = 0
+        while (matched < len(data) and matched < len(self._echo) and
+               data[matched] == self._echo[matched]):
+            matched += 1
+        if matched < len(data) and matched < len(self._echo):
+            # The radio answered before (or instead of) the echo, so
+            # there is no echo to remove
+            LOG.debug("Expected echo not received, discarding %i bytes" %
+                      len(self._echo))
+            del self._echo[:]
+            return data
+        del self._echo[:matched]
+        self.stats.echo_bytes += matched
+        return data[matched:]
+
+    def _waiting(self):
+        try:
+            if hasattr(self.pipe, "in_waiting"):
+                return self.pipe.in_waiting
+            elif hasattr(self.pipe, "inWaiting"):
+                return self.pipe.inWaiting()
+        except Exception:
+            pass
+        return 0
+
+    def _fill(self, count):
+        """Do a single read of at least @count bytes from the pipe,
+        returning the number of bytes received (including any echo)"""
+        count = max(count, self._waiting())
+        data = self.pipe.read(count)
+        self.stats.reads += 1
+        if not data:
+            return 0
+        received = len(data)
+        self.stats.bytes_read += received
+        data = bytearray(data)
+        if self._echo:
+            data = self._cancel_echo(data)
+        self._append(data)
+        return received
+
+    def _take(self, count):
+        data = str(self._buf[self._start:self._start + count])
+        self._start += len(data)
+        if self._start == self._end:
+            self._start = self._end = 0
+        return data
+
+    def write(self, data):
+        """Write @data to the pipe"""
+        self.pipe.write(data)
+        self.stats.writes += 1
+        self.stats.bytes_written += len(data)
+        if self.echo:
+            self._echo.extend(data)
+
+    def read(self, count):
+        """Read up to @count bytes, doing at most one read from the pipe"""
+        if len(self) < count:
+            self._fill(count - len(self))
+        return self._take(min(count, len(self)))
+
+    def read_exact(self, count, deadline=None, attempts=1):
+        """Read exactly @count bytes. If @deadline (a time.time() value) is
+        given, keep reading until then, otherwise give up after @attempts
+        reads from the pipe return nothing. Raises RadioError if the data
+        does not arrive in time."""
+        while len(self) < count:
+            if self._fill(count - len(self)):
+                continue
+            if deadline is not None:
+                if time.time() < deadline:
+                    continue
+            else:
+                attempts -= 1
+                if attempts > 0:
+                    continue
+            self.stats.timeouts += 1
+            raise errors.RadioError(
+                "Timed out reading from radio (%i/%i bytes)" % (len(self),
+                                                                count))
+        return self._take(count)
+
+    def read_until(self, delimiter, deadline=None, attempts=1):
+        """Read up to and including @delimiter, giving up as read_exact()
+        does. Returns whatever was received if the delimiter never came."""
+        searched = 0
+        while True:
+            index = self._buf.find(delimiter, self._start + searched,
+                                   self._end)
+            if index >= 0:
+                return self._take(index + len(delimiter) - self._start)
+            # Only search the new data next time, allowing for a
+            # delimiter that spans reads
+            searched = max(0, len(self) - len(delimiter) + 1)
+            if self._fill(1):
+                continue
+            if deadline is not None:
+                if time.time() < deadline:
+                    continue
+            else:
+                attempts -= 1
+                if attempts > 0:
+                    continue
+            self.stats.timeouts += 1
+            return self._take(len(self))
+
+    def flush_input(self):
+        """Discard any buffered data and outstanding echo"""
+        self._start = self._end = 0
+        del self._echo[:]
+
+
+class Pipeline(object):
+    """Keeps several requests to a live-mode radio in flight at once.
+
+    @send(request) writes one request to the radio. @receive(key) reads
+    the next response and returns a (key, response) pair, where key
+    identifies the request answered (or is None if the response can not
+    be matched to one). The key of the oldest unanswered request is
+    passed in, for protocols whose responses do not say which request
+    they answer. After a response that times out (RadioError) or does not
+    match, @flush() is called to discard whatever else is on its way.
+    """
+
+    def __init__(self, send, receive, depth=PIPELINE_DEPTH, flush=None):
+        self._send = send
+        self._receive = receive
+        self._flush = flush
+        self.depth = max(1, depth)
+
+    def run(self, requests):
+        """Send @requests, a list of (key, request) pairs, and return a
+        dict of the responses by key. Requests left unanswered after a
+        failure are missing from the result, so that the caller can retry
+        them one at a time."""
+        requests = collections.deque(requests)
+        outstanding = []
+        results = {}
+        while requests or outstanding:
+            while requests and len(outstanding) < self.depth:
+                key, request = requests.popleft()
+                self._send(request)
+                outstanding.append(key)
+            try:
+                key, response = self._receive(outstanding[0])
+            except errors.RadioError, e:
+                LOG.debug("Pipelined request failed: %s" % e)
+                key = None
+            if key not in outstanding:
+                LOG.warning("Lost track of pipelined requests, "
+                            "%i left unanswered" % (len(outstanding) +
+                                                    len(requests)))
+                if self._flush:
+                    self._flush()
+                break
+            outstanding.remove(key)
+            results[key] = response
+        return results
@@ -144,6 +144,41 @@ class MemoryMappingsJob(common.RadioJob):
         self.cb(mem, mappings, indexes, *self.cb_args)
 
 
+class AllMemoryMappingsJob(common.RadioJob):
+    """Gets every memory and the mappings it is in, reading the mapping
+    table once instead of once per memory"""
+
+    def __init__(self, model, cb):
+        common.RadioJob.__init__(self, cb, None)
+        self.__model = model
+
+    def execute(self, radio):
+        try:
+            lo, hi = radio.get_features().memory_bounds
+            memories = radio.get_memories(lo, hi)
+            memberships = self.__model.get_all_memberships()
+            is_indexed = isinstance(self.__model,
+                                    chirp_common.MappingModelIndexInterface)
+            rows = []
+            for mem in memories:
+                if mem.empty:
+                    mappings = []
+                else:
+                    mappings = memberships.get(mem.number, [])
+                indexes = []
+                if is_indexed:
+                    for mapping in mappings:
+                        indexes.append(self.__model.get_memory_index(mem,
+                                                                     mapping))
+                rows.append((mem, mappings, indexes))
+        except Exception, e:
+            LOG.error("Failed to get all %s information: %s" %
+                      (self.__model.get_name(), e))
+            rows = e
+
+        gobject.idle_add(self.cb, rows, *self.cb_args)
+
+
 class MappingMembershipEditor(common.Editor):
     def _number_to_path(self, number):
         return (number - self._rf.memory_bounds[0],)
@@ -355,34 +390,46 @@ class MappingMembershipEditor(common.Editor):
         self.root = sw
         self._loaded = False
 
+    def _set_memory_row(self, memory, mappings, indexes):
+        iter = self._store.get_iter(self._number_to_path(memory.number))
+        row = [self.C_FILLED, not memory.empty,
+               self.C_LOC, memory.number,
+               self.C_FREQ, chirp_common.format_freq(memory.freq),
+               self.C_NAME, memory.name,
+               # Hack for only one index right now
+               self.C_INDEX, indexes and indexes[0] or 0,
+               ]
+        for i in range(0, len(self.mappings)):
+            row.append(i + len(self._cols))
+            row.append(self.mappings[i][0] in mappings)
+
+        self._store.set(iter, *tuple(row))
+
     def refresh_memory(self, number):
-        def got_mem(memory, mappings, indexes):
-            iter = self._store.get_iter(self._number_to_path(memory.number))
-            row = [self.C_FILLED, not memory.empty,
-                   self.C_LOC, memory.number,
-                   self.C_FREQ, chirp_common.format_freq(memory.freq),
-                   self.C_NAME, memory.name,
-                   # Hack for only one index right now
-                   self.C_INDEX, indexes and indexes[0] or 0,
-                   ]
-            for i in range(0, len(self.mappings)):
-                row.append(i + len(self._cols))
-                row.append(self.mappings[i][0] in mappings)
-
-            self._store.set(iter, *tuple(row))
-
-        job = MemoryMappingsJob(self._model, got_mem, number)
+        job = MemoryMappingsJob(self._model, self._set_memory_row, number)
         job.set_desc(_("Getting {type} information "
                        "for memory {num}").format(type=self._type, num=number))
         self.rthread.submit(job)
 
     def refresh_all_memories(self):
-        start = time.time()
-        (min, max) = self._rf.memory_bounds
-        for i in range(min, max+1):
-            self.refresh_memory(i)
-        LOG.debug("Got all %s info in %s" %
-                  (self._type, (time.time() - start)))
+        def got_all(rows, start):
+            if isinstance(rows, Exception):
+                # Fall back to one memory at a time, so that one bad
+                # memory does not leave the rest blank
+                (min, max) = self._rf.memory_bounds
+                for i in range(min, max+1):
+                    self.refresh_memory(i)
+                return
+
+            for memory, mappings, indexes in rows:
+                self._set_memory_row(memory, mappings, indexes)
+            LOG.debug("Got all %s info in %s" %
+                      (self._type, (time.time() - start)))
+
+        job = AllMemoryMappingsJob(self._model, got_all)
+        job.set_cb_args(time.time())
+        job.set_desc(_("Getting %s information") % self._type)
+        self.rthread.submit(job)
 
     def refresh_mappings(self, and_memories=False):
         def got_mappings():
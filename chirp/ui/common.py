@@ -17,13 +17,15 @@ import gtk
 import gobject
 import pango
 
+import bisect
+import collections
 import threading
 import time
 import os
 import traceback
 import logging
 
-from chirp import errors
+from chirp import errors, jobtrace
 from chirp.ui import reporting, config
 
 LOG = logging.getLogger(__name__)
@@ -45,6 +47,8 @@ class Editor(gobject.GObject):
         self.read_only = False
         self._focused = False
         self.rthread = rthread
+        # Cancels this editor's queued jobs when it is closed
+        self.job_token = JobToken()
 
     def is_focused(self):
         return self._focused
@@ -71,7 +75,7 @@ class Editor(gobject.GObject):
         return self.read_only
 
     def prepare_close(self):
-        pass
+        self.job_token.cancel()
 
     def other_editor_changed(self, editor):
         pass
@@ -84,6 +88,17 @@ def DBG(*args):
         LOG.debug(" ".join(args))
 
 
+class JobToken(object):
+    """Cancels the RadioJobs it is set on, if they have not run yet, and
+    stops their callbacks from being called if they have"""
+
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
 class RadioJob:
     def __init__(self, cb, func, *args, **kwargs):
         self.cb = cb
@@ -93,7 +108,16 @@ class RadioJob:
         self.kwargs = kwargs
         self.desc = "Working"
         self.target = None
+        self.token = None
+        # When and at what priority the job was queued
+        self.queued = None
+        self.priority = None
+        self._finished = None
+        # The size of the result, if it has one, for the job trace
+        self.result_size = None
         self.tb = traceback.format_stack()
+        # Callbacks of identical jobs merged into this one
+        self._merged = []
 
     def __str__(self):
         return "RadioJob(%s,%s,%s)" % (self.func, self.args, self.kwargs)
@@ -107,6 +131,54 @@ class RadioJob:
     def set_target(self, target):
         self.target = target
 
+    def set_token(self, token):
+        self.token = token
+
+    def get_name(self):
+        """Return the name of the job in the job trace"""
+        if isinstance(self.func, str):
+            return self.func
+        return self.__class__.__name__
+
+    def _callbacks(self):
+        return [(self.cb, self.cb_args, self.token)] + self._merged
+
+    def cancelled(self):
+        """Return True if every job merged into this one is cancelled"""
+        for _cb, _args, token in self._callbacks():
+            if token is None or not token.cancelled:
+                return False
+        return True
+
+    def coalesce_key(self):
+        """Return what identifies jobs that can share one run (those that
+        only get things, with equal arguments), or None"""
+        if not isinstance(self.func, str) or \
+                not self.func.startswith("get_"):
+            return None
+        key = (id(self.target), self.func, self.args,
+               tuple(sorted(self.kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def merge(self, job):
+        """Have @job's callback called with this job's result"""
+        self._merged.extend(job._callbacks())
+
+    def _callback(self, cb, result, cb_args):
+        start = time.time()
+        try:
+            return cb(result, *cb_args)
+        finally:
+            name = "%s: %s" % (self.get_name(),
+                               getattr(cb, "__name__", "callback"))
+            jobtrace.TRACE.record(jobtrace.TraceEvent(
+                jobtrace.CALLBACK, name, start, time.time(),
+                queued=self._finished))
+
     def _execute(self, target, func):
         try:
             DBG("Running %s (%s %s)" % (self.func,
@@ -125,8 +197,12 @@ class RadioJob:
                       (os.linesep, "".join(self.tb[:-1])))
             result = e
 
-        if self.cb:
-            gobject.idle_add(self.cb, result, *self.cb_args)
+        self._finished = time.time()
+        self.result_size = jobtrace.result_size(result)
+
+        for cb, cb_args, token in self._callbacks():
+            if cb and not (token and token.cancelled):
+                gobject.idle_add(self._callback, cb, result, cb_args)
 
     def execute(self, radio):
         if not self.target:
@@ -149,9 +225,17 @@ class RadioThread(threading.Thread, gobject.GObject):
         }
 
     def __init__(self, radio, parent=None):
-        threading.Thread.__init__(self)
+        threading.Thread.__init__(self, name="RadioThread %s" %
+                                  radio.__class__.__name__)
         gobject.GObject.__init__(self)
+        # A FIFO of jobs for each priority, and the priorities that have
+        # jobs, most urgent (lowest) first
         self.__queue = {}
+        self.__priorities = []
+        # Queued jobs that others can be merged into, by coalesce_key(),
+        # and the number of queued jobs that can not be
+        self.__coalescable = {}
+        self.__uncoalescable = 0
         if parent:
             self.__runlock = parent._get_run_lock()
             self.status = lambda msg: parent.status(msg)
@@ -161,6 +245,8 @@ class RadioThread(threading.Thread, gobject.GObject):
 
         self.__counter = threading.Semaphore(0)
         self.__lock = threading.Lock()
+        # Notified whenever a job leaves the queue
+        self.__dequeued = threading.Condition(self.__lock)
 
         self.__enabled = True
         self.radio = radio
@@ -175,27 +261,51 @@ class RadioThread(threading.Thread, gobject.GObject):
         self.__lock.release()
 
     def _qsubmit(self, job, priority):
+        job.queued = time.time()
+        job.priority = priority
+        key = job.coalesce_key()
+        if key is None:
+            self.__uncoalescable += 1
+        else:
+            # A job that only gets things can share the run of an
+            # identical one that will run no later, as long as nothing
+            # that may change things is queued (before or after either)
+            pending = self.__coalescable.get(key)
+            if (pending is not None and pending[1] <= priority and
+                    not self.__uncoalescable):
+                DBG("Merging %s" % job)
+                pending[0].merge(job)
+                return
+            self.__coalescable[key] = (job, priority)
+
         if priority not in self.__queue:
-            self.__queue[priority] = []
+            self.__queue[priority] = collections.deque()
+            bisect.insort(self.__priorities, priority)
 
         self.__queue[priority].append(job)
         self.__counter.release()
 
+    def _dequeued(self, job):
+        key = job.coalesce_key()
+        if key is None:
+            self.__uncoalescable -= 1
+        elif self.__coalescable.get(key, (None,))[0] is job:
+            del self.__coalescable[key]
+
     def _queue_clear_below(self, priority):
-        for i in range(0, priority):
-            if i in self.__queue and len(self.__queue[i]) != 0:
+        for i in self.__priorities:
+            if i >= priority:
+                break
+            if self.__queue[i]:
                 return False
 
         return True
 
     def _qlock_when_idle(self, priority=10):
-        while True:
-            DBG("Attempting queue lock (%i)" % len(self.__queue))
-            self._qlock()
-            if self._queue_clear_below(priority):
-                return
-            self._qunlock()
-            time.sleep(0.1)
+        DBG("Attempting queue lock (%i)" % len(self.__queue))
+        self._qlock()
+        while not self._queue_clear_below(priority):
+            self.__dequeued.wait()
 
     # This is the external lock, which stops any threads from running
     # so that the radio can be operated synchronously
@@ -207,17 +317,26 @@ class RadioThread(threading.Thread, gobject.GObject):
 
     def submit(self, job, priority=0):
         self._qlock()
-        self._qsubmit(job, priority)
-        self._qunlock()
+        try:
+            self._qsubmit(job, priority)
+        finally:
+            self._qunlock()
 
     def flush(self, priority=None):
         self._qlock()
 
         if priority is None:
-            for i in self.__queue.keys():
-                self.__queue[i] = []
+            priorities = list(self.__priorities)
+        elif priority in self.__queue:
+            priorities = [priority]
         else:
-            self.__queue[priority] = []
+            priorities = []
+
+        for i in priorities:
+            for job in self.__queue.pop(i):
+                self._dequeued(job)
+            self.__priorities.remove(i)
+        self.__dequeued.notify_all()
 
         self._qunlock()
 
@@ -232,11 +351,28 @@ class RadioThread(threading.Thread, gobject.GObject):
                 jobs += len(self.__queue[i])
         gobject.idle_add(self.emit, "status", "[%i] %s" % (jobs, msg))
 
-    def _queue_pop(self, priority):
-        try:
-            return self.__queue[priority].pop(0)
-        except IndexError:
+    def _queue_pop(self):
+        if not self.__priorities:
             return None
+        priority = self.__priorities[0]
+        job = self.__queue[priority].popleft()
+        if not self.__queue[priority]:
+            del self.__queue[priority]
+            self.__priorities.pop(0)
+        self._dequeued(job)
+        self.__dequeued.notify_all()
+        DBG("Running job at priority %i" % priority)
+        return job
+
+    def _execute(self, job):
+        # Traced here rather than in RadioJob, so that jobs which do their
+        # own thing in execute() are traced too
+        start = time.time()
+        job.execute(self.radio)
+        jobtrace.TRACE.record(jobtrace.TraceEvent(
+            jobtrace.JOB, job.get_name(), start, time.time(),
+            queued=job.queued, priority=job.priority,
+            size=job.result_size))
 
     def run(self):
         last_job_desc = "idle"
@@ -248,17 +384,16 @@ class RadioThread(threading.Thread, gobject.GObject):
             self.__counter.acquire()
 
             self._qlock()
-            for i in sorted(self.__queue.keys()):
-                job = self._queue_pop(i)
-                if job:
-                    DBG("Running job at priority %i" % i)
-                    break
+            job = self._queue_pop()
             self._qunlock()
 
-            if job:
+            if job and job.cancelled():
+                DBG("Skipping cancelled %s" % job)
+                last_job_desc = None
+            elif job:
                 self.lock()
                 self.status(job.desc)
-                job.execute(self.radio)
+                self._execute(job)
                 last_job_desc = job.desc
                 self.unlock()
 
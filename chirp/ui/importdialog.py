@@ -17,6 +17,8 @@ import gtk
 import gobject
 import pango
 import logging
+import threading
+import time
 
 from chirp import errors, chirp_common, import_logic
 from chirp.drivers import generic_xml
@@ -24,6 +26,9 @@ from chirp.ui import common
 
 LOG = logging.getLogger(__name__)
 
+# How often, in seconds, rows from the preview thread are added to the list
+PREVIEW_BATCH_INTERVAL = 0.2
+
 
 class WaitWindow(gtk.Window):
     def __init__(self, msg, parent=None):
@@ -104,7 +109,7 @@ class ImportDialog(gtk.Dialog):
 
     def _render(self, _, rend, model, iter, colnum):
         newloc, imp = model.get(iter, self.col_nloc, self.col_import)
-        lo, hi = self.dst_radio.get_features().memory_bounds
+        lo, hi = self.dst_bounds
 
         rend.set_property("text", "%i" % newloc)
         if newloc in self.used_list and imp:
@@ -164,70 +169,6 @@ class ImportDialog(gtk.Dialog):
 
         return import_list
 
-    def ensure_calls(self, dst_rthread, import_list):
-        rlist_changed = False
-        ulist_changed = False
-
-        if not isinstance(self.dst_radio, chirp_common.IcomDstarSupport):
-            return
-
-        ulist = self.dst_radio.get_urcall_list()
-        rlist = self.dst_radio.get_repeater_call_list()
-
-        for old, new in import_list:
-            mem = self.src_radio.get_memory(old)
-            if isinstance(mem, chirp_common.DVMemory):
-                if mem.dv_urcall not in ulist:
-                    LOG.debug("Adding %s to ucall list" % mem.dv_urcall)
-                    ulist.append(mem.dv_urcall)
-                    ulist_changed = True
-                if mem.dv_rpt1call not in rlist:
-                    LOG.debug("Adding %s to rcall list" % mem.dv_rpt1call)
-                    rlist.append(mem.dv_rpt1call)
-                    rlist_changed = True
-                if mem.dv_rpt2call not in rlist:
-                    LOG.debug("Adding %s to rcall list" % mem.dv_rpt2call)
-                    rlist.append(mem.dv_rpt2call)
-                    rlist_changed = True
-
-        if ulist_changed:
-            job = common.RadioJob(None, "set_urcall_list", ulist)
-            job.set_desc(_("Updating URCALL list"))
-            dst_rthread._qsubmit(job, 0)
-
-        if rlist_changed:
-            job = common.RadioJob(None, "set_repeater_call_list", ulist)
-            job.set_desc(_("Updating RPTCALL list"))
-            dst_rthread._qsubmit(job, 0)
-
-        return
-
-    def _convert_power(self, dst_levels, src_levels, mem):
-        if not dst_levels:
-            mem.power = None
-            return
-        elif not mem.power:
-            # Source radio does not support power levels, so choose the
-            # first (highest) level from the destination radio.
-            mem.power = dst_levels[0]
-            return ""
-
-        # If both radios support power levels, we need to decide how to
-        # convert the source power level to a valid one for the destination
-        # radio.  To do that, find the absolute level of the source value
-        # and calculate the different between it and all the levels of the
-        # destination, choosing the one that matches most closely.
-
-        deltas = [abs(mem.power - power) for power in dst_levels]
-        mem.power = dst_levels[deltas.index(min(deltas))]
-
-    def do_soft_conversions(self, dst_features, src_features, mem):
-        self._convert_power(dst_features.valid_power_levels,
-                            src_features.valid_power_levels,
-                            mem)
-
-        return mem
-
     def do_import_banks(self):
         try:
             dst_banks = self.dst_radio.get_banks()
@@ -252,20 +193,22 @@ class ImportDialog(gtk.Dialog):
 
         src_features = self.src_radio.get_features()
 
+        overrides = {}
         for old, new, name, comm in import_list:
+            overrides[old] = {"number":  new,
+                              "name":    name,
+                              "comment": comm}
+        srcs = (self.src_radio.get_memory(old)
+                for old, new, name, comm in import_list)
+
+        for src, mem, e in import_logic.import_mems(self.dst_radio,
+                                                    src_features,
+                                                    srcs, overrides):
             i += 1
-            LOG.debug("%sing %i -> %i" % (self.ACTION, old, new))
+            new = overrides[src.number]["number"]
+            LOG.debug("%sing %i -> %i" % (self.ACTION, src.number, new))
 
-            src = self.src_radio.get_memory(old)
-
-            try:
-                mem = import_logic.import_mem(self.dst_radio,
-                                              src_features,
-                                              src,
-                                              {"number":  new,
-                                               "name":    name,
-                                               "comment": comm})
-            except import_logic.ImportError, e:
+            if e:
                 LOG.error("Import error: %s", e)
                 error_messages[new] = str(e)
                 continue
@@ -367,7 +310,7 @@ class ImportDialog(gtk.Dialog):
             iter = self.__store.iter_next(iter)
 
     def __autonew(self, button):
-        pos = self.dst_radio.get_features().memory_bounds[0]
+        pos = self.dst_bounds[0]
         iter = self.__store.get_iter_first()
         while iter:
             selected, okay = self.__store.get(iter,
@@ -501,20 +444,41 @@ class ImportDialog(gtk.Dialog):
 
         return hbox
 
+    def make_progress(self):
+        hbox = gtk.HBox(False, 2)
+
+        lab = gtk.Label(_("Preparing memory list..."))
+        lab.show()
+        hbox.pack_start(lab, 0, 0, 0)
+
+        self.__progress = gtk.ProgressBar()
+        self.__progress.show()
+        hbox.pack_start(self.__progress, 1, 1, 0)
+
+        stop = gtk.Button(_("Stop"))
+        stop.connect("clicked", lambda b: self.stop_populate())
+        stop.show()
+        hbox.pack_start(stop, 0, 0, 0)
+
+        self.__progress_box = hbox
+        return hbox
+
     def build_ui(self):
         self.vbox.pack_start(self.make_view(), 1, 1, 1)
+        self.vbox.pack_start(self.make_progress(), 0, 0, 0)
         self.vbox.pack_start(self.make_controls(), 0, 0, 0)
 
     def record_use_of(self, number):
-        lo, hi = self.dst_radio.get_features().memory_bounds
+        lo, hi = self.dst_bounds
 
         if number < lo or number > hi:
             return
 
         try:
-            mem = self.dst_radio.get_memory(number)
-            if mem and not mem.empty and number not in self.used_list:
-                self.used_list.append(number)
+            with self.__dst_lock:
+                mem = self.dst_radio.get_memory(number)
+                if mem and not mem.empty and number not in self.used_list:
+                    self.used_list.append(number)
         except errors.InvalidMemoryLocation:
             LOG.error("Location %i empty or at limit of destination radio" %
                       number)
@@ -522,57 +486,101 @@ class ImportDialog(gtk.Dialog):
             LOG.error("Got error from radio, assuming %i beyond limits: %s" %
                       (number, e))
 
-    def populate_list(self):
+    def _get_src_memories(self, token, rows):
         start, end = self.src_radio.get_features().memory_bounds
         for i in range(start, end+1):
-            if end > 50 and i % (end/50) == 0:
-                self.ww.set(float(i) / end)
+            if token.cancelled:
+                return
+            self.__progress_pos = float(i - start + 1) / (end - start + 1)
             try:
                 mem = self.src_radio.get_memory(i)
             except errors.InvalidMemoryLocation, e:
                 continue
             except Exception, e:
-                self.__store.append(row=(False,
-                                         i,
-                                         i,
-                                         "ERROR",
-                                         chirp_common.format_freq(0),
-                                         "",
-                                         False,
-                                         str(e),
-                                         ))
+                rows.append((False,
+                             i,
+                             i,
+                             "ERROR",
+                             chirp_common.format_freq(0),
+                             "",
+                             False,
+                             str(e),
+                             ))
                 self.record_use_of(i)
                 continue
             if mem.empty:
                 continue
+            yield mem
 
-            self.ww.set(float(i) / end)
-            try:
-                msgs = self.dst_radio.validate_memory(
-                        import_logic.import_mem(self.dst_radio,
-                                                self.src_radio.get_features(),
-                                                mem))
-            except import_logic.DestNotCompatible:
-                msgs = self.dst_radio.validate_memory(mem)
-            errs = [x for x in msgs
-                    if isinstance(x, chirp_common.ValidationError)]
-            if errs:
-                msg = _("Cannot be imported because") + ":\r\n"
-                msg += ",".join(errs)
-            else:
-                errs = []
-                msg = "Memory can be imported into target"
-
-            self.__store.append(row=(not bool(msgs),
-                                     mem.number,
-                                     mem.number,
-                                     mem.name,
-                                     chirp_common.format_freq(mem.freq),
-                                     mem.comment,
-                                     not bool(errs),
-                                     msg
-                                     ))
-            self.record_use_of(mem.number)
+    def _populate_list(self, token):
+        rows = []
+        last_batch = time.time()
+        src_features = self.src_radio.get_features()
+        mems = self._get_src_memories(token, rows)
+        try:
+            for mem, dst_mem, e, warnings in import_logic.preview_mems(
+                    self.dst_radio, src_features, mems):
+                if e:
+                    msg = _("Cannot be imported because") + ":\r\n"
+                    msg += str(e)
+                else:
+                    msg = "Memory can be imported into target"
+
+                rows.append((not e and not warnings,
+                             mem.number,
+                             mem.number,
+                             mem.name,
+                             chirp_common.format_freq(mem.freq),
+                             mem.comment,
+                             not e,
+                             msg
+                             ))
+                self.record_use_of(mem.number)
+
+                if time.time() - last_batch > PREVIEW_BATCH_INTERVAL:
+                    gobject.idle_add(self._add_rows, list(rows),
+                                     self.__progress_pos)
+                    del rows[:]
+                    last_batch = time.time()
+        except Exception, e:
+            common.log_exception()
+            gobject.idle_add(common.show_error,
+                             _("Failed to prepare memory list: %s") % e)
+
+        gobject.idle_add(self._add_rows, rows, 1.0)
+        gobject.idle_add(self.__progress_box.hide)
+
+    def _add_rows(self, rows, fraction):
+        for row in rows:
+            self.__store.append(row=row)
+        self.__progress.set_fraction(fraction)
+
+    def populate_list(self):
+        """Start filling the list from the source radio in the background.
+        Rows are added as they are checked against the destination radio,
+        until they are all done or stop_populate() is called"""
+        self.__progress_pos = 0.0
+        self.__progress.set_fraction(0.0)
+        self.__progress_box.show()
+        self.__populate_token = common.JobToken()
+        self.__populate_thread = threading.Thread(
+            target=self._populate_list, args=(self.__populate_token,),
+            name="ImportPreview")
+        self.__populate_thread.setDaemon(True)
+        self.__populate_thread.start()
+
+    def stop_populate(self):
+        """Stop filling the list, keeping the rows added so far, and wait
+        until the radios are no longer being used"""
+        if not self.__populate_thread:
+            return
+        self.__populate_token.cancel()
+        self.__populate_thread.join()
+        self.__populate_thread = None
+        self.__progress_box.hide()
+
+    def _response(self, dialog, response):
+        self.stop_populate()
 
     TITLE = _("Import From File")
     ACTION = _("Import")
@@ -620,21 +628,24 @@ class ImportDialog(gtk.Dialog):
 
         self.src_radio = src_radio
         self.dst_radio = dst_radio
+        self.dst_bounds = dst_radio.get_features().memory_bounds
 
         self.used_list = []
         self.not_used_list = []
 
+        # The list is filled by a thread of its own while the user edits
+        # locations, so record_use_of() is called from both. This lock
+        # guards its read of the destination radio and its update of
+        # used_list
+        self.__dst_lock = threading.Lock()
+        self.__populate_thread = None
+
         self.build_ui()
         self.set_default_size(600, 400)
-
-        self.ww = WaitWindow(_("Preparing memory list..."), parent=parent)
-        self.ww.show()
-        self.ww.grind()
+        self.connect("response", self._response)
 
         self.populate_list()
 
-        self.ww.hide()
-
 
 class ExportDialog(ImportDialog):
     TITLE = _("Export To File")
@@ -0,0 +1,105 @@
+# Copyright 2026 The CHIRP developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import gtk
+import gobject
+import logging
+
+from chirp import jobtrace, platform
+from chirp.ui import common
+
+LOG = logging.getLogger(__name__)
+
+# How often the table refreshes itself, in milliseconds
+REFRESH_INTERVAL = 1000
+
+RESPONSE_CLEAR = 1
+RESPONSE_EXPORT = 2
+
+
+def _ms(secs):
+    return "%.1f" % (secs * 1000)
+
+
+class JobTraceDialog(gtk.Dialog):
+    """Shows where the radio threads and their callbacks spend their time"""
+
+    def __init__(self, trace=jobtrace.TRACE, parent=None):
+        gtk.Dialog.__init__(self,
+                            title=_("Radio job trace"),
+                            parent=parent,
+                            buttons=(_("Clear"), RESPONSE_CLEAR,
+                                     _("Export trace..."), RESPONSE_EXPORT,
+                                     gtk.STOCK_CLOSE, gtk.RESPONSE_CLOSE))
+        self.set_default_size(700, 400)
+        self._trace = trace
+
+        cols = [(_("Kind"), str),
+                (_("Name"), str),
+                (_("Count"), int),
+                (_("Avg wait (ms)"), str),
+                (_("Max wait (ms)"), str),
+                (_("Avg time (ms)"), str),
+                (_("Max time (ms)"), str),
+                (_("Total time (ms)"), str),
+                (_("Size"), int)]
+        self._store = gtk.ListStore(*[t for _name, t in cols])
+        view = gtk.TreeView(self._store)
+        for i, (name, _type) in enumerate(cols):
+            col = gtk.TreeViewColumn(name, gtk.CellRendererText(), text=i)
+            col.set_sort_column_id(i)
+            view.append_column(col)
+        view.show()
+
+        sw = gtk.ScrolledWindow()
+        sw.set_policy(gtk.POLICY_AUTOMATIC, gtk.POLICY_AUTOMATIC)
+        sw.add(view)
+        sw.show()
+        self.vbox.pack_start(sw, 1, 1, 1)
+
+        self.connect("response", self._response)
+        self._refresh()
+        self._timer = gobject.timeout_add(REFRESH_INTERVAL, self._refresh)
+
+    def _refresh(self):
+        self._store.clear()
+        for stats in self._trace.summary():
+            self._store.append((stats.kind, stats.name, stats.count,
+                                _ms(stats.avg_wait), _ms(stats.max_wait),
+                                _ms(stats.avg_time), _ms(stats.max_time),
+                                _ms(stats.total_time), stats.total_size))
+        return True
+
+    def _export(self):
+        types = [(_("Chrome trace") + " (*.json)", "json")]
+        filen = platform.get_platform().gui_save_file(
+            default_name="chirp-trace.json", types=types)
+        if not filen:
+            return
+        try:
+            self._trace.save(filen)
+        except Exception, e:
+            common.log_exception()
+            common.show_error(_("Unable to save trace: %s") % e)
+
+    def _response(self, dialog, response):
+        if response == RESPONSE_CLEAR:
+            self._trace.clear()
+            self._refresh()
+        elif response == RESPONSE_EXPORT:
+            self._export()
+        else:
+            gobject.source_remove(self._timer)
+            self.destroy()
@@ -34,7 +34,7 @@ from chirp.drivers import ic9x, kenwood_live, idrp, vx7, vx5, vx6
 from chirp.drivers import icf, ic9x_icf
 from chirp import CHIRP_VERSION, chirp_common, detect, errors
 from chirp.ui import editorset, clone, miscwidgets, config, reporting, fips
-from chirp.ui import bandplans
+from chirp.ui import bandplans, jobtracedlg
 
 gobject.threads_init()
 
@@ -151,6 +151,10 @@ class ChirpMain(gtk.Window):
         eset.connect("usermsg", self.ev_usermsg)
         eset.connect("editor-selected", self.ev_editor_selected)
 
+    def do_job_trace(self):
+        d = jobtracedlg.JobTraceDialog(parent=self)
+        d.show()
+
     def do_diff_radio(self):
         if self.tabs.get_n_pages() < 2:
             common.show_error("Diff tabs requires at least two open tabs!")
@@ -1689,6 +1693,8 @@ of file.
             self.get_current_editorset().get_current_editor().hotkey(_action)
         elif action == "devdifftab":
             self.do_diff_radio()
+        elif action == "devjobtrace":
+            self.do_job_trace()
         elif action == "language":
             self.do_change_language()
         elif action == "loadmod":
@@ -1739,6 +1745,7 @@ of file.
         <menuitem action="devshowraw"/>
         <menuitem action="devdiffraw"/>
         <menuitem action="devdifftab"/>
+        <menuitem action="devjobtrace"/>
       </menu>
       <menuitem action="language"/>
     </menu>
@@ -1823,6 +1830,7 @@ of file.
              "%s<Shift>d" % CTRL_KEY, None, self.mh),
             ('devdifftab', None, _("Diff tabs"),
              "%s<Shift>t" % CTRL_KEY, None, self.mh),
+            ('devjobtrace', None, _("Radio job trace"), None, None, self.mh),
             ('language', None, _("Change language"), None, None, self.mh),
             ('radio', None, _("_Radio"), None, None, self.mh),
             ('download', None, _("Download From Radio"),
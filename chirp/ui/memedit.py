@@ -35,6 +35,13 @@ from chirp import chirp_common, errors, directory, import_logic
 
 LOG = logging.getLogger(__name__)
 
+# Memories fetched by each job when filling the editor (fewer for live
+# radios, so that the first ones show up sooner)
+PREFILL_BATCH = 100
+PREFILL_BATCH_LIVE = 10
+# Memories fetched first, before any in the background
+PREFILL_WINDOW = 100
+
 
 if __name__ == "__main__":
     import sys
@@ -442,6 +449,7 @@ class MemoryEditor(common.Editor):
         self.store.set(iter,
                        0, loc,
                        *tuple(line))
+        self._index_row(iter, loc)
 
         return self._get_memory(iter)
 
@@ -956,6 +964,7 @@ class MemoryEditor(common.Editor):
         sw = gtk.ScrolledWindow()
         sw.set_policy(gtk.POLICY_AUTOMATIC, gtk.POLICY_AUTOMATIC)
         sw.add(self.view)
+        sw.get_vadjustment().connect("value-changed", self._scrolled)
 
         filled = self.col("_filled")
 
@@ -1052,34 +1061,93 @@ class MemoryEditor(common.Editor):
     def prefill(self):
         self.store.clear()
         self._rows_in_store = 0
+        self._row_index = {}
 
         lo = int(self.lo_limit_adj.get_value())
         hi = int(self.hi_limit_adj.get_value())
 
-        def handler(mem, number):
-            if not isinstance(mem, Exception):
-                if not mem.empty or self.show_empty:
-                    gobject.idle_add(self.set_memory, mem)
-            else:
-                mem = chirp_common.Memory()
-                mem.number = number
-                mem.name = "ERROR"
-                mem.empty = True
-                gobject.idle_add(self.set_memory, mem)
-
-        for i in range(lo, hi+1):
-            job = common.RadioJob(handler, "get_memory", i)
-            job.set_desc(_("Getting memory {number}").format(number=i))
-            job.set_cb_args(i)
-            self.rthread.submit(job, 2)
+        # Drop the jobs of any earlier prefill
+        self._prefill_token.cancel()
+        self._prefill_token = common.JobToken()
+        self._batches_fetched = set()
+        if isinstance(self.rthread.radio, chirp_common.LiveRadio):
+            batch = PREFILL_BATCH_LIVE
+        else:
+            batch = PREFILL_BATCH
+        batches = [(start, min(start + batch - 1, hi))
+                   for start in range(lo, hi+1, batch)]
+
+        # Fetch the first screenfuls now, and the rest in the background
+        # (or sooner, if scrolled to)
+        first = max(1, PREFILL_WINDOW // batch)
+        for start, end in batches[:first]:
+            self._submit_batch(start, end, 2)
+        for start, end in batches[first:]:
+            self._submit_batch(start, end, 5)
+        self._batches_pending = batches[first:]
 
         if self.show_special:
             for i in self._features.valid_special_chans:
-                job = common.RadioJob(handler, "get_memory", i)
+                job = common.RadioJob(self._prefill_cb, "get_memory", i)
+                job.set_token(self._prefill_token)
                 job.set_desc(_("Getting channel {chan}").format(chan=i))
                 job.set_cb_args(i)
                 self.rthread.submit(job, 2)
 
+    def _prefill_cb(self, mem, number):
+        if not isinstance(mem, Exception):
+            if not mem.empty or self.show_empty:
+                gobject.idle_add(self.set_memory, mem)
+        else:
+            mem = chirp_common.Memory()
+            mem.number = number
+            mem.name = "ERROR"
+            mem.empty = True
+            gobject.idle_add(self.set_memory, mem)
+
+    def _submit_batch(self, start, end, priority):
+        job = common.RadioJob(self._batch_cb, "get_memory_batch", start, end)
+        job.set_target(self)
+        job.set_token(self._prefill_token)
+        job.set_desc(_("Getting memories {lo}-{hi}").format(
+            lo=start, hi=end))
+        job.set_cb_args(start, end)
+        self.rthread.submit(job, priority)
+
+    def get_memory_batch(self, start, end):
+        # Runs in the radio thread. A batch may be queued twice (when
+        # scrolled to before its background job ran), so only fetch it
+        # once
+        if start in self._batches_fetched:
+            return None
+        self._batches_fetched.add(start)
+        return self.rthread.radio.get_memories(start, end)
+
+    def _batch_cb(self, mems, start, end):
+        # Job callbacks already run in the main loop
+        if mems is None:
+            return
+        elif not isinstance(mems, Exception):
+            self.set_memories(mems)
+            return
+        # Fetch the batch one at a time, to find the bad ones
+        for i in range(start, end+1):
+            job = common.RadioJob(self._prefill_cb, "get_memory", i)
+            job.set_token(self._prefill_token)
+            job.set_desc(_("Getting memory {number}").format(number=i))
+            job.set_cb_args(i)
+            self.rthread.submit(job, 2)
+
+    def _scrolled(self, adj):
+        # Near the end of the rows so far, fetch the next batch now
+        if adj.get_value() + 2 * adj.get_page_size() < adj.get_upper():
+            return
+        while self._batches_pending:
+            start, end = self._batches_pending.pop(0)
+            if start not in self._batches_fetched:
+                self._submit_batch(start, end, 2)
+                break
+
     def _set_memory(self, iter, memory):
         self.store.set(iter,
                        self.col("_filled"), not memory.empty,
@@ -1104,35 +1172,51 @@ class MemoryEditor(common.Editor):
 
         hide = self._get_cols_to_hide(iter)
         self.store.set(iter, self.col("_hide_cols"), hide)
+        self._index_row(iter, memory.number)
+
+    def _index_row(self, iter, loc):
+        # Row references follow their rows as others are inserted,
+        # removed or sorted, and become invalid when theirs is removed
+        self._row_index[loc] = gtk.TreeRowReference(
+            self.store, self.store.get_path(iter))
+
+    def _find_row(self, loc):
+        """Return the iter of the row for location @loc, or None"""
+        ref = self._row_index.get(loc)
+        if ref is None:
+            return None
+        if ref.valid():
+            iter = self.store.get_iter(ref.get_path())
+            if self.store.get(iter, self.col(_("Loc")))[0] == loc:
+                return iter
+        del self._row_index[loc]
+        return None
 
     def set_memory(self, memory):
-        iter = self.store.get_iter_first()
-
-        while iter is not None:
-            loc, = self.store.get(iter, self.col(_("Loc")))
-            if loc == memory.number:
-                return self._set_memory(iter, memory)
-
-            iter = self.store.iter_next(iter)
+        iter = self._find_row(memory.number)
+        if iter is not None:
+            return self._set_memory(iter, memory)
 
         iter = self.store.append()
         self._rows_in_store += 1
         self._set_memory(iter, memory)
 
+    def set_memories(self, memories):
+        """Show @memories (skipping empty ones, unless those are shown)"""
+        for memory in memories:
+            if not memory.empty or self.show_empty:
+                self.set_memory(memory)
+
     def clear_memory(self, number):
-        iter = self.store.get_iter_first()
-        while iter:
-            loc, = self.store.get(iter, self.col(_("Loc")))
-            if loc == number:
-                LOG.debug("Deleting %i" % number)
-                # FIXME: Make the actual remove happen on callback
-                self.store.remove(iter)
-                job = common.RadioJob(None, "erase_memory", number)
-                job.set_desc(
-                    _("Erasing memory {number}").format(number=number))
-                self.rthread.submit()
-                break
-            iter = self.store.iter_next(iter)
+        iter = self._find_row(number)
+        if iter is not None:
+            LOG.debug("Deleting %i" % number)
+            # FIXME: Make the actual remove happen on callback
+            self.store.remove(iter)
+            job = common.RadioJob(None, "erase_memory", number)
+            job.set_desc(
+                _("Erasing memory {number}").format(number=number))
+            self.rthread.submit()
 
     def _set_mem_vals(self, mem, vals, iter):
         power_levels = {"": None}
@@ -1351,6 +1435,14 @@ class MemoryEditor(common.Editor):
 
         self.lo_limit_adj = self.hi_limit_adj = None
         self.store = self.view = None
+        # Row references by location
+        self._row_index = {}
+        # Cancels the jobs of the last prefill
+        self._prefill_token = common.JobToken()
+        # Starts of the batches of memories fetched, and the batches that
+        # were left to fetch in the background
+        self._batches_fetched = set()
+        self._batches_pending = []
 
         self.__cache_columns()
 
@@ -1531,6 +1623,8 @@ class MemoryEditor(common.Editor):
         self.view.get_selection().select_all()
 
     def prepare_close(self):
+        super(MemoryEditor, self).prepare_close()
+        self._prefill_token.cancel()
         cols = self.view.get_columns()
         self._config.set("column_order_%s" % self.__class__.__name__,
                          ",".join([x.get_title() for x in cols]))
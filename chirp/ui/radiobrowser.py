@@ -222,17 +222,77 @@ class OtherEditor(BitwiseEditor):
         self.pack_start(l, 1, 1, 1)
 
 
+class ElementPanel(gtk.Table):
+    """The editors for the items of one element. It remembers which bytes
+    it shows the values of, so that it can tell when it is out of date"""
+
+    def __init__(self, obj, mmap):
+        super(ElementPanel, self).__init__(20, 2)
+        self._mmap = mmap
+        self._ranges = []
+        self._mark = mmap is not None and mmap.get_change_mark()
+        self._build_ui(obj)
+
+    def _build_ui(self, obj):
+        row = 0
+        for name, item in obj.items():
+            if item.size() % 8 == 0:
+                name = '<b>%s</b> <small>(%s %i bytes)</small>' % (
+                    name, bitwise_type(classname(item)), item.size() / 8)
+            else:
+                name = '<b>%s</b> <small>(%s %i bits)</small>' % (
+                    name, bitwise_type(classname(item)), item.size())
+            l = gtk.Label(name + "   ")
+            l.set_use_markup(True)
+            l.show()
+            self.attach(l, 0, 1, row, row + 1,
+                        xoptions=gtk.FILL, yoptions=0)
+
+            if (isinstance(item, bitwise.intDataElement) or
+                    isinstance(item, bitwise.bcdDataElement)):
+                e = IntegerEditor(item)
+            elif (isinstance(item, bitwise.arrayDataElement) and
+                  isinstance(item[0], bitwise.bcdDataElement)):
+                e = BCDArrayEditor(item)
+            elif (isinstance(item, bitwise.arrayDataElement) and
+                  isinstance(item[0], bitwise.charDataElement)):
+                e = CharArrayEditor(item)
+            else:
+                e = OtherEditor(item)
+            if not isinstance(e, OtherEditor):
+                self._ranges.append((item.get_offset(),
+                                     len(item.get_raw())))
+            e.show()
+            self.attach(e, 1, 2, row, row + 1,
+                        xoptions=gtk.FILL, yoptions=0)
+            row += 1
+
+    def is_stale(self):
+        """Return True if any of the values shown may have changed since
+        the panel was built"""
+        if self._mmap is None:
+            return True
+        for start, length in self._ranges:
+            if self._mmap.changed_since(self._mark, start, length):
+                return True
+        return False
+
+
 class RadioBrowser(common.Editor):
     def _build_ui(self):
-        self._display = gtk.Table(20, 2)
-
-        self._store = gtk.TreeStore(gobject.TYPE_STRING, gobject.TYPE_PYOBJECT)
+        # The name of each element, the element (None for the placeholder
+        # row under an element not yet expanded) and its ElementPanel, once
+        # it has been shown
+        self._store = gtk.TreeStore(gobject.TYPE_STRING,
+                                    gobject.TYPE_PYOBJECT,
+                                    gobject.TYPE_PYOBJECT)
         self._tree = gtk.TreeView(self._store)
 
         rend = gtk.CellRendererText()
         tvc = gtk.TreeViewColumn('Element', rend, text=0)
         self._tree.append_column(tvc)
         self._tree.connect('button_press_event', self._tree_click)
+        self._tree.connect('test-expand-row', self._tree_expand)
 
         self.root = gtk.HPaned()
         self.root.set_position(200)
@@ -241,90 +301,92 @@ class RadioBrowser(common.Editor):
         sw.add(self._tree)
         sw.show()
         self.root.add1(sw)
+        self._display = gtk.Viewport()
         sw = gtk.ScrolledWindow()
         sw.set_policy(gtk.POLICY_AUTOMATIC, gtk.POLICY_AUTOMATIC)
-        sw.add_with_viewport(self._display)
+        sw.add(self._display)
         sw.show()
         self.root.add2(sw)
         self._tree.show()
         self._display.show()
         self.root.show()
 
-    def _fill(self, name, obj, parent=None):
-        iter = self._store.append(parent, (name, obj))
-
+    def _children(self, name, obj):
         if isinstance(obj, bitwise.structDataElement):
             for name, item in obj.items():
                 if isinstance(item, bitwise.structDataElement):
-                    self._fill(name, item, iter)
+                    yield name, item
                 elif isinstance(item, bitwise.arrayDataElement):
-                    self._fill("%s[%i]" % (name, len(item)), item, iter)
+                    yield "%s[%i]" % (name, len(item)), item
         elif isinstance(obj, bitwise.arrayDataElement):
-            i = 0
-            for item in obj:
-                if isinstance(obj[0], bitwise.structDataElement):
-                    self._fill("%s[%i]" % (name, i), item, iter)
-                i += 1
-
-    def _tree_click(self, view, event):
-        if event.button != 1:
-            return
+            if len(obj) and isinstance(obj[0], bitwise.structDataElement):
+                for i, item in enumerate(obj):
+                    yield "%s[%i]" % (name, i), item
 
-        index = [0]
-
-        def pack(widget, pos):
-            self._display.attach(widget, pos, pos + 1, index[0], index[0] + 1,
-                                 xoptions=gtk.FILL, yoptions=0)
+    def _fill(self, name, obj, parent=None):
+        iter = self._store.append(parent, (name, obj, None))
 
-        def next_row():
-            index[0] += 1
+        # The children are added when the row is first expanded, until then
+        # a placeholder gives it an expander
+        for child in self._children(name, obj):
+            self._store.append(iter, ("", None, None))
+            break
 
-        def abandon(child):
-            self._display.remove(child)
+    def _tree_expand(self, view, iter, path):
+        placeholder = self._store.iter_children(iter)
+        if self._store.get_value(placeholder, 1) is not None:
+            return False
 
-        pathinfo = view.get_path_at_pos(int(event.x), int(event.y))
-        path = pathinfo[0]
-        iter = self._store.get_iter(path)
         name, obj = self._store.get(iter, 0, 1)
+        for child_name, child in self._children(name, obj):
+            self._fill(child_name, child, iter)
+        self._store.remove(placeholder)
+        return False
+
+    def _show_panel(self, iter):
+        obj, panel = self._store.get(iter, 1, 2)
+        if obj is None:
+            return
+        if panel is None or panel.is_stale():
+            panel = ElementPanel(obj, self._mmap)
+            self._store.set(iter, 2, panel)
 
-        self._display.foreach(abandon)
+        current = self._display.get_child()
+        if current is panel:
+            return
+        if current:
+            self._display.remove(current)
+        self._display.add(panel)
+        panel.show()
+        self._shown = self._store.get_path(iter)
 
-        for name, item in obj.items():
-            if item.size() % 8 == 0:
-                name = '<b>%s</b> <small>(%s %i bytes)</small>' % (
-                    name, bitwise_type(classname(item)), item.size() / 8)
-            else:
-                name = '<b>%s</b> <small>(%s %i bits)</small>' % (
-                    name, bitwise_type(classname(item)), item.size())
-            l = gtk.Label(name + "   ")
-            l.set_use_markup(True)
-            l.show()
-            pack(l, 0)
+    def _tree_click(self, view, event):
+        if event.button != 1:
+            return
 
-            if (isinstance(item, bitwise.intDataElement) or
-                    isinstance(item, bitwise.bcdDataElement)):
-                e = IntegerEditor(item)
-            elif (isinstance(item, bitwise.arrayDataElement) and
-                  isinstance(item[0], bitwise.bcdDataElement)):
-                e = BCDArrayEditor(item)
-            elif (isinstance(item, bitwise.arrayDataElement) and
-                  isinstance(item[0], bitwise.charDataElement)):
-                e = CharArrayEditor(item)
-            else:
-                e = OtherEditor(item)
-            e.show()
-            pack(e, 1)
-            next_row()
+        pathinfo = view.get_path_at_pos(int(event.x), int(event.y))
+        if pathinfo is None:
+            return
+        self._show_panel(self._store.get_iter(pathinfo[0]))
 
     def __init__(self, rthread):
         super(RadioBrowser, self).__init__(rthread)
         self._radio = rthread.radio
         self._focused = False
+        self._shown = None
+        # Only a memory map that tracks changes lets the panels be kept
+        # until the bytes they show are changed
+        self._mmap = getattr(self._radio._memobj, "_data", None)
+        if not hasattr(self._mmap, "get_change_mark"):
+            self._mmap = None
         self._build_ui()
         self._fill('root', self._radio._memobj)
 
     def focus(self):
         self._focused = True
+        # Anything else may have changed the image while we were away
+        if self._shown is not None:
+            self._show_panel(self._store.get_iter(self._shown))
 
     def unfocus(self):
         if self._focused:
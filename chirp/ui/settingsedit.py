@@ -19,6 +19,7 @@ import logging
 
 from chirp import chirp_common
 from chirp import settings
+from chirp.settings import RadioSettings
 from chirp.ui import common, miscwidgets
 
 LOG = logging.getLogger(__name__)
@@ -67,6 +68,12 @@ class SettingsEditor(common.Editor):
 
         self._changed = False
         self._settings = None
+        # Notebook tab => (group, tree row, scrolled window)
+        self._tabs = {}
+        # Tabs that have been (or are being) filled in
+        self._shown = set()
+        # Whether the radio can be sent just the settings that changed
+        self._delta = self.rthread.radio.get_features().has_settings_delta
 
         job = common.RadioJob(self._get_settings_cb, "get_settings")
         job.set_desc("Getting radio settings")
@@ -83,8 +90,17 @@ class SettingsEditor(common.Editor):
                 self.emit("changed")
                 self._changed = False
 
-        job = common.RadioJob(setting_cb, "set_settings",
-                              self._settings)
+        if self._delta:
+            changed = self._settings.get_changed()
+            if not changed:
+                return
+            # Start tracking afresh, so that the next job only carries
+            # what changes after this one
+            self._settings.clear_changed()
+        else:
+            changed = self._settings
+
+        job = common.RadioJob(setting_cb, "set_settings", changed)
         job.set_desc("Setting radio settings")
         self.rthread.submit(job)
 
@@ -112,16 +128,19 @@ class SettingsEditor(common.Editor):
         except settings.InvalidValueError, e:
             common.show_error(_("Invalid setting value: %s") % e)
 
-    def _build_ui_tab(self, group):
-
+    def _add_tab(self, group, iter):
         # The scrolled window
         sw = gtk.ScrolledWindow()
         sw.set_policy(gtk.POLICY_AUTOMATIC, gtk.POLICY_AUTOMATIC)
         sw.show()
 
-        # Notebook tab
+        # Notebook tab, which is filled in when it is first shown
         tab = self._notebook.append_page(sw, gtk.Label(_(group.get_name())))
+        self._tabs[tab] = (group, iter, sw)
+
+        return tab
 
+    def _build_ui_tab(self, group, sw):
         # Settings table
         table = gtk.Table(len(group), 2, False)
         table.set_resize_mode(gtk.RESIZE_IMMEDIATE)
@@ -202,32 +221,72 @@ class SettingsEditor(common.Editor):
 
             row += 1
 
-        return tab
-
     def _build_ui_group(self, group, parent):
-        tab = self._build_ui_tab(group)
-
         iter = self._store.append(parent)
+        tab = self._add_tab(group, iter)
         self._store.set(iter, 0, group.get_shortname(), 1, tab)
 
+        # A group that builds its settings lazily gets its subgroups
+        # listed when it is first shown
+        if group.is_loaded():
+            self._build_ui_subgroups(group, iter)
+
+    def _build_ui_subgroups(self, group, iter):
         for element in group:
             if not isinstance(element, settings.RadioSetting):
                 self._build_ui_group(element, iter)
 
+    def _show_tab(self, tab):
+        if tab in self._shown:
+            return
+        self._shown.add(tab)
+
+        group, iter, sw = self._tabs[tab]
+        if group.is_loaded():
+            self._build_ui_tab(group, sw)
+            return
+
+        # Build the settings on the radio thread, like get_settings()
+        job = common.RadioJob(self._group_loaded_cb, "load")
+        job.set_target(group)
+        job.set_cb_args(tab)
+        job.set_token(self.job_token)
+        job.set_desc("Loading %s" % group.get_shortname())
+        self.rthread.submit(job)
+
+    def _group_loaded_cb(self, result, tab):
+        group, iter, sw = self._tabs[tab]
+        if isinstance(result, Exception):
+            self._shown.discard(tab)
+            common.show_error(_("Unable to load settings: %s") % result)
+            return
+
+        self._build_ui_subgroups(group, iter)
+        self._view.expand_row(self._store.get_path(iter), True)
+        self._build_ui_tab(group, sw)
+
     def _build_ui(self, settings):
         if not isinstance(settings, list):
             raise Exception("Invalid Radio Settings")
             return
 
+        if not isinstance(settings, RadioSettings):
+            self._delta = False
+
         self._settings = settings
         for group in settings:
             self._build_ui_group(group, None)
         self._view.expand_all()
+        if len(self._store):
+            self._view.get_selection().select_path((0,))
 
     def _get_settings_cb(self, settings):
         gobject.idle_add(self._build_ui, settings)
 
     def _view_changed_cb(self, selection):
         (lst, iter) = selection.get_selected()
+        if iter is None:
+            return
         tab, = self._store.get(iter, 1)
+        self._show_tab(tab)
         self._notebook.set_current_page(tab)
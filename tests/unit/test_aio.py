@@ -0,0 +1,233 @@
+from tests.unit import base
+from chirp import aio
+from chirp import errors
+
+
+class FakePipe(object):
+    """A pipe with @responses to send after each write"""
+
+    def __init__(self, responses=None):
+        self.responses = list(responses or [])
+        self.received = ""
+        self.written = []
+
+    @property
+    def in_waiting(self):
+        return len(self.received)
+
+    def read(self, size):
+        data = self.received[:size]
+        self.received = self.received[size:]
+        return data
+
+    def write(self, data):
+        self.written.append(data)
+        if self.responses:
+            self.received += self.responses.pop(0)
+
+
+class TestLoop(base.BaseTest):
+    def setUp(self):
+        super(TestLoop, self).setUp()
+        self.loop = aio.Loop()
+
+    def test_return(self):
+        def inner(value):
+            yield aio.sleep(0)
+            raise aio.Return(value * 2)
+
+        def outer():
+            first = yield inner(1)
+            second = yield inner(first)
+            raise aio.Return([first, second])
+
+        self.assertEqual([2, 4], self.loop.run_until_complete(outer()))
+
+    def test_error(self):
+        def inner():
+            yield aio.sleep(0)
+            raise errors.RadioError("Boom")
+
+        def outer():
+            try:
+                yield inner()
+            except errors.RadioError, e:
+                raise aio.Return(str(e))
+
+        self.assertEqual("Boom", self.loop.run_until_complete(outer()))
+        self.assertRaises(errors.RadioError,
+                          self.loop.run_until_complete, inner())
+
+    def test_interleave(self):
+        events = []
+
+        def worker(name):
+            for i in range(0, 3):
+                events.append((name, i))
+                yield aio.sleep(0)
+
+        self.loop.spawn(worker("a"))
+        self.loop.spawn(worker("b"))
+        self.loop.run()
+        self.assertEqual([("a", 0), ("b", 0), ("a", 1), ("b", 1),
+                          ("a", 2), ("b", 2)], events)
+
+    def test_wait_exact(self):
+        pipe = FakePipe(["ab", "cdef"])
+        stream = aio.AsyncTransport(pipe)
+
+        def talk():
+            stream.write("1")
+            first = yield stream.wait_exact(1)
+            stream.write("2")
+            second = yield stream.wait_exact(5)
+            raise aio.Return([first, second])
+
+        self.assertEqual(["a", "bcdef"], self.loop.run_until_complete(talk()))
+        self.assertEqual(["1", "2"], pipe.written)
+
+    def test_wait_exact_timeout(self):
+        stream = aio.AsyncTransport(FakePipe(["ab"]))
+
+        def talk():
+            stream.write("1")
+            yield stream.wait_exact(4, timeout=0.01)
+
+        self.assertRaises(errors.RadioError,
+                          self.loop.run_until_complete, talk())
+        self.assertEqual(1, stream.stats.timeouts)
+
+    def test_wait_until(self):
+        stream = aio.AsyncTransport(FakePipe(["ID019\rFV", "1.0\r"]))
+
+        def talk():
+            stream.write("ID\r")
+            first = yield stream.wait_until("\r")
+            stream.write("FV\r")
+            second = yield stream.wait_until("\r")
+            third = yield stream.wait_until("\r", timeout=0.01)
+            raise aio.Return([first, second, third])
+
+        self.assertEqual(["ID019\r", "FV1.0\r", ""],
+                         self.loop.run_until_complete(talk()))
+
+    def test_echo(self):
+        pipe = FakePipe(["\x06\x06"])
+        stream = aio.AsyncTransport(pipe, echo=True)
+
+        def talk():
+            stream.write("\x06")
+            data = yield stream.wait_exact(1)
+            raise aio.Return(data)
+
+        self.assertEqual("\x06", self.loop.run_until_complete(talk()))
+        self.assertEqual(1, stream.stats.echo_bytes)
+
+    def test_cancel(self):
+        cleaned_up = []
+
+        def forever():
+            try:
+                while True:
+                    yield aio.sleep(0)
+            finally:
+                cleaned_up.append(True)
+
+        task = self.loop.spawn(forever())
+        self.loop.run_once()
+        self.loop.run_once()
+        task.cancel()
+        self.loop.run()
+        self.assertTrue(task.done())
+        self.assertTrue(isinstance(task.error, aio.Cancelled))
+        self.assertEqual([True], cleaned_up)
+
+    def test_cancel_before_start(self):
+        started = []
+
+        def work():
+            started.append(True)
+            yield aio.sleep(0)
+
+        task = self.loop.spawn(work())
+        task.cancel()
+        self.loop.run()
+        self.assertEqual([], started)
+        self.assertTrue(isinstance(task.error, aio.Cancelled))
+
+    def test_timeout(self):
+        def forever():
+            while True:
+                yield aio.sleep(0)
+
+        self.assertRaises(aio.Cancelled, self.loop.run_until_complete,
+                          forever(), 0.01)
+
+    def test_done_callback(self):
+        done = []
+
+        def work():
+            yield aio.sleep(0)
+            raise aio.Return(1)
+
+        task = self.loop.spawn(work())
+        task.add_done_callback(lambda t: done.append(t.result))
+        self.loop.run()
+        self.assertEqual([1], done)
+        task.add_done_callback(lambda t: done.append(t.result))
+        self.assertEqual([1, 1], done)
+
+    def test_supports(self):
+        class Radio(object):
+            def sync_in_async(self):
+                yield aio.sleep(0)
+            get_memory_async = None
+
+        self.assertTrue(aio.supports(Radio(), "sync_in"))
+        self.assertFalse(aio.supports(Radio(), "sync_out"))
+        self.assertFalse(aio.supports(Radio(), "get_memory"))
+
+    def test_wait_read(self):
+        stream = aio.AsyncTransport(FakePipe(["abc"]))
+
+        def talk():
+            stream.write("1")
+            first = yield stream.wait_read(2)
+            second = yield stream.wait_read(2, timeout=0.01)
+            third = yield stream.wait_read(2, timeout=0.01)
+            raise aio.Return([first, second, third])
+
+        self.assertEqual(["ab", "c", ""], self.loop.run_until_complete(talk()))
+
+
+class TestRunBlocking(base.BaseTest):
+    def test_run_blocking(self):
+        pipe = FakePipe(["ID019\rab", "cdef"])
+        stream = aio.AsyncTransport(pipe)
+
+        def inner():
+            stream.write("2")
+            data = yield stream.wait_exact(5)
+            raise aio.Return(data)
+
+        def talk():
+            stream.write("1")
+            first = yield stream.wait_until("\r")
+            yield aio.sleep(0)
+            second = yield inner()
+            third = yield stream.wait_read(2)
+            raise aio.Return([first, second, third])
+
+        self.assertEqual(["ID019\r", "abcde", "f"], aio.run_blocking(talk()))
+
+    def test_run_blocking_error(self):
+        stream = aio.AsyncTransport(FakePipe())
+
+        def talk():
+            try:
+                yield stream.wait_exact(1, timeout=0)
+            except errors.RadioError:
+                pass
+            yield stream.wait_exact(1, timeout=60, attempts=2)
+
+        self.assertRaises(errors.RadioError, aio.run_blocking, talk())
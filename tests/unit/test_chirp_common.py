@@ -68,6 +68,114 @@ class TestUtilityFunctions(base.BaseTest):
         self.assertTrue(chirp_common.is_version_newer('daily-20180101'))
 
 
+class TestPowerLevels(base.BaseTest):
+    def setUp(self):
+        super(TestPowerLevels, self).setUp()
+        self.levels = [chirp_common.PowerLevel('hi', watts=50),
+                       chirp_common.PowerLevel('mid', watts=10),
+                       chirp_common.PowerLevel('lo', watts=5)]
+
+    def test_nearest_power_level(self):
+        self.assertEqual(self.levels[0], chirp_common.nearest_power_level(
+            self.levels, chirp_common.PowerLevel('foo', watts=65)))
+        self.assertEqual(self.levels[1], chirp_common.nearest_power_level(
+            self.levels, chirp_common.PowerLevel('foo', watts=8)))
+        self.assertEqual(self.levels[2], chirp_common.nearest_power_level(
+            self.levels, chirp_common.PowerLevel('foo', watts=1)))
+
+    def test_make_power_level_map(self):
+        src = [chirp_common.PowerLevel('high', watts=65),
+               chirp_common.PowerLevel('low', watts=1)]
+        power_map = chirp_common.make_power_level_map(src, self.levels)
+        self.assertEqual({int(src[0]): self.levels[0],
+                          int(src[1]): self.levels[2]}, power_map)
+        self.assertEqual({}, chirp_common.make_power_level_map(src, []))
+
+
+class TestMemory(base.BaseTest):
+    def test_set_valid(self):
+        mem = chirp_common.Memory()
+        mem.rtone = 100.0
+        mem.dtcs = 754
+        mem.mode = 'NFM'
+        self.assertEqual((100.0, 754, 'NFM'), (mem.rtone, mem.dtcs, mem.mode))
+
+    def test_set_invalid(self):
+        mem = chirp_common.Memory()
+        self.assertRaises(ValueError, setattr, mem, 'rtone', 100.1)
+        self.assertRaises(ValueError, setattr, mem, 'dtcs', 800)
+        self.assertRaises(ValueError, setattr, mem, 'mode', 'FOO')
+        self.assertRaises(ValueError, setattr, mem, 'mode', ['FM'])
+
+
+class TestRadio(base.BaseTest):
+    def test_get_memories(self):
+        radio = chirp_common.Radio(None)
+        rf = chirp_common.RadioFeatures()
+        rf.memory_bounds = (1, 3)
+        self.mox.StubOutWithMock(radio, 'get_features')
+        self.mox.StubOutWithMock(radio, 'get_memory')
+        radio.get_features().AndReturn(rf)
+        mems = []
+        for i in range(1, 4):
+            mem = chirp_common.Memory()
+            mem.number = i
+            mems.append(mem)
+        radio.get_memory(1).AndReturn(mems[0])
+        radio.get_memory(2).AndRaise(errors.InvalidMemoryLocation())
+        radio.get_memory(3).AndReturn(mems[2])
+        radio.get_memory(2).AndRaise(errors.InvalidMemoryLocation())
+        self.mox.ReplayAll()
+        self.assertEqual([mems[0], mems[2]], radio.get_memories())
+        self.assertEqual([], radio.get_memories(2, 2))
+
+
+class TestFingerprint(base.BaseTest):
+    def _make_mem(self, number=1, **vals):
+        mem = chirp_common.Memory()
+        mem.number = number
+        mem.freq = 146520000
+        mem.name = 'CALL'
+        for key, value in vals.items():
+            setattr(mem, key, value)
+        return mem
+
+    def test_memory_key_empty(self):
+        mem = self._make_mem(empty=True)
+        self.assertEqual(None, chirp_common.memory_key(mem))
+        self.assertEqual(None, chirp_common.memory_fingerprint(mem))
+
+    def test_memory_fingerprint_normalized(self):
+        mem_a = self._make_mem(1, rtone=100.0, offset=5000000)
+        mem_b = self._make_mem(2, freq=146520000L, name=u'CALL  ')
+        self.assertEqual(chirp_common.memory_fingerprint(mem_a),
+                         chirp_common.memory_fingerprint(mem_b))
+
+    def test_memory_fingerprint_differs(self):
+        base = chirp_common.memory_fingerprint(self._make_mem())
+        for vals in [dict(freq=146540000),
+                     dict(name='FOO'),
+                     dict(duplex='+'),
+                     dict(tmode='Tone'),
+                     dict(tmode='DTCS', dtcs=754),
+                     dict(mode='NFM'),
+                     dict(power=chirp_common.PowerLevel('hi', watts=5))]:
+            self.assertNotEqual(
+                base, chirp_common.memory_fingerprint(self._make_mem(**vals)),
+                'Fingerprint unchanged by %s' % vals)
+
+    def test_channel_set_fingerprint(self):
+        mems_a = [self._make_mem(1), self._make_mem(2, freq=446000000),
+                  self._make_mem(3, empty=True)]
+        mems_b = [self._make_mem(5, freq=446000000), self._make_mem(9),
+                  self._make_mem(10)]
+        mems_c = [self._make_mem(1)]
+        self.assertEqual(chirp_common.channel_set_fingerprint(mems_a),
+                         chirp_common.channel_set_fingerprint(mems_b))
+        self.assertNotEqual(chirp_common.channel_set_fingerprint(mems_a),
+                            chirp_common.channel_set_fingerprint(mems_c))
+
+
 class TestSplitTone(base.BaseTest):
     def _test_split_tone_decode(self, tx, rx, **vals):
         mem = chirp_common.Memory()
@@ -148,6 +256,28 @@ class TestSplitTone(base.BaseTest):
                                      cross_mode='->Tone',
                                      ctone=100.0)
 
+    def test_split_tone_decode_cached(self):
+        for i in range(0, 2):
+            self._test_split_tone_decode(('DTCS', 32, 'R'),
+                                         ('DTCS', 32, 'N'),
+                                         tmode='DTCS',
+                                         dtcs=32,
+                                         dtcs_polarity='RN')
+        mem = chirp_common.Memory()
+        chirp_common.split_tone_decode(mem, ('Tone', 100, None),
+                                       (None, None, None))
+        self.assertTrue(isinstance(mem.rtone, int))
+        chirp_common.split_tone_decode(mem, ('Tone', 100.0, None),
+                                       (None, None, None))
+        self.assertTrue(isinstance(mem.rtone, float))
+
+    def test_split_tone_decode_invalid(self):
+        for i in range(0, 2):
+            self.assertRaises(ValueError,
+                              chirp_common.split_tone_decode,
+                              chirp_common.Memory(),
+                              ('Tone', 1.0, None), (None, None, None))
+
     def _set_mem(self, **vals):
         mem = chirp_common.Memory()
         for key, value in vals.items():
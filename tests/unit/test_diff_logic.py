@@ -0,0 +1,145 @@
+from tests.unit import base
+from chirp import chirp_common
+from chirp import diff_logic
+from chirp import directory
+from chirp import errors
+
+
+class DiffTests(base.BaseTest):
+    def _make_mem(self, number, freq, name='', **vals):
+        mem = chirp_common.Memory()
+        mem.number = number
+        mem.freq = freq
+        mem.name = name
+        for key, value in vals.items():
+            setattr(mem, key, value)
+        return mem
+
+    def _make_empty(self, number):
+        mem = chirp_common.Memory()
+        mem.number = number
+        mem.empty = True
+        return mem
+
+    def test_diff_identical(self):
+        mems_a = [self._make_mem(1, 146520000, 'CALL'),
+                  self._make_empty(2)]
+        mems_b = [self._make_mem(1, 146520000, 'CALL'),
+                  self._make_empty(2)]
+        diff = diff_logic.diff_memories(mems_a, mems_b)
+        self.assertFalse(diff)
+        self.assertEqual(1, diff.unchanged)
+        self.assertEqual('', str(diff))
+
+    def test_diff_ignores_unused_fields(self):
+        mems_a = [self._make_mem(1, 146520000, 'CALL  ', offset=600000,
+                                 rtone=100.0)]
+        mems_b = [self._make_mem(1, 146520000, 'CALL', offset=5000000,
+                                 rtone=88.5)]
+        self.assertFalse(diff_logic.diff_memories(mems_a, mems_b))
+
+    def test_diff_added_removed(self):
+        mems_a = [self._make_mem(1, 146520000), self._make_empty(2)]
+        mems_b = [self._make_empty(1), self._make_mem(2, 446000000)]
+        diff = diff_logic.diff_memories(mems_a, mems_b)
+        self.assertEqual([1], [m.number for m in diff.removed])
+        self.assertEqual([2], [m.number for m in diff.added])
+        self.assertEqual([], diff.changed)
+        self.assertEqual([], diff.moved)
+
+    def test_diff_changed(self):
+        mems_a = [self._make_mem(1, 146520000, 'CALL', tmode='Tone',
+                                 rtone=100.0)]
+        mems_b = [self._make_mem(1, 146520000, 'SIMPLX', tmode='Tone',
+                                 rtone=88.5)]
+        diff = diff_logic.diff_memories(mems_a, mems_b)
+        self.assertEqual(1, len(diff.changed))
+        mem_a, mem_b, fields = diff.changed[0]
+        self.assertEqual([('tx_tone', ('Tone', 100.0, None),
+                           ('Tone', 88.5, None)),
+                          ('name', 'CALL', 'SIMPLX')], fields)
+        self.assertEqual('Changed  1: tx_tone Tone 100.0 -> Tone 88.5, '
+                         'name CALL -> SIMPLX', str(diff))
+
+    def test_diff_moved(self):
+        mems_a = [self._make_mem(1, 146520000, 'CALL'),
+                  self._make_mem(2, 446000000, 'UHF'),
+                  self._make_empty(3)]
+        mems_b = [self._make_mem(1, 446000000, 'UHF'),
+                  self._make_mem(2, 146520000, 'CALL'),
+                  self._make_mem(3, 146520000, 'CALL')]
+        diff = diff_logic.diff_memories(mems_a, mems_b)
+        self.assertEqual([(1, 2), (2, 1)],
+                         [(a.number, b.number) for a, b in diff.moved])
+        self.assertEqual([3], [m.number for m in diff.added])
+        self.assertEqual([], diff.removed)
+        self.assertEqual([], diff.changed)
+
+    def test_diff_dv(self):
+        mem_a = self._make_mem(1, 145000000, mode='DV')
+        mem_b = chirp_common.DVMemory()
+        mem_b.clone(mem_a)
+        mem_b.dv_urcall = 'KK7DS'
+        diff = diff_logic.diff_memories([mem_a], [mem_b])
+        fields = diff.changed[0][2]
+        self.assertIn(('dv_urcall', None, 'KK7DS'), fields)
+
+    def test_diff_radios(self):
+        radio_a = chirp_common.Radio(None)
+        radio_b = chirp_common.Radio(None)
+        self.mox.StubOutWithMock(radio_a, 'get_memories')
+        self.mox.StubOutWithMock(radio_b, 'get_memories')
+        radio_a.get_memories(0, 1).AndReturn(
+            [self._make_mem(1, 146520000)])
+        radio_b.get_memories(0, 1).AndReturn(
+            [self._make_mem(1, 146540000)])
+        self.mox.ReplayAll()
+        diff = diff_logic.diff_radios(radio_a, radio_b)
+        self.assertEqual([('freq', 146520000, 146540000)],
+                         diff.changed[0][2])
+
+
+class ClusterTests(base.BaseTest):
+    def _make_radio(self, *freqs):
+        radio = chirp_common.Radio(None)
+        mems = []
+        for i, freq in enumerate(freqs):
+            mem = chirp_common.Memory()
+            mem.number = i
+            mem.freq = freq
+            mems.append(mem)
+        self.mox.StubOutWithMock(radio, 'get_memories')
+        radio.get_memories(0, 1).AndReturn(mems)
+        return radio
+
+    def test_similarity(self):
+        self.assertEqual(1.0, diff_logic.similarity(frozenset(),
+                                                    frozenset()))
+        self.assertEqual(0.5, diff_logic.similarity(frozenset([1, 2]),
+                                                    frozenset([2])))
+        self.assertEqual(0.0, diff_logic.similarity(frozenset([1]),
+                                                    frozenset([2])))
+
+    def _test_cluster_images(self, threshold):
+        radios = {
+            'a': self._make_radio(146520000, 446000000),
+            'b': self._make_radio(446000000, 146520000),
+            'c': self._make_radio(146520000, 446000000, 147000000),
+            'd': self._make_radio(162400000),
+        }
+        self.mox.StubOutWithMock(directory, 'get_radio_by_image')
+        for name in sorted(radios.keys()):
+            directory.get_radio_by_image(name).AndReturn(radios[name])
+        directory.get_radio_by_image('e').AndRaise(
+            errors.ImageDetectFailed('Unknown file format'))
+        self.mox.ReplayAll()
+        return diff_logic.cluster_images(['a', 'b', 'c', 'd', 'e'],
+                                         threshold)
+
+    def test_cluster_images_identical(self):
+        self.assertEqual([['a', 'b'], ['c'], ['d']],
+                         self._test_cluster_images(1.0))
+
+    def test_cluster_images_similar(self):
+        self.assertEqual([['a', 'b', 'c'], ['d']],
+                         self._test_cluster_images(0.6))
@@ -0,0 +1,102 @@
+from tests.unit import base
+from chirp import chirp_common
+from chirp import errors
+from chirp import fleet
+from chirp import memmap
+
+
+class FakePipe(object):
+    def __init__(self, port):
+        self.port = port
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeRadio(chirp_common.CloneModeRadio):
+    VENDOR = "Foo"
+    MODEL = "Bar"
+    # Ports whose next clone should fail
+    failing = set()
+
+    def _clone(self):
+        if self.pipe.port in self.failing:
+            self.failing.discard(self.pipe.port)
+            raise errors.RadioError("No response from radio")
+        status = chirp_common.Status()
+        status.max = 10
+        status.cur = 5
+        self.status_fn(status)
+
+    def sync_in(self):
+        self._clone()
+        self._mmap = memmap.MemoryMap(self.pipe.port)
+
+    def load_mmap(self, filename):
+        self.loaded = filename
+
+    def sync_out(self, incremental=False, verify=False):
+        self._clone()
+
+
+class TestFleet(base.BaseTest):
+    def setUp(self):
+        super(TestFleet, self).setUp()
+        self.pipes = []
+        self.statuses = []
+        FakeRadio.failing = set()
+
+    def _open_pipe(self, rclass, port):
+        pipe = FakePipe(port)
+        self.pipes.append(pipe)
+        return pipe
+
+    def _fleet(self, ports, **kwargs):
+        return fleet.Fleet(FakeRadio, ports, open_pipe=self._open_pipe,
+                           status_fn=self.statuses.append, **kwargs)
+
+    def test_download(self):
+        results = self._fleet(["a", "b", "c"], upload=False).run()
+        self.assertEqual(["a", "b", "c"], [r.port for r in results])
+        for result in results:
+            self.assertEqual(None, result.error)
+            self.assertEqual(1, result.attempts)
+            self.assertEqual(1, len(result.times))
+            self.assertEqual(result.port, result.radio.get_mmap().get_packed())
+        self.assertTrue(all([p.closed for p in self.pipes]))
+
+    def test_upload(self):
+        results = self._fleet(["a", "b"], image="foo.img").run()
+        self.assertEqual(["foo.img", "foo.img"],
+                         [r.radio.loaded for r in results])
+
+    def test_status(self):
+        self._fleet(["a", "b"], upload=False).run()
+        last = self.statuses[-1]
+        self.assertEqual(200, last.max)
+        self.assertEqual(200, last.cur)
+        self.assertEqual("Cloning from 2 radios", last.msg)
+        self.assertTrue(all([s.cur <= s.max for s in self.statuses]))
+
+    def test_retry(self):
+        FakeRadio.failing = set(["b"])
+        results = self._fleet(["a", "b"], upload=False).run()
+        self.assertEqual([1, 2], [r.attempts for r in results])
+        self.assertEqual(None, results[1].error)
+        self.assertEqual(2, len(results[1].times))
+        self.assertEqual(3, len(self.pipes))
+
+    def test_retries_exhausted(self):
+        FakeRadio.failing = set(["b"])
+        results = self._fleet(["a", "b"], upload=False, retries=0).run()
+        self.assertEqual(None, results[0].error)
+        self.assertTrue(isinstance(results[1].error, errors.RadioError))
+        self.assertTrue("FAILED" in str(results[1]))
+
+    def test_needs_image(self):
+        self.assertRaises(errors.InvalidValueError, self._fleet, ["a"])
+
+    def test_needs_incremental(self):
+        self.assertRaises(errors.InvalidValueError, self._fleet, ["a"],
+                          image="foo.img", verify=True)
@@ -0,0 +1,38 @@
+from tests.unit import base
+from chirp.drivers import icomciv
+
+
+class FakePipe(object):
+    """Answers each memory request with @responses[location]"""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.pending = ""
+        self.requests = []
+
+    def read(self, size):
+        data = self.pending[:size]
+        self.pending = self.pending[size:]
+        return data
+
+    def write(self, data):
+        location = int("%02x%02x" % (ord(data[6]), ord(data[7])))
+        self.requests.append(location)
+        self.pending += self.responses[location]
+
+
+class TestGetMemories(base.BaseTest):
+    def test_get_memories_ng(self):
+        empty = "\xFE\xFE\xE0\x76\x1A\x00\x00%s\xFF\xFD"
+        pipe = FakePipe({1: empty % "\x01",
+                         2: "\xFE\xFE\xE0\x76\xFA\xFD",
+                         3: empty % "\x03"})
+        radio = icomciv.Icom7200Radio(None)
+        radio.pipe = pipe
+        radio._willecho = False
+
+        mems = radio.get_memories(1, 3)
+        self.assertEqual([1, 2, 3], [mem.number for mem in mems])
+        self.assertTrue(all(mem.empty for mem in mems))
+        # The NG answered its request, leaving none to fetch again
+        self.assertEqual([1, 2, 3], pipe.requests)
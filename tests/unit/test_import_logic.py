@@ -1,3 +1,5 @@
+import mox
+
 from tests.unit import base
 from chirp import import_logic
 from chirp import chirp_common
@@ -142,6 +144,114 @@ class DstarTests(base.BaseTest):
                           mem, ini_urcalls, ini_rptcalls,
                           exp_urcalls, exp_rptcalls)
 
+    def _make_dv_mem(self, number, urcall, rpt1call, rpt2call):
+        mem = chirp_common.DVMemory()
+        mem.number = number
+        mem.freq = 145000000
+        mem.dv_urcall = urcall
+        mem.dv_rpt1call = rpt1call
+        mem.dv_rpt2call = rpt2call
+        return mem
+
+    def test_ensure_has_all_calls(self):
+        radio = FakeDstarRadio(None)
+        mems = [self._make_dv_mem(0, 'CQCQCQ', 'KD7RFI B', 'KD7RFI G'),
+                self._make_dv_mem(1, 'CQCQCQ', 'W7PDX B', 'W7PDX G'),
+                self._make_dv_mem(2, 'KK7DS', 'KD7RFI B', 'KD7RFI G'),
+                chirp_common.Memory()]
+        ini_urcalls = ['CQCQCQ', '', '', '']
+        ini_rptcalls = ['KD7RFI G', '', '', '', '', '']
+        self.mox.StubOutWithMock(radio, 'get_urcall_list')
+        self.mox.StubOutWithMock(radio, 'get_repeater_call_list')
+        self.mox.StubOutWithMock(radio, 'set_urcall_list')
+        self.mox.StubOutWithMock(radio, 'set_repeater_call_list')
+        radio.get_urcall_list().AndReturn(ini_urcalls)
+        radio.get_repeater_call_list().AndReturn(ini_rptcalls)
+        radio.set_urcall_list(['CQCQCQ', 'KK7DS', '', ''])
+        radio.set_repeater_call_list(['KD7RFI G', 'KD7RFI B', 'W7PDX B',
+                                      'W7PDX G', '', ''])
+        self.mox.ReplayAll()
+        missing = import_logic.ensure_has_all_calls(radio, mems)
+        self.assertEqual(set(), missing)
+
+    def test_ensure_has_all_calls_unchanged(self):
+        radio = FakeDstarRadio(None)
+        mems = [self._make_dv_mem(0, 'CQCQCQ', 'KD7RFI B', 'KD7RFI G')]
+        self.mox.StubOutWithMock(radio, 'get_urcall_list')
+        self.mox.StubOutWithMock(radio, 'get_repeater_call_list')
+        self.mox.StubOutWithMock(radio, 'set_urcall_list')
+        self.mox.StubOutWithMock(radio, 'set_repeater_call_list')
+        radio.get_urcall_list().AndReturn(['CQCQCQ'])
+        radio.get_repeater_call_list().AndReturn(['KD7RFI G', 'KD7RFI B'])
+        self.mox.ReplayAll()
+        missing = import_logic.ensure_has_all_calls(radio, mems)
+        self.assertEqual(set(), missing)
+
+    def test_ensure_has_all_calls_full(self):
+        radio = FakeDstarRadio(None)
+        mems = [self._make_dv_mem(0, 'CQCQCQ', 'KD7RFI B', 'KD7RFI G'),
+                self._make_dv_mem(1, 'CQCQCQ', 'W7PDX B', 'W7PDX G')]
+        self.mox.StubOutWithMock(radio, 'get_urcall_list')
+        self.mox.StubOutWithMock(radio, 'get_repeater_call_list')
+        self.mox.StubOutWithMock(radio, 'set_repeater_call_list')
+        radio.get_urcall_list().AndReturn(['CQCQCQ'])
+        radio.get_repeater_call_list().AndReturn(['', '', ''])
+        # W7PDX B is only needed by the memory that can't be imported
+        radio.set_repeater_call_list(['KD7RFI B', 'KD7RFI G', ''])
+        self.mox.ReplayAll()
+        missing = import_logic.ensure_has_all_calls(radio, mems)
+        self.assertEqual(set(['W7PDX G']), missing)
+
+    def test_import_mems_dstar_calls(self):
+        radio = FakeDstarRadio(None)
+        src_rf = chirp_common.RadioFeatures()
+        mems = [self._make_dv_mem(0, 'CQCQCQ', 'KD7RFI B', 'KD7RFI G'),
+                self._make_dv_mem(1, 'CQCQCQ', 'W7PDX B', 'W7PDX G')]
+        self.mox.StubOutWithMock(radio, 'get_urcall_list')
+        self.mox.StubOutWithMock(radio, 'get_repeater_call_list')
+        self.mox.StubOutWithMock(radio, 'set_repeater_call_list')
+        radio.get_urcall_list().AndReturn(['CQCQCQ'])
+        radio.get_repeater_call_list().AndReturn(['', '', ''])
+        # W7PDX B is only needed by the memory that can't be imported
+        radio.set_repeater_call_list(['KD7RFI B', 'KD7RFI G', ''])
+        self.mox.ReplayAll()
+        results = list(import_logic.import_mems(radio, src_rf, mems))
+        self.assertEqual(None, results[0][2])
+        self.assertEqual(None, results[1][1])
+        self.assertTrue(isinstance(results[1][2],
+                                   import_logic.DestNotCompatible))
+
+    def test_import_mems_dstar_calls_converted(self):
+        radio = FakeDstarRadio(None)
+        src_rf = chirp_common.RadioFeatures()
+        mems = [self._make_dv_mem(0, 'CQCQCQ', 'KD7RFI B', 'KD7RFI G'),
+                self._make_dv_mem(1, 'KK7DS', 'W7PDX B', 'W7PDX G')]
+        # A memory that fails to convert adds none of its callsigns
+        radio.MODES.remove('AM')
+        mems[1].mode = 'Auto'
+        mems[1].freq = 1800000
+        self.mox.StubOutWithMock(radio, 'get_urcall_list')
+        self.mox.StubOutWithMock(radio, 'get_repeater_call_list')
+        self.mox.StubOutWithMock(radio, 'set_repeater_call_list')
+        radio.get_urcall_list().AndReturn(['CQCQCQ', ''])
+        radio.get_repeater_call_list().AndReturn(['', '', '', ''])
+        radio.set_repeater_call_list(['KD7RFI B', 'KD7RFI G', '', ''])
+        self.mox.ReplayAll()
+        results = list(import_logic.import_mems(radio, src_rf, mems))
+        self.assertEqual(None, results[0][2])
+        self.assertTrue(isinstance(results[1][2],
+                                   import_logic.DestNotCompatible))
+
+    def test_import_mems_radio_error(self):
+        radio = FakeDstarRadio(None)
+        src_rf = chirp_common.RadioFeatures()
+        mems = [self._make_dv_mem(0, 'CQCQCQ', 'KD7RFI B', 'KD7RFI G')]
+        self.mox.StubOutWithMock(radio, 'get_urcall_list')
+        radio.get_urcall_list().AndRaise(errors.RadioError('No response'))
+        self.mox.ReplayAll()
+        results = import_logic.import_mems(radio, src_rf, mems)
+        self.assertRaises(errors.RadioError, results.next)
+
 
 class ImportFieldTests(base.BaseTest):
     def test_import_name(self):
@@ -371,3 +481,152 @@ class ImportFieldTests(base.BaseTest):
         self.mox.ReplayAll()
 
         import_logic.import_bank(dst_radio, src_radio, dst_mem, src_mem)
+
+
+class ImportMemsTests(base.BaseTest):
+    def _make_mem(self, number, freq=146520000):
+        mem = chirp_common.Memory()
+        mem.number = number
+        mem.freq = freq
+        mem.name = 'foo'
+        return mem
+
+    def test_import_mems(self):
+        radio = FakeRadio(None)
+        src_rf = chirp_common.RadioFeatures()
+        mems = [self._make_mem(i) for i in range(0, 3)]
+        results = list(import_logic.import_mems(radio, src_rf, mems))
+        self.assertEqual(3, len(results))
+        for src, dst, error in results:
+            self.assertEqual(None, error)
+            self.assertEqual(src.number, dst.number)
+            self.assertEqual('filtered-name', dst.name)
+            self.assertEqual(radio.POWER_LEVELS[0], dst.power)
+            self.assertFalse(src is dst)
+
+    def test_import_mems_overrides(self):
+        radio = FakeRadio(None)
+        src_rf = chirp_common.RadioFeatures()
+        mems = [self._make_mem(1), self._make_mem(2)]
+        results = list(import_logic.import_mems(radio, src_rf, mems,
+                                                {2: {'number': 5}}))
+        self.assertEqual([1, 5], [dst.number for src, dst, e in results])
+
+    def test_import_mems_errors(self):
+        radio = FakeRadio(None)
+        radio.MODES.remove('AM')
+        src_rf = chirp_common.RadioFeatures()
+        mems = [self._make_mem(1), self._make_mem(2, freq=1800000),
+                self._make_mem(3)]
+        mems[1].mode = 'Auto'
+        results = list(import_logic.import_mems(radio, src_rf, mems))
+        self.assertEqual([1, 2, 3], [src.number for src, d, e in results])
+        self.assertEqual(None, results[1][1])
+        self.assertTrue(isinstance(results[1][2],
+                                   import_logic.DestNotCompatible))
+        self.assertEqual(None, results[2][2])
+
+    def test_import_mems_dstar_unsupported(self):
+        radio = FakeRadio(None)
+        src_rf = chirp_common.RadioFeatures()
+        mem = chirp_common.DVMemory()
+        mem.freq = 146520000
+        src, dst, error = list(import_logic.import_mems(radio, src_rf,
+                                                        [mem]))[0]
+        self.assertEqual(None, dst)
+        self.assertTrue(isinstance(error, import_logic.DestNotCompatible))
+
+    def test_import_mems_precomputes(self):
+        radio = FakeRadio(None)
+        src_rf = chirp_common.RadioFeatures()
+        src_rf.valid_power_levels = [
+            chirp_common.PowerLevel('foo', watts=7),
+            chirp_common.PowerLevel('bar', watts=51),
+            ]
+        mems = []
+        for i in range(0, 10):
+            mem = self._make_mem(i)
+            mem.power = src_rf.valid_power_levels[i % 2]
+            mems.append(mem)
+
+        self.mox.StubOutWithMock(radio, 'get_features')
+        self.mox.StubOutWithMock(radio, 'filter_name')
+        radio.get_features().AndReturn(FakeRadio(None).get_features())
+        radio.filter_name('foo').AndReturn('filtered-name')
+        self.mox.ReplayAll()
+
+        results = list(import_logic.import_mems(radio, src_rf, mems))
+        self.assertEqual([radio.POWER_LEVELS[i % 2] for i in range(0, 10)],
+                         [dst.power for src, dst, e in results])
+
+    def test_import_mems_driver_validation(self):
+        class CheckingRadio(FakeRadio):
+            def validate_memory(self, mem):
+                return [chirp_common.ValidationError('Driver says no')]
+
+        src_rf = chirp_common.RadioFeatures()
+        src, dst, error = list(import_logic.import_mems(
+            CheckingRadio(None), src_rf, [self._make_mem(1)]))[0]
+        self.assertEqual(None, dst)
+        self.assertTrue(isinstance(error, import_logic.DestNotCompatible))
+
+    def test_preview_mems(self):
+        radio = FakeRadio(None)
+        src_rf = chirp_common.RadioFeatures()
+        mems = [self._make_mem(1), self._make_mem(2)]
+        self.mox.StubOutWithMock(radio, 'validate_memory')
+        radio.validate_memory(mox.IgnoreArg()).AndReturn(
+            [chirp_common.ValidationWarning('Some warning')])
+        radio.validate_memory(mox.IgnoreArg()).AndReturn(
+            [chirp_common.ValidationError('Some error')])
+        self.mox.ReplayAll()
+
+        results = list(import_logic.preview_mems(radio, src_rf, mems))
+        src, dst, error, warnings = results[0]
+        self.assertEqual(None, error)
+        self.assertEqual(['Some warning'], warnings)
+        src, dst, error, warnings = results[1]
+        self.assertEqual(None, dst)
+        self.assertTrue(isinstance(error, import_logic.DestNotCompatible))
+        self.assertEqual([], warnings)
+
+    def test_preview_mems_lazy(self):
+        radio = FakeRadio(None)
+        src_rf = chirp_common.RadioFeatures()
+        read = []
+
+        def get_mems():
+            for i in range(0, 3):
+                read.append(i)
+                yield self._make_mem(i)
+
+        results = import_logic.preview_mems(radio, src_rf, get_mems())
+        self.assertEqual(0, results.next()[0].number)
+        self.assertEqual([0], read)
+
+    def test_preview_mems_dstar_calls(self):
+        radio = FakeDstarRadio(None)
+        rf = radio.get_features()
+        rf.requires_call_lists = True
+        radio.get_features = lambda: rf
+        src_rf = chirp_common.RadioFeatures()
+        read = []
+
+        def get_mems():
+            for i in range(0, 2):
+                read.append(i)
+                mem = chirp_common.DVMemory()
+                mem.number = i
+                mem.freq = 146520000
+                mem.mode = 'DV'
+                mem.dv_rpt1call = 'W7PDX B'
+                yield mem
+
+        # No call list is read or written until the import itself
+        self.mox.StubOutWithMock(radio, 'get_urcall_list')
+        self.mox.StubOutWithMock(radio, 'set_repeater_call_list')
+        self.mox.ReplayAll()
+        results = import_logic.preview_mems(radio, src_rf, get_mems())
+        src, dst, error, warnings = results.next()
+        self.assertEqual(None, error)
+        self.assertEqual([0], read)
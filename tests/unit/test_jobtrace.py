@@ -0,0 +1,69 @@
+import json
+
+from tests.unit import base
+from chirp import jobtrace
+
+
+class TestJobTrace(base.BaseTest):
+    def setUp(self):
+        super(TestJobTrace, self).setUp()
+        self.trace = jobtrace.JobTrace()
+
+    def _event(self, name, start, end, queued=None, kind=jobtrace.JOB,
+               size=None):
+        self.trace.record(jobtrace.TraceEvent(kind, name, start, end,
+                                              queued=queued, priority=5,
+                                              size=size, thread="radio"))
+
+    def test_result_size(self):
+        self.assertEqual(3, jobtrace.result_size([1, 2, 3]))
+        self.assertEqual(None, jobtrace.result_size(None))
+        self.assertEqual(None, jobtrace.result_size(Exception("Boom")))
+
+    def test_summary(self):
+        self._event("get_memory", 11.0, 11.5, queued=10.0)
+        self._event("get_memory", 12.0, 12.25, queued=11.5)
+        self._event("get_memories", 13.0, 15.0, queued=13.0, size=100)
+        self._event("_prefill_cb", 15.0, 15.125, kind=jobtrace.CALLBACK)
+
+        stats = self.trace.summary()
+        self.assertEqual(["get_memories", "get_memory", "_prefill_cb"],
+                         [s.name for s in stats])
+        get = stats[1]
+        self.assertEqual(2, get.count)
+        self.assertEqual(0.75, get.total_time)
+        self.assertEqual(0.5, get.max_time)
+        self.assertEqual(0.75, get.avg_wait)
+        self.assertEqual(1.0, get.max_wait)
+        self.assertEqual(100, stats[0].total_size)
+        self.assertEqual(jobtrace.CALLBACK, stats[2].kind)
+
+    def test_max_events(self):
+        trace = jobtrace.JobTrace(max_events=2)
+        for i in range(0, 5):
+            trace.record(jobtrace.TraceEvent(jobtrace.JOB, str(i), i, i))
+        self.assertEqual(["3", "4"], [e.name for e in trace.get_events()])
+
+    def test_chrome_trace(self):
+        self._event("get_memory", 11.0, 11.5, queued=10.0, size=1)
+        self._event("_prefill_cb", 11.5, 11.75, kind=jobtrace.CALLBACK)
+
+        trace = json.loads(json.dumps(self.trace.to_chrome_trace()))
+        events = trace["traceEvents"]
+        self.assertEqual(3, len(events))
+        job, callback, thread = events
+        self.assertEqual(("get_memory", "job", "X"),
+                         (job["name"], job["cat"], job["ph"]))
+        self.assertEqual(1000000, job["ts"])
+        self.assertEqual(500000, job["dur"])
+        self.assertEqual({"wait_ms": 1000.0, "priority": 5, "size": 1},
+                         job["args"])
+        self.assertEqual(1500000, callback["ts"])
+        self.assertEqual(("M", "radio"), (thread["ph"],
+                                          thread["args"]["name"]))
+
+    def test_clear(self):
+        self._event("get_memory", 1.0, 2.0)
+        self.trace.clear()
+        self.assertEqual([], self.trace.summary())
+        self.assertEqual({"traceEvents": []}, self.trace.to_chrome_trace())
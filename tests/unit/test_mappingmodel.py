@@ -73,6 +73,22 @@ class TestBaseMappingModel(_TestBaseClass):
     def test_get_name(self):
         self.assertEqual(self.model.get_name(), 'Foo')
 
+    def test_get_all_memberships(self):
+        mappings = [chirp_common.MemoryMapping(self.model, i, str(i))
+                    for i in range(0, 3)]
+        members = {0: [1, 2], 1: [], 2: [2, 5]}
+        self.mox.StubOutWithMock(self.model, 'get_mappings')
+        self.mox.StubOutWithMock(self.model, 'get_mapping_numbers')
+        self.model.get_mappings().AndReturn(mappings)
+        for mapping in mappings:
+            self.model.get_mapping_numbers(mapping).AndReturn(
+                members[mapping.get_index()])
+        self.mox.ReplayAll()
+        self.assertEqual({1: [mappings[0]],
+                          2: [mappings[0], mappings[2]],
+                          5: [mappings[2]]},
+                         self.model.get_all_memberships())
+
 
 class TestBaseBankModel(TestBaseMappingModel):
     ARGS = tuple([None])
@@ -194,7 +210,7 @@ class TestIcomBankModel(base.BaseTest):
     def test_get_mapping_memories(self):
         banks = self._model.get_mappings()
         expected = []
-        for i in range(1, 10):
+        for i in range(1, 11):
             should_include = bool(i % 2)
             self._radio._get_bank(i).AndReturn(
                 should_include and banks[1].index or None)
@@ -205,6 +221,16 @@ class TestIcomBankModel(base.BaseTest):
         members = self._model.get_mapping_memories(banks[1])
         self.assertEqual(members, expected)
 
+    def test_get_all_memberships(self):
+        banks = self._model.get_mappings()
+        for i in range(1, 11):
+            self._radio._get_bank(i).AndReturn(i % 3 and i % 3 or None)
+        self.mox.ReplayAll()
+        memberships = self._model.get_all_memberships()
+        self.assertEqual([1, 2, 4, 5, 7, 8, 10], sorted(memberships.keys()))
+        self.assertEqual([banks[1]], memberships[1])
+        self.assertEqual([banks[2]], memberships[8])
+
     def test_get_memory_mappings(self):
         banks = self._model.get_mappings()
         mem1 = chirp_common.Memory()
@@ -0,0 +1,125 @@
+from ConfigParser import RawConfigParser
+
+from tests.unit import base
+from chirp import bitwise
+from chirp import chirp_common
+from chirp import memmap
+from chirp import radioblocks
+
+
+class TestMemoryMap(base.BaseTest):
+    def test_dirty(self):
+        mmap = memmap.MemoryMap("\x00" * 64)
+        self.assertEqual([], mmap.get_dirty_blocks(16))
+        mmap[20] = "\x01\x00"
+        mmap[63] = 1
+        self.assertEqual([1, 3], mmap.get_dirty_blocks(16))
+        self.assertTrue(mmap.is_dirty(20))
+        self.assertFalse(mmap.is_dirty(21))
+        self.assertTrue(mmap.is_dirty(16, 16))
+        self.assertFalse(mmap.is_dirty(32, 16))
+        mmap.mark_clean(16, 16)
+        self.assertEqual([3], mmap.get_dirty_blocks(16))
+        mmap.mark_clean()
+        self.assertEqual([], mmap.get_dirty_blocks(16))
+
+    def test_dirty_unchanged_value(self):
+        mmap = memmap.MemoryMap("\x00\x01")
+        mmap[0] = "\x00\x01"
+        self.assertFalse(mmap.is_dirty(0, 2))
+
+    def test_dirty_from(self):
+        mmap = memmap.MemoryMap("abcdefgh")
+        mmap.mark_dirty_from("abXdefgY")
+        self.assertEqual([2, 7], mmap.get_dirty_blocks(1))
+        mmap.mark_clean()
+        mmap.mark_dirty_from("abcd")
+        self.assertEqual([1], mmap.get_dirty_blocks(4))
+
+    def test_dirty_bitwise(self):
+        mmap = memmap.MemoryMap("\x00" * 64)
+        obj = bitwise.parse("#seekto 0x20; struct { u8 a; ul16 b; } s;",
+                            mmap)
+        obj.s.b = 0x1234
+        self.assertEqual([0x21, 0x22], mmap.get_dirty_blocks(1))
+
+    def test_changed_since(self):
+        mmap = memmap.MemoryMap("\x00" * 64)
+        mark = mmap.get_change_mark()
+        mmap[20] = "\x01"
+        mmap.mark_clean()
+        self.assertTrue(mmap.changed_since(mark, 20))
+        self.assertTrue(mmap.changed_since(mark, 0, 64))
+        self.assertFalse(mmap.changed_since(mark, 21, 43))
+        mark = mmap.get_change_mark()
+        mmap[20] = "\x01"
+        self.assertFalse(mmap.changed_since(mark, 0, 64))
+        mmap[40] = "\x01"
+        self.assertFalse(mmap.changed_since(mark, 20))
+        self.assertTrue(mmap.changed_since(mark, 32, 16))
+
+
+class FakeRadio(chirp_common.CloneModeRadio):
+    _memsize = 64
+    _dirty_block_size = 16
+
+
+class TestCloneModeRadio(base.BaseTest):
+    def setUp(self):
+        super(TestCloneModeRadio, self).setUp()
+        self.mox.stubs.Set(radioblocks, "_CONFIG", RawConfigParser())
+        self.mox.stubs.Set(radioblocks, "_RECORDS", {})
+
+    def test_dirty_blocks(self):
+        self.assertFalse(chirp_common.CloneModeRadio.can_upload_incremental())
+        self.assertTrue(FakeRadio.can_upload_incremental())
+        radio = FakeRadio(memmap.MemoryMap("\x00" * 64))
+        obj = bitwise.parse("#seekto 0x1E; struct { u8 a[4]; } s;",
+                            radio.get_mmap())
+        self.assertEqual([], radio.get_dirty_blocks())
+        radio.add_dirty_block(obj.s)
+        self.assertEqual([1, 2], radio.get_dirty_blocks())
+        radio.add_dirty_block(0x30)
+        self.assertEqual([1, 2, 3], radio.get_dirty_blocks())
+
+        other = FakeRadio(memmap.MemoryMap("\x00" * 4 + "\x01" + "\x00" * 59))
+        radio.mark_dirty_from(other)
+        self.assertEqual([0, 1, 2, 3], radio.get_dirty_blocks())
+
+    def test_verify_block(self):
+        radio = FakeRadio(memmap.MemoryMap("\x00" * 64))
+        self.assertTrue(radio.verify_block(0x10, "\x00" * 32))
+        self.assertEqual([], radio.get_dirty_blocks())
+        self.assertFalse(radio.verify_block(0x10, "\x00" * 16 + "\x01"))
+        self.assertEqual([2], radio.get_dirty_blocks())
+
+        # Only the matching chunk is known to be held by the radio
+        radio = FakeRadio(memmap.MemoryMap("\x00" * 64))
+        self.assertTrue(radio.mark_dirty_from_radio())
+        self.assertEqual([0, 2, 3], radio.get_dirty_blocks())
+
+    def test_mark_dirty_from_radio(self):
+        radio = FakeRadio(memmap.MemoryMap("\x00" * 64))
+        self.assertFalse(radio.mark_dirty_from_radio())
+        self.assertEqual([], radio.get_dirty_blocks())
+
+        radio.remember_blocks(0, 64)
+        self.assertTrue(radio.mark_dirty_from_radio())
+        self.assertEqual([], radio.get_dirty_blocks())
+
+        # A new image, loaded into a new radio object for the same radio
+        radio = FakeRadio(memmap.MemoryMap("\x00" * 48 + "\x01" * 16))
+        self.assertTrue(radio.mark_dirty_from_radio())
+        self.assertEqual([3], radio.get_dirty_blocks())
+
+    def test_forget_sent_blocks(self):
+        radio = FakeRadio(memmap.MemoryMap("\x00" * 64))
+        radio.remember_blocks(0, 64)
+        radio.add_dirty_block(0x20)
+        radio.forget_sent_blocks(incremental=True)
+        radio.get_mmap().mark_clean()
+        radio.mark_dirty_from_radio()
+        self.assertEqual([2], radio.get_dirty_blocks())
+
+        radio.forget_sent_blocks()
+        self.assertFalse(radio.mark_dirty_from_radio())
@@ -0,0 +1,109 @@
+from ConfigParser import ConfigParser
+
+from tests.unit import base
+from chirp import pacing
+
+
+class FakePipe(object):
+    port = "/dev/ttyUSB0"
+
+
+class FakeRadio(object):
+    VENDOR = "Foo"
+    MODEL = "Bar"
+
+    def __init__(self, pipe):
+        self.pipe = pipe
+
+
+class TestPacer(base.BaseTest):
+    def setUp(self):
+        super(TestPacer, self).setUp()
+        self.mox.StubOutWithMock(pacing, '_CONFIG')
+        self.mox.StubOutWithMock(pacing, '_PACERS')
+        self.mox.StubOutWithMock(pacing, '_save_config')
+        pacing._CONFIG = ConfigParser()
+        pacing._PACERS = {}
+
+    def _clean(self, pacer, count=pacing.PROBE_INTERVAL):
+        for i in range(0, count):
+            pacer.ok()
+
+    def test_probe(self):
+        pacer = pacing.Pacer("delay", 0.05, 0.03)
+        self._clean(pacer, pacing.PROBE_INTERVAL - 1)
+        self.assertEqual(0.05, pacer.delay)
+        self._clean(pacer, 1)
+        self.assertAlmostEqual(0.04, pacer.delay)
+        self.assertEqual(0.05, pacer.good)
+        self._clean(pacer)
+        self.assertAlmostEqual(0.032, pacer.delay)
+        self.assertAlmostEqual(0.04, pacer.good)
+        self._clean(pacer)
+        self.assertAlmostEqual(0.03, pacer.delay)
+        self._clean(pacer)
+        self.assertAlmostEqual(0.03, pacer.delay)
+
+    def test_failed(self):
+        pacer = pacing.Pacer("delay", 0.05, 0.01)
+        self._clean(pacer, pacing.PROBE_INTERVAL * 2)
+        self.assertAlmostEqual(0.032, pacer.delay)
+        self.assertTrue(pacer.failed())
+        self.assertAlmostEqual(0.04, pacer.delay)
+        # No more probing (or retries) until the next session
+        self._clean(pacer)
+        self.assertAlmostEqual(0.04, pacer.delay)
+        self.assertFalse(pacer.failed())
+        pacer.start()
+        self._clean(pacer)
+        self.assertAlmostEqual(0.032, pacer.delay)
+
+    def test_failed_learned(self):
+        pacer = pacing.Pacer("delay", 0.05, 0.01)
+        self._clean(pacer, pacing.PROBE_INTERVAL * 2)
+        pacer.start()
+        self.assertAlmostEqual(0.04, pacer.delay)
+        self.assertTrue(pacer.failed())
+        self.assertEqual(0.05, pacer.delay)
+        self.assertEqual(0.05, pacer.good)
+
+    def test_failed_default(self):
+        # Nothing shorter was being tried, so the failure is not the pacer's
+        pacer = pacing.Pacer("delay", 0.05, 0.01)
+        self.assertFalse(pacer.failed())
+        self.assertEqual(0.05, pacer.delay)
+
+    def test_fixed(self):
+        pacer = pacing.Pacer("delay", 0.05, 0.01, adaptive=False)
+        self._clean(pacer)
+        self.assertEqual(0.05, pacer.delay)
+        self.assertFalse(pacer.failed())
+        pacer = pacing.Pacer("delay", 0.05)
+        self._clean(pacer)
+        self.assertEqual(0.05, pacer.delay)
+
+    def test_get_pacer_persists(self):
+        pacing._save_config()
+        self.mox.ReplayAll()
+        radio = FakeRadio(FakePipe())
+        pacer = pacing.get_pacer(radio, "delay", 0.05, 0.01)
+        self.assertEqual("Foo Bar /dev/ttyUSB0", pacer.section)
+        self.assertTrue(pacer is pacing.get_pacer(radio, "delay", 0.05))
+        self._clean(pacer, pacing.PROBE_INTERVAL * 2)
+        self.assertEqual("0.040000",
+                         pacing._CONFIG.get(pacer.section, "delay"))
+
+        pacing._PACERS = {}
+        pacer = pacing.get_pacer(radio, "delay", 0.05, 0.01)
+        self.assertAlmostEqual(0.04, pacer.delay)
+
+    def test_get_pacer_disabled(self):
+        pacing._CONFIG.add_section("global")
+        pacing._CONFIG.set("global", "adaptive", "False")
+        pacer = pacing.get_pacer(FakeRadio(FakePipe()), "delay", 0.05, 0.01)
+        self.assertFalse(pacer.adaptive)
+
+    def test_get_pacer_no_port(self):
+        pacer = pacing.get_pacer(FakeRadio(object()), "delay", 0.05, 0.01)
+        self.assertEqual(None, pacer.section)
+        self.assertTrue(pacer.adaptive)
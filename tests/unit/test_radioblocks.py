@@ -0,0 +1,70 @@
+from ConfigParser import RawConfigParser
+
+from tests.unit import base
+from chirp import radioblocks
+
+
+class FakePipe(object):
+    port = "/dev/ttyUSB0"
+
+
+class FakeRadio(object):
+    VENDOR = "Foo"
+    MODEL = "Bar"
+
+    def __init__(self, pipe):
+        self.pipe = pipe
+
+
+class TestBlockRecord(base.BaseTest):
+    def setUp(self):
+        super(TestBlockRecord, self).setUp()
+        self.mox.StubOutWithMock(radioblocks, '_CONFIG')
+        self.mox.StubOutWithMock(radioblocks, '_RECORDS')
+        self.mox.StubOutWithMock(radioblocks, '_save_config')
+        radioblocks._CONFIG = RawConfigParser()
+        radioblocks._RECORDS = {}
+
+    def test_record(self):
+        record = radioblocks.BlockRecord()
+        self.assertTrue(record.is_empty())
+        record.set(0x20, 16, "\x02" * 20)
+        record.set(0x10, 16, "\x01" * 20)
+        self.assertFalse(record.is_empty())
+        self.assertEqual([(0x10, (16, "\x01" * 20)),
+                          (0x20, (16, "\x02" * 20))], record.items())
+        record.forget(0x10)
+        record.forget(0x30)
+        self.assertEqual([(0x20, (16, "\x02" * 20))], record.items())
+
+    def test_get_record_persists(self):
+        radioblocks._save_config()
+        self.mox.ReplayAll()
+        radio = FakeRadio(FakePipe())
+        record = radioblocks.get_record(radio)
+        self.assertEqual("Foo Bar /dev/ttyUSB0", record.section)
+        self.assertTrue(record is radioblocks.get_record(radio))
+        record.set(0x10, 16, "\x01" * 20)
+        record.save()
+        self.assertEqual("16 " + "01" * 20,
+                         radioblocks._CONFIG.get(record.section, "0010"))
+
+        radioblocks._RECORDS = {}
+        record = radioblocks.get_record(radio)
+        self.assertEqual([(0x10, (16, "\x01" * 20))], record.items())
+
+    def test_get_record_invalid(self):
+        radioblocks._CONFIG.add_section("Foo Bar /dev/ttyUSB0")
+        radioblocks._CONFIG.set("Foo Bar /dev/ttyUSB0", "0010", "16 zz")
+        radioblocks._CONFIG.set("Foo Bar /dev/ttyUSB0", "0020",
+                                "16 " + "02" * 20)
+        record = radioblocks.get_record(FakeRadio(FakePipe()))
+        self.assertEqual([(0x20, (16, "\x02" * 20))], record.items())
+
+    def test_get_record_no_port(self):
+        self.mox.ReplayAll()
+        record = radioblocks.get_record(FakeRadio(object()))
+        self.assertEqual(None, record.section)
+        record.set(0x10, 16, "\x01" * 20)
+        record.save()
+        self.assertFalse(radioblocks._CONFIG.has_section("Foo Bar None"))
@@ -0,0 +1,133 @@
+import gobject
+
+from tests.unit import base
+from chirp import jobtrace
+from chirp.ui import common
+
+
+class FakeRadio(object):
+    def __init__(self):
+        self.calls = []
+
+    def get_memory(self, number):
+        self.calls.append(("get_memory", number))
+        return number
+
+    def set_memory(self, number):
+        self.calls.append(("set_memory", number))
+
+
+class FakeJob(common.RadioJob):
+    """A job that does its own thing, like the bank editor's"""
+
+    def __init__(self, cb):
+        common.RadioJob.__init__(self, cb, None)
+
+    def execute(self, radio):
+        radio.calls.append(("fake", None))
+        if self.cb:
+            gobject.idle_add(self.cb, "fake", *self.cb_args)
+
+
+class TestRadioThread(base.BaseTest):
+    def setUp(self):
+        super(TestRadioThread, self).setUp()
+        self.radio = FakeRadio()
+        self.rthread = common.RadioThread(self.radio)
+        self.results = []
+        self.mox.stubs.Set(gobject, "idle_add",
+                           lambda cb, *args: cb(*args))
+
+    def _job(self, func, arg, tag, token=None):
+        job = common.RadioJob(lambda r, t: self.results.append((t, r)),
+                              func, arg)
+        job.set_cb_args(tag)
+        if token:
+            job.set_token(token)
+        return job
+
+    def _run_all(self):
+        while True:
+            self.rthread._qlock()
+            job = self.rthread._queue_pop()
+            self.rthread._qunlock()
+            if not job:
+                break
+            if not job.cancelled():
+                job.execute(self.radio)
+
+    def test_priority_order(self):
+        self.rthread.submit(self._job("get_memory", 1, "a"), 10)
+        self.rthread.submit(self._job("get_memory", 2, "b"), 2)
+        self.rthread.submit(self._job("get_memory", 3, "c"), 2)
+        self._run_all()
+        self.assertEqual([("b", 2), ("c", 3), ("a", 1)], self.results)
+
+    def test_coalesce(self):
+        self.rthread.submit(self._job("get_memory", 1, "a"), 5)
+        self.rthread.submit(self._job("get_memory", 1, "b"), 5)
+        self.rthread.submit(self._job("get_memory", 1, "c"), 10)
+        self._run_all()
+        self.assertEqual([("get_memory", 1)], self.radio.calls)
+        self.assertEqual([("a", 1), ("b", 1), ("c", 1)], self.results)
+
+    def test_no_coalesce_more_urgent(self):
+        self.rthread.submit(self._job("get_memory", 1, "a"), 5)
+        self.rthread.submit(self._job("get_memory", 1, "b"), 2)
+        self._run_all()
+        self.assertEqual(2, len(self.radio.calls))
+        self.assertEqual([("b", 1), ("a", 1)], self.results)
+
+    def test_no_coalesce_across_writes(self):
+        self.rthread.submit(self._job("get_memory", 1, "a"), 5)
+        self.rthread.submit(self._job("set_memory", 1, "w"), 5)
+        self.rthread.submit(self._job("get_memory", 1, "b"), 5)
+        self._run_all()
+        self.assertEqual([("get_memory", 1), ("set_memory", 1),
+                          ("get_memory", 1)], self.radio.calls)
+
+    def test_cancel(self):
+        token = common.JobToken()
+        self.rthread.submit(self._job("get_memory", 1, "a", token))
+        self.rthread.submit(self._job("get_memory", 2, "b"))
+        token.cancel()
+        self._run_all()
+        self.assertEqual([("get_memory", 2)], self.radio.calls)
+
+    def test_cancel_merged(self):
+        token = common.JobToken()
+        self.rthread.submit(self._job("get_memory", 1, "a", token))
+        self.rthread.submit(self._job("get_memory", 1, "b"))
+        token.cancel()
+        self._run_all()
+        self.assertEqual([("b", 1)], self.results)
+
+    def test_flush(self):
+        self.rthread.submit(self._job("get_memory", 1, "a"), 5)
+        self.rthread.submit(self._job("set_memory", 1, "w"), 10)
+        self.rthread.flush(10)
+        self.rthread.submit(self._job("get_memory", 1, "b"), 5)
+        self.rthread.flush()
+        self.rthread.submit(self._job("get_memory", 1, "c"), 5)
+        self._run_all()
+        self.assertEqual([("c", 1)], self.results)
+
+    def test_job_without_func(self):
+        job = FakeJob(lambda r, t: self.results.append((t, r)))
+        job.set_cb_args("a")
+        self.assertEqual(None, job.coalesce_key())
+        self.rthread.submit(job)
+        self.rthread.submit(self._job("get_memory", 1, "b"))
+        self._run_all()
+        self.assertEqual([("fake", None), ("get_memory", 1)],
+                         self.radio.calls)
+        self.assertEqual([("a", "fake"), ("b", 1)], self.results)
+
+    def test_trace(self):
+        jobtrace.TRACE.clear()
+        self.rthread._execute(self._job("get_memory", 1, "a"))
+        self.rthread._execute(FakeJob(None))
+        names = sorted([e.name for e in jobtrace.TRACE.get_events()
+                        if e.kind == jobtrace.JOB])
+        self.assertEqual(["FakeJob", "get_memory"], names)
+        jobtrace.TRACE.clear()
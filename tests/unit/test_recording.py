@@ -0,0 +1,143 @@
+import os
+import shutil
+import tempfile
+import time
+
+import mox
+
+from tests.unit import base
+from chirp import errors
+from chirp import pacing
+from chirp import radioblocks
+from chirp import recording
+from chirp.drivers import uv5r
+
+RECORDINGS = os.path.join(os.path.dirname(__file__), "recordings")
+IMAGES = os.path.join(os.path.dirname(__file__), "..", "images")
+
+
+class FakeRadio(object):
+    """Answers each command with its reverse"""
+
+    def __init__(self):
+        self.pending = ""
+        self.timeout = 1
+
+    def write(self, data):
+        self.pending += data[::-1]
+
+    def read(self, size):
+        data = self.pending[:size]
+        self.pending = self.pending[size:]
+        return data
+
+
+class TestRecording(base.BaseTest):
+    def _record(self):
+        pipe = recording.RecordingPipe(FakeRadio())
+        pipe.timeout = 0.5
+        pipe.write("abc")
+        pipe.read(2)
+        pipe.read(2)
+        pipe.read(2)
+        pipe.write("de")
+        pipe.read(2)
+        return pipe
+
+    def test_record(self):
+        pipe = self._record()
+        self.assertEqual(0.5, pipe._pipe.timeout)
+        self.assertEqual([("w", "abc"), ("r", "cb"), ("r", "a"),
+                          ("w", "de"), ("r", "ed")],
+                         [(kind, data) for _t, kind, data in pipe.events])
+
+    def test_save_load(self):
+        tempdir = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(tempdir, "test.rec")
+            pipe = self._record()
+            pipe.save(filename)
+            self.assertEqual([(round(t, 6), k, d) for t, k, d in
+                              pipe.events],
+                             recording.load_recording(filename))
+        finally:
+            shutil.rmtree(tempdir)
+
+    def test_replay(self):
+        replay = recording.ReplayPipe(self._record().events)
+        self.assertEqual("", replay.read(2))
+        replay.write("ab")
+        replay.write("c")
+        self.assertEqual(3, replay.in_waiting)
+        self.assertEqual("cba", replay.read(5))
+        self.assertEqual("", replay.read(5))
+        replay.write("de")
+        self.assertEqual("ed", replay.read(5))
+        self.assertTrue(replay.is_done())
+
+    def test_replay_unread(self):
+        replay = recording.ReplayPipe(self._record().events)
+        replay.write("abc")
+        replay.write("de")
+        self.assertEqual("cbaed", replay.read(10))
+
+    def test_replay_mismatch(self):
+        replay = recording.ReplayPipe(self._record().events)
+        self.assertRaises(errors.RadioError, replay.write, "abd")
+        replay = recording.ReplayPipe(self._record().events)
+        replay.write("abc")
+        replay.write("de")
+        self.assertRaises(errors.RadioError, replay.write, "f")
+
+    def test_replay_realtime(self):
+        self.mox.StubOutWithMock(time, 'sleep')
+        time.sleep(mox.Func(lambda delay: 0.05 < delay <= 0.1))
+        self.mox.ReplayAll()
+        events = [(1.0, "w", "a"), (1.1, "r", "b")]
+        replay = recording.ReplayPipe(events, realtime=True)
+        replay.write("a")
+        self.assertEqual(0, replay.in_waiting)
+        self.assertEqual("b", replay.read(1))
+
+
+class TestReplayDriver(base.BaseTest):
+    """Replays clones by the uv5r driver, recorded against the simulated
+    radio in tools/clonesim.py holding Baofeng_UV-5R.img"""
+
+    def setUp(self):
+        super(TestReplayDriver, self).setUp()
+        # Replay at once, with the driver's fixed delays
+        self.mox.stubs.Set(time, "sleep", lambda secs: None)
+        self.mox.stubs.Set(pacing, "ADAPTIVE", False)
+        self.mox.stubs.Set(pacing, "_PACERS", {})
+        self.mox.stubs.Set(radioblocks, "_RECORDS", {})
+        self.image = os.path.join(IMAGES, "Baofeng_UV-5R.img")
+
+    def _replay(self, name):
+        return recording.ReplayPipe(
+            recording.load_recording(os.path.join(RECORDINGS, name)))
+
+    def test_uv5r_download(self):
+        pipe = self._replay("Baofeng_UV-5R_download.rec")
+        radio = uv5r.BaofengUV5R(pipe)
+        radio.status_fn = lambda status: None
+        radio.sync_in()
+        self.assertTrue(pipe.is_done())
+        image = uv5r.BaofengUV5RGeneric(self.image)
+        self.assertEqual(image.get_mmap().get_packed(),
+                         radio.get_mmap().get_packed())
+
+        # The radio is known to hold all of the image after its ident
+        mmap = image.get_mmap()
+        mmap.mark_clean()
+        image.pipe = pipe
+        self.assertTrue(image.mark_dirty_from_radio())
+        self.assertFalse(mmap.is_dirty(0x08, len(mmap) - 0x08))
+
+    def test_uv5r_upload(self):
+        pipe = self._replay("Baofeng_UV-5R_upload.rec")
+        radio = uv5r.BaofengUV5RGeneric(self.image)
+        radio.pipe = pipe
+        radio.status_fn = lambda status: None
+        radio.sync_out()
+        self.assertTrue(pipe.is_done())
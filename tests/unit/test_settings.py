@@ -14,7 +14,7 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from tests.unit import base
-from chirp import settings
+from chirp import bitwise, memmap, settings
 
 
 class TestSettingValues(base.BaseTest):
@@ -81,6 +81,8 @@ class TestSettingValues(base.BaseTest):
         self.assertFalse(value.changed())
         value.set_value(True)
         self.assertTrue(value.changed())
+        value.clear_changed()
+        self.assertFalse(value.changed())
 
 
 class TestSettingContainers(base.BaseTest):
@@ -138,3 +140,97 @@ class TestSettingContainers(base.BaseTest):
         rs.set_apply_callback(test_cb, "foo", "bar")
         self.assertTrue(rs.has_apply_callback())
         self.assertRaises(TestException, rs.run_apply_callback)
+
+    def _make_settings(self):
+        def setting(name):
+            return settings.RadioSetting(
+                name, name, settings.RadioSettingValueBoolean(False))
+
+        self.s1 = setting("s1")
+        self.s2 = setting("s2")
+        self.s3 = setting("s3")
+        self.sub = settings.RadioSettingGroup("sub", "Sub", self.s3)
+        self.basic = settings.RadioSettingGroup("basic", "Basic",
+                                                self.s1, self.sub)
+        self.other = settings.RadioSettingGroup("other", "Other", self.s2)
+        return settings.RadioSettings(self.basic, self.other)
+
+    def test_get_changed(self):
+        rs = self._make_settings()
+        self.assertFalse(rs.changed())
+        self.assertEqual([], rs.get_changed())
+
+        self.s3.value = True
+        changed = rs.get_changed()
+        self.assertEqual(["basic"], [g.get_name() for g in changed])
+        basic = changed[0]
+        self.assertEqual("Basic", basic.get_shortname())
+        self.assertEqual(["sub"], basic.keys())
+        self.assertEqual([self.s3], basic["sub"].values())
+        # The original tree is left alone
+        self.assertEqual(["s1", "sub"], self.basic.keys())
+
+    def test_clear_changed(self):
+        rs = self._make_settings()
+        self.s1.value = True
+        self.s2.value = True
+        self.assertEqual(2, len(rs.get_changed()))
+        rs.clear_changed()
+        self.assertFalse(rs.changed())
+        self.assertEqual([], rs.get_changed())
+        self.s2.value = False
+        self.assertEqual([[self.s2]],
+                         [g.values() for g in rs.get_changed()])
+
+    def test_lazy_group(self):
+        loads = []
+        s1 = settings.RadioSetting("s1", "Setting 1",
+                                   settings.RadioSettingValueBoolean(False))
+
+        def loader(group, setting):
+            loads.append(group.get_name())
+            group.append(setting)
+
+        group = settings.RadioSettingGroup("foo", "Foo Group")
+        group.set_loader(loader, s1)
+        self.assertFalse(group.is_loaded())
+        self.assertFalse(group.changed())
+        self.assertEqual(None, group.get_changed())
+        self.assertEqual([], loads)
+
+        self.assertEqual([s1], [x for x in group])
+        self.assertTrue(group.is_loaded())
+        self.assertEqual(1, len(group))
+        self.assertEqual(["foo"], loads)
+
+    def test_lazy_group_append(self):
+        s1 = settings.RadioSetting("s1", "Setting 1")
+        s2 = settings.RadioSetting("s2", "Setting 2")
+        group = settings.RadioSettingGroup("foo", "Foo Group")
+        group.set_loader(lambda group: group.append(s1))
+        group.append(s2)
+        self.assertEqual(["s1", "s2"], group.keys())
+
+
+class TestSettingPaths(base.BaseTest):
+    def test_resolve(self):
+        mem = bitwise.parse("""
+        struct {
+          u8 squelch;
+        } settings;
+        struct {
+          u8 freq;
+        } presets[2];
+        """, memmap.MemoryMap("\x00" * 3))
+        paths = settings.SettingPaths(mem, mem.settings)
+
+        obj, attr = paths.resolve("squelch")
+        self.assertEqual("squelch", attr)
+        setattr(obj, attr, 5)
+        self.assertEqual(5, mem.settings.squelch)
+
+        obj, attr = paths.resolve("presets/1.freq")
+        self.assertEqual("freq", attr)
+        setattr(obj, attr, 7)
+        self.assertEqual(7, mem.presets[1].freq)
+        self.assertEqual((obj, attr), paths.resolve("presets/1.freq"))
@@ -0,0 +1,148 @@
+from tests.unit import base
+from chirp import errors
+from chirp import transport
+
+
+class FakePipe(object):
+    """A pipe that returns the queued chunks of data, one per read"""
+
+    def __init__(self, chunks, echo=False):
+        self.chunks = list(chunks)
+        self.echo = echo
+        self.written = ""
+
+    def read(self, size):
+        if not self.chunks:
+            return ""
+        chunk = self.chunks.pop(0)
+        if len(chunk) > size:
+            self.chunks.insert(0, chunk[size:])
+            chunk = chunk[:size]
+        return chunk
+
+    def write(self, data):
+        self.written += data
+        if self.echo:
+            self.chunks.insert(0, data)
+
+
+class TestSerialTransport(base.BaseTest):
+    def test_read_exact(self):
+        stream = transport.SerialTransport(FakePipe(["ab", "", "cdef"]))
+        self.assertRaises(errors.RadioError, stream.read_exact, 4)
+        self.assertEqual("abcd", stream.read_exact(4))
+        self.assertEqual("ef", stream.read_exact(2))
+        self.assertEqual(1, stream.stats.timeouts)
+        self.assertEqual(6, stream.stats.bytes_read)
+
+    def test_read_exact_attempts(self):
+        stream = transport.SerialTransport(FakePipe(["ab", "", "", "cd"]))
+        self.assertEqual("abcd", stream.read_exact(4, attempts=3))
+
+    def test_read_exact_deadline(self):
+        stream = transport.SerialTransport(FakePipe(["ab"]))
+        self.assertRaises(errors.RadioError, stream.read_exact, 4, 0)
+
+    def test_read(self):
+        stream = transport.SerialTransport(FakePipe(["abc", "defg"]))
+        self.assertEqual("ab", stream.read(2))
+        self.assertEqual("c", stream.read(3))
+        self.assertEqual("def", stream.read(3))
+        self.assertEqual("g", stream.read(3))
+        self.assertEqual("", stream.read(3))
+
+    def test_read_until(self):
+        stream = transport.SerialTransport(FakePipe(["ID0", "19\rFV", "1",
+                                                     ".0\r", "xx"]))
+        self.assertEqual("ID019\r", stream.read_until("\r"))
+        self.assertEqual("FV1.0\r", stream.read_until("\r"))
+        self.assertEqual("xx", stream.read_until("\r"))
+
+    def test_read_until_split_delimiter(self):
+        stream = transport.SerialTransport(FakePipe(["abc\r", "\ndef"]))
+        self.assertEqual("abc\r\n", stream.read_until("\r\n"))
+        self.assertEqual("def", stream.read(3))
+
+    def test_buffer_grows(self):
+        data = "".join([chr(i % 256) for i in range(0, 1000)])
+        stream = transport.SerialTransport(FakePipe([data]), bufsize=16)
+        self.assertEqual(data[:10], stream.read_exact(10))
+        self.assertEqual(data[10:], stream.read_exact(990))
+
+    def test_echo(self):
+        pipe = FakePipe(["\x06", "DATA"], echo=True)
+        stream = transport.SerialTransport(pipe, echo=True)
+        stream.write("\x06")
+        self.assertEqual("\x06", stream.read_exact(1))
+        stream.write("CMD")
+        self.assertEqual("DATA", stream.read_exact(4))
+        self.assertEqual(4, stream.stats.echo_bytes)
+        self.assertEqual("\x06CMD", pipe.written)
+
+    def test_echo_missing(self):
+        stream = transport.SerialTransport(FakePipe(["\x06DATA"]), echo=True)
+        stream.write("\x06")
+        stream.write("CMD")
+        self.assertEqual("\x06DATA", stream.read_exact(5))
+        self.assertEqual(0, stream.stats.echo_bytes)
+
+
+class FakeRadio(object):
+    """Answers requests in the order sent, or in the order given by
+    @order, timing out on the request @lose"""
+
+    def __init__(self, order=None, lose=None):
+        self.order = order
+        self.lose = lose
+        self.pending = []
+        self.max_pending = 0
+        self.flushed = False
+
+    def send(self, request):
+        self.pending.append(request)
+        self.max_pending = max(self.max_pending, len(self.pending))
+
+    def receive(self, oldest):
+        if self.order:
+            request = self.order.pop(0)
+            self.pending.remove(request)
+        else:
+            request = self.pending.pop(0)
+        if request == self.lose:
+            raise errors.RadioError("Timeout")
+        return request, "response %s" % request
+
+    def flush(self):
+        self.flushed = True
+
+
+class TestPipeline(base.BaseTest):
+    def _run(self, radio, count, depth=4):
+        pipeline = transport.Pipeline(radio.send, radio.receive, depth,
+                                      radio.flush)
+        return pipeline.run([(i, i) for i in range(0, count)])
+
+    def test_in_order(self):
+        radio = FakeRadio()
+        results = self._run(radio, 10)
+        self.assertEqual(dict([(i, "response %i" % i)
+                               for i in range(0, 10)]), results)
+        self.assertEqual(4, radio.max_pending)
+        self.assertFalse(radio.flushed)
+
+    def test_out_of_order(self):
+        radio = FakeRadio(order=[1, 0, 3, 2, 4])
+        results = self._run(radio, 5)
+        self.assertEqual(5, len(results))
+        self.assertEqual("response 3", results[3])
+
+    def test_depth_one(self):
+        radio = FakeRadio()
+        self.assertEqual(3, len(self._run(radio, 3, depth=1)))
+        self.assertEqual(1, radio.max_pending)
+
+    def test_lost(self):
+        radio = FakeRadio(lose=2)
+        results = self._run(radio, 10)
+        self.assertEqual([0, 1], sorted(results.keys()))
+        self.assertTrue(radio.flushed)
@@ -0,0 +1,85 @@
+import os
+import time
+
+from tests.unit import base
+from chirp import directory
+from chirp import errors
+from chirp import memmap
+from chirp import pacing
+from chirp import settings
+from chirp.drivers import bjuv55
+from chirp.drivers import uv5r
+
+IMAGES = os.path.join(os.path.dirname(__file__), "..", "images")
+
+
+class FakePipe(object):
+    def __init__(self, answers):
+        self.answers = list(answers)
+        self.written = []
+
+    def write(self, data):
+        self.written.append(data)
+
+    def read(self, count):
+        return self.answers.pop(0)
+
+
+class FakeRadio(object):
+    def __init__(self, pipe):
+        self.pipe = pipe
+
+
+class TestUV5RFamily(base.BaseTest):
+    def _family(self):
+        return [cls for cls in directory.DRV_TO_RADIO.values()
+                if issubclass(cls, uv5r.BaofengUV5R)]
+
+    def _radio(self, cls):
+        image = file(os.path.join(IMAGES, "Baofeng_UV-5R.img"), "rb")
+        radio = cls(memmap.MemoryMap(image.read()))
+        image.close()
+        return radio
+
+    def _squelch(self, level):
+        basic = settings.RadioSettingGroup("basic", "Basic Settings")
+        basic.append(settings.RadioSetting(
+            "squelch", "Carrier Squelch Level",
+            settings.RadioSettingValueInteger(0, 9, level)))
+        return settings.RadioSettings(basic)
+
+    def test_family(self):
+        self.assertTrue(bjuv55.BaojieBJUV55Radio in self._family())
+
+    def test_set_settings(self):
+        for cls in self._family():
+            radio = self._radio(cls)
+            radio.set_settings(self._squelch(7))
+            self.assertEqual(7, int(radio._memobj.settings.squelch),
+                             cls.__name__)
+
+
+class TestUV5RPacing(base.BaseTest):
+    def setUp(self):
+        super(TestUV5RPacing, self).setUp()
+        self.pacer = pacing.Pacer("block_delay", 0.05, 0.01)
+        self.mox.stubs.Set(uv5r, "_get_pacer", lambda radio: self.pacer)
+        self.mox.stubs.Set(time, "sleep", lambda secs: None)
+
+    def test_send_block_retry(self):
+        for i in range(0, pacing.PROBE_INTERVAL):
+            self.pacer.ok()
+        self.assertAlmostEqual(0.04, self.pacer.delay)
+
+        # The block refused at the shorter delay is sent again
+        pipe = FakePipe(["", "\x06"])
+        uv5r._send_block(FakeRadio(pipe), 0x10, "\x00" * 16)
+        self.assertEqual(2, len(pipe.written))
+        self.assertEqual(pipe.written[0], pipe.written[1])
+        self.assertEqual(0.05, self.pacer.delay)
+
+        # Refused at the delay that is known to work, it fails the clone
+        pipe = FakePipe([""])
+        self.assertRaises(errors.RadioError, uv5r._send_block,
+                          FakeRadio(pipe), 0x10, "\x00" * 16)
+        self.assertEqual(1, len(pipe.written))
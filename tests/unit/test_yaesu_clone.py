@@ -0,0 +1,132 @@
+from tests.unit import base
+from chirp import aio
+from chirp import errors
+from chirp import memmap
+from chirp.drivers import yaesu_clone
+
+
+class FakePipe(object):
+    """Acks each block written but the last, echoing what is written if
+    @echo (like a 2-pin cable)"""
+
+    def __init__(self, block_lengths, echo=False):
+        self.acks = []
+        pos = 0
+        for length in block_lengths[:-1]:
+            pos += length
+            self.acks.append(pos)
+        self.echo = echo
+        self.pending = ""
+        self.written = ""
+
+    @property
+    def in_waiting(self):
+        return len(self.pending)
+
+    def read(self, size):
+        data = self.pending[:size]
+        self.pending = self.pending[size:]
+        return data
+
+    def write(self, data):
+        self.written += data
+        if self.echo:
+            self.pending += data
+        if self.acks and len(self.written) == self.acks[0]:
+            self.acks.pop(0)
+            self.pending += "\x06"
+
+
+class FakeSendingPipe(FakePipe):
+    """Sends @data in blocks, each after the last but one is acked"""
+
+    def __init__(self, block_lengths, data, echo=False):
+        FakePipe.__init__(self, block_lengths, echo)
+        self.blocks = []
+        pos = 0
+        for length in block_lengths:
+            self.blocks.append(data[pos:pos + length])
+            pos += length
+        self.pending = self.blocks.pop(0)
+
+    def write(self, data):
+        self.written += data
+        if self.echo:
+            self.pending += data
+        if data == "\x06" and self.blocks:
+            self.pending += self.blocks.pop(0)
+
+
+class FakeRadio(object):
+    _block_lengths = [4, 6, 8]
+    _block_size = 4
+
+    def __init__(self, data, echo=False):
+        self._mmap = memmap.MemoryMap(data)
+        self.pipe = FakePipe(self._block_lengths, echo)
+
+    def get_mmap(self):
+        return self._mmap
+
+    def get_memsize(self):
+        return sum(self._block_lengths)
+
+    def status_fn(self, status):
+        pass
+
+
+class TestCloneOut(base.BaseTest):
+    def setUp(self):
+        super(TestCloneOut, self).setUp()
+        self.mox.stubs.Set(yaesu_clone.time, 'sleep', lambda secs: None)
+
+    def _test_clone_out(self, data, echo):
+        radio = FakeRadio(data, echo)
+        yaesu_clone._clone_out(radio)
+        self.assertEqual(data, radio.pipe.written)
+
+    def test_clone_out(self):
+        self._test_clone_out("ABCD" + "EFGHIJ" + "KLMNOPQR", False)
+
+    def test_clone_out_echo(self):
+        self._test_clone_out("ABCD" + "EFGHIJ" + "KLMNOPQR", True)
+
+    def test_clone_out_ack_like_blocks(self):
+        self._test_clone_out("\x06BCD" + "\x06FGHIJ" + "KLMNOPQR", False)
+
+    def test_clone_out_ack_like_blocks_echo(self):
+        self._test_clone_out("\x06BCD" + "\x06FGHIJ" + "KLMNOPQR", True)
+
+    def test_clone_out_no_ack(self):
+        radio = FakeRadio("ABCD" + "EFGHIJ" + "KLMNOPQR")
+        radio.pipe.acks = []
+        self.assertRaises(errors.RadioError, yaesu_clone._clone_out, radio)
+
+    def test_clone_out_loop(self):
+        data = "\x06BCD" + "EFGHIJ" + "KLMNOPQR"
+        for echo in (False, True):
+            radio = FakeRadio(data, echo)
+            aio.Loop().run_until_complete(
+                yaesu_clone._clone_out_async(radio))
+            self.assertEqual(data, radio.pipe.written)
+
+
+class TestCloneIn(base.BaseTest):
+    def _test_clone_in(self, echo):
+        data = "\x06BCD" + "EFGHIJ" + "K" * 40
+        radio = FakeRadio("")
+        radio._block_lengths = [4, 6, 40]
+        radio.pipe = FakeSendingPipe(radio._block_lengths, data, echo)
+        self.assertEqual(data, yaesu_clone._clone_in(radio).get_packed())
+        self.assertEqual("\x06\x06", radio.pipe.written)
+
+        radio.pipe = FakeSendingPipe(radio._block_lengths, data, echo)
+        mmap = aio.Loop().run_until_complete(
+            yaesu_clone._clone_in_async(radio))
+        self.assertEqual(data, mmap.get_packed())
+
+    def test_clone_in(self):
+        self._test_clone_in(False)
+
+    def test_clone_in_echo(self):
+        self._test_clone_in(True)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 The CHIRP developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Time drivers cloning with simulated radios (see clonesim.py), to see
+how close each gets to the speed of its serial line and how much of the
+time it spends in its own sleeps.
+
+For each driver, a download and an upload (or, for live radios, a read
+of every memory) are run over a pty at the driver's baud rate, reporting
+the bytes passed each way, the wall time, the throughput and the time
+the driver spent in time.sleep().
+
+Run it from the top of the tree:
+
+    PYTHONPATH=. python tools/clonebench.py [radio ids]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+
+import serial
+
+from chirp import chirp_common, directory, logger, pacing
+from chirp.drivers import *
+import clonesim
+
+LOG = logging.getLogger("clonebench")
+
+IMAGES = os.path.join(os.path.dirname(__file__), "..", "tests", "images")
+
+# Radio ids and images, one or two per protocol family
+CASES = [
+    ("Baofeng_UV-5R", "Baofeng_UV-5R.img"),
+    ("BTECH_UV-25X2", "BTECH_UV-25X2.img"),
+    ("BTECH_UV-2501+220", "BTECH_UV-2501+220.img"),
+    ("Yaesu_VX-5", "Yaesu_VX-5.img"),
+    ("Yaesu_VX-7", "Yaesu_VX-7.img"),
+    ("Yaesu_FT-1802M", "Yaesu_FT-1802M.img"),
+    ("Icom_IC-2820H", "Icom_IC-2820H.img"),
+    ("Icom_IC-2730A", "Icom_IC-2730A.img"),
+    ("Kenwood_TM-D710", "Kenwood_TH-D72_clone_mode.img"),
+]
+
+
+class SleepMeter(object):
+    """Replaces time.sleep() to total the time slept by one thread"""
+
+    def __init__(self):
+        self.thread = threading.current_thread()
+        self.slept = 0.0
+        self._sleep = time.sleep
+
+    def _meter(self, secs):
+        if threading.current_thread() is self.thread:
+            self.slept += secs
+        self._sleep(secs)
+
+    def __enter__(self):
+        time.sleep = self._meter
+        return self
+
+    def __exit__(self, *args):
+        time.sleep = self._sleep
+
+
+class Result(object):
+    def __init__(self, radio, operation):
+        self.radio = radio
+        self.operation = operation
+        self.bytes = 0
+        self.seconds = 0.0
+        self.slept = 0.0
+        self.error = None
+
+    def __str__(self):
+        if self.error:
+            return "%-24s %-8s FAILED: %s" % (self.radio, self.operation,
+                                              self.error)
+        rate = self.seconds and self.bytes / self.seconds or 0
+        return "%-24s %-8s %8i %8.2f %8.0f %8.2f %5.1f%%" % (
+            self.radio, self.operation, self.bytes, self.seconds, rate,
+            self.slept, self.seconds and 100 * self.slept / self.seconds)
+
+
+def _run(rclass, image, operation, throttle):
+    result = Result(rclass.get_name(), operation)
+    sim = clonesim.get_simulator(rclass, image, throttle=throttle)
+    if operation == "upload" and hasattr(sim, "set_upload"):
+        sim.set_upload()
+    # Open the port before the simulator starts talking
+    pipe = serial.Serial(port=sim.port, baudrate=rclass.BAUD_RATE,
+                         rtscts=rclass.HARDWARE_FLOW, timeout=0.25)
+    sim.start()
+    try:
+        with SleepMeter() as meter:
+            start = time.time()
+            radio = rclass(pipe)
+            radio.status_fn = lambda status: None
+            if operation == "download":
+                radio.sync_in()
+            elif operation == "upload":
+                radio.load_mmap(image)
+                radio.sync_out()
+            else:
+                lo, hi = radio.get_features().memory_bounds
+                radio.get_memories(lo, hi)
+            result.seconds = time.time() - start
+            result.slept = meter.slept
+    except Exception, e:
+        LOG.debug("%s %s failed" % (result.radio, operation),
+                  exc_info=True)
+        result.error = e
+    finally:
+        pipe.close()
+        sim.stop()
+    if sim.error and not result.error:
+        result.error = sim.error
+    result.bytes = sim.bytes_in + sim.bytes_out
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time drivers cloning with simulated radios")
+    parser.add_argument("radios", nargs="*",
+                        help="Only these radio ids (e.g. Baofeng_UV-5R)")
+    parser.add_argument("--no-throttle", action="store_true",
+                        help="Pass data as fast as the pty allows")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Let drivers tune their delays (see pacing)")
+    logger.add_arguments(parser)
+    args = parser.parse_args()
+    logger.handle_options(args)
+
+    pacing.ADAPTIVE = args.adaptive
+
+    print "%-24s %-8s %8s %8s %8s %8s %6s" % (
+        "Radio", "Op", "Bytes", "Seconds", "B/s", "Slept", "")
+    failed = False
+    for radio_id, image in CASES:
+        if args.radios and radio_id not in args.radios:
+            continue
+        rclass = directory.get_radio(radio_id)
+        image = os.path.join(IMAGES, image)
+        if issubclass(rclass, chirp_common.LiveRadio):
+            operations = ["memories"]
+        else:
+            operations = ["download", "upload"]
+        for operation in operations:
+            result = _run(rclass, image, operation, not args.no_throttle)
+            failed |= result.error is not None
+            print result
+            sys.stdout.flush()
+
+    return failed and 1 or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,399 @@
+#!/usr/bin/env python
+#
+# Copyright 2026 The CHIRP developers
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Simulated radios for exercising drivers without hardware.
+
+Each simulator runs in a thread on the master side of a pty pair, and
+answers the driver on the slave side (the simulator's port) the way a
+radio of the family would, holding the memory of an image file. Data
+is passed at the serial line's baud rate unless throttling is turned
+off.
+
+Open the port before starting the simulator, as pyserial discards
+anything already waiting when it opens a port.
+"""
+
+import logging
+import os
+import select
+import struct
+import termios
+import threading
+import time
+import tty
+
+from chirp import directory, errors
+from chirp.drivers import btech, icf
+
+LOG = logging.getLogger("clonesim")
+
+# termios speed constants by baud rate
+_SPEEDS = dict([(getattr(termios, "B%i" % rate), rate)
+                for rate in [1200, 2400, 4800, 9600, 19200, 38400, 57600,
+                             115200]
+                if hasattr(termios, "B%i" % rate)])
+
+# Bytes passed at a time when throttling
+_CHUNK = 16
+
+
+class SimulatorStopped(Exception):
+    pass
+
+
+class Simulator(threading.Thread):
+    """The radio end of a pty pair, holding the memory of @image"""
+
+    def __init__(self, image, throttle=True):
+        threading.Thread.__init__(self, name=self.__class__.__name__)
+        self.daemon = True
+        self.radio = directory.get_radio_by_image(image)
+        self.throttle = throttle
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.error = None
+        self._stopping = False
+        self._buf = ""
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+
+    def _baudrate(self):
+        try:
+            speed = termios.tcgetattr(self._slave)[5]
+        except termios.error:
+            speed = None
+        return _SPEEDS.get(speed, self.radio.BAUD_RATE)
+
+    def _wait(self, count):
+        if self.throttle:
+            time.sleep(count * 10.0 / self._baudrate())
+
+    def read(self, count, timeout=None):
+        """Read @count bytes from the driver, or as many as arrive before
+        nothing more has for @timeout seconds, if given"""
+        last = time.time()
+        while len(self._buf) < count:
+            if self._stopping:
+                raise SimulatorStopped()
+            if timeout is not None and time.time() - last > timeout:
+                break
+            ready, _w, _x = select.select([self._master], [], [], 0.01)
+            if ready:
+                self._buf += os.read(self._master, 4096)
+                last = time.time()
+        data = self._buf[:count]
+        self._buf = self._buf[count:]
+        self.bytes_in += len(data)
+        self._wait(len(data))
+        return data
+
+    def write(self, data):
+        """Send @data to the driver"""
+        for i in range(0, len(data), _CHUNK):
+            chunk = data[i:i + _CHUNK]
+            self._wait(len(chunk))
+            os.write(self._master, chunk)
+            self.bytes_out += len(chunk)
+
+    def serve(self):
+        """Talk to the driver until stopped"""
+        raise NotImplementedError()
+
+    def run(self):
+        try:
+            self.serve()
+        except SimulatorStopped:
+            pass
+        except Exception, e:
+            LOG.exception("Simulator failed")
+            self.error = e
+
+    def stop(self):
+        """Stop the simulator and close its pty"""
+        self._stopping = True
+        if self.is_alive():
+            self.join()
+        os.close(self._master)
+        os.close(self._slave)
+
+    def get_image(self):
+        """Return the memory held by the simulated radio"""
+        raise NotImplementedError()
+
+
+class UV5RSimulator(Simulator):
+    """A radio cloned with the uv5r protocol: a magic string and an ident,
+    then 0x40-byte reads ("S") and 0x10-byte writes ("X"), each acked"""
+
+    def __init__(self, image, **kwargs):
+        Simulator.__init__(self, image, **kwargs)
+        data = self.radio.get_mmap().get_packed()
+        self.radio_ident = data[:8]
+        self.memory = bytearray("\xFF" * 0x2000)
+        self.memory[0:0x1800] = data[8:0x1808]
+        aux = data[0x1808:0x1948]
+        self.memory[0x1EC0:0x1EC0 + len(aux)] = aux
+
+    def serve(self):
+        magics = self.radio._idents
+        while True:
+            byte = self.read(1)
+            if byte in [m[0] for m in magics]:
+                magic = byte + self.read(len(magics[0]) - 1, 0.5)
+                if magic in magics:
+                    self.write("\x06")
+            elif byte == "\x02":
+                self.write(self.radio_ident)
+            elif byte == "\x06":
+                self.write("\x06")
+            elif byte == "S":
+                addr, size = struct.unpack(">HB", self.read(3))
+                self.write(struct.pack(">BHB", ord("X"), addr, size) +
+                           str(self.memory[addr:addr + size]))
+            elif byte == "X":
+                addr, size = struct.unpack(">HB", self.read(3))
+                self.memory[addr:addr + size] = self.read(size)
+                self.write("\x06")
+
+    def get_image(self):
+        return self.radio_ident + str(self.memory[0:0x1800]) + \
+            str(self.memory[0x1EC0:0x2000])
+
+
+class BTECHSimulator(Simulator):
+    """A radio cloned with the btech protocol: a magic string and a
+    49-byte ident (and for some, an extra ident read), then framed
+    0x40-byte reads ("S") and 0x10-byte writes ("X")"""
+
+    def __init__(self, image, **kwargs):
+        Simulator.__init__(self, image, **kwargs)
+        self.memory = bytearray(
+            self.radio.get_mmap().get_packed()[:btech.MEM_SIZE])
+
+    def _frame(self, cmd):
+        addr, size = struct.unpack(">HB", self.read(3))
+        if cmd == "S":
+            if self.radio._id2 and addr == 0x3DF0:
+                self.write(self.radio._id2[0].ljust(21, "\xFF"))
+                return
+            self.write(btech.ACK_CMD +
+                       struct.pack(">BHB", ord("X"), addr, size) +
+                       str(self.memory[addr:addr + size]))
+        elif cmd == "X":
+            self.memory[addr:addr + size] = self.read(size)
+            self.write(btech.ACK_CMD)
+
+    def serve(self):
+        magic = self.radio._magic
+        while self.read(len(magic)) != magic:
+            pass
+        self.write(btech.ACK_CMD)
+        self.write(self.radio._fileid[0].ljust(49, "\xFF"))
+
+        while True:
+            byte = self.read(1)
+            if byte == btech.ACK_CMD:
+                byte = self.read(1, 0.02)
+                if not byte:
+                    # A lone ACK asks to start an upload
+                    self.write("\x00" + btech.ACK_CMD)
+                    continue
+            if byte in "SX":
+                self._frame(byte)
+
+    def get_image(self):
+        return str(self.memory)
+
+
+class YaesuSimulator(Simulator):
+    """A radio cloned with the yaesu_clone protocol: the radio sends (or
+    receives) the image in the driver's _block_lengths, acking each block
+    but the last. Call set_upload() first if the driver will upload, as
+    a download starts with the radio sending."""
+
+    def __init__(self, image, **kwargs):
+        Simulator.__init__(self, image, **kwargs)
+        # A real radio's checksums are always valid
+        self.radio.update_checksums()
+        self.memory = self.radio.get_mmap().get_packed()
+        self.upload = False
+
+    def set_upload(self, upload=True):
+        self.upload = upload
+
+    def serve(self):
+        lengths = self.radio._block_lengths
+        pos = 0
+        received = ""
+        for i, length in enumerate(lengths):
+            last = i == len(lengths) - 1
+            if self.upload:
+                received += self.read(length, last and 1 or None)
+                if not last:
+                    self.write("\x06")
+            else:
+                self.write(self.memory[pos:pos + length])
+                if not last:
+                    while self.read(1) != "\x06":
+                        pass
+            pos += length
+        if self.upload:
+            self.memory = received
+        while True:
+            self.read(1)
+
+    def get_image(self):
+        return self.memory
+
+
+class IcomCloneSimulator(Simulator):
+    """A radio cloned with Icom's ICF frames, echoing the driver's frames
+    as the cable would"""
+
+    def __init__(self, image, **kwargs):
+        Simulator.__init__(self, image, **kwargs)
+        # What goes over the wire (for raw radios, with the high bit of
+        # every byte flipped)
+        self.memory = bytearray(self.radio.get_mmap().get_packed()[
+            :self.radio.get_memsize()])
+
+    def _read_frame(self):
+        data = ""
+        while not data.endswith("\xFD"):
+            data += self.read(1)
+        self.write(data)
+        frame = data.lstrip("\xFE")
+        return ord(frame[2]), frame[3:-1]
+
+    def _send_frame(self, cmd, payload):
+        self.write("\xFE\xFE\xEF\xEE%s%s\xFD" % (chr(cmd), payload))
+
+    def _clone_out(self):
+        size = len(self.memory)
+        for addr in range(0, size, 32):
+            length = min(32, size - addr)
+            if size >= 0x10000:
+                chunk = struct.pack(">IB", addr, length)
+            else:
+                chunk = struct.pack(">HB", addr, length)
+            chunk += str(self.memory[addr:addr + length])
+            self._send_frame(icf.CMD_CLONE_DAT,
+                             self.radio.get_payload(chunk, False, True))
+        self._send_frame(icf.CMD_CLONE_END, self.radio.get_endframe())
+
+    def _clone_in(self):
+        while True:
+            cmd, payload = self._read_frame()
+            if cmd == icf.CMD_CLONE_END:
+                self._send_frame(0xE6, "\x00")
+                return
+            elif cmd != icf.CMD_CLONE_DAT:
+                continue
+            data = self.radio.process_frame_payload(payload)
+            if len(self.memory) >= 0x10000:
+                addr, length = struct.unpack(">IB", data[:5])
+                data = data[5:5 + length]
+            else:
+                addr, length = struct.unpack(">HB", data[:3])
+                data = data[3:3 + length]
+            self.memory[addr:addr + length] = data
+
+    def serve(self):
+        while True:
+            cmd, payload = self._read_frame()
+            if cmd == 0xE0:
+                self._send_frame(0xE1, self.radio.get_model() + "\x00" * 4)
+            elif cmd == icf.CMD_CLONE_OUT:
+                self._clone_out()
+            elif cmd == icf.CMD_CLONE_IN:
+                self._clone_in()
+
+    def get_image(self):
+        return str(self.memory)
+
+
+class KenwoodLiveSimulator(Simulator):
+    """A live-mode Kenwood radio of class @rclass, answering the memory
+    (ME) and name (MN) commands of the TM-D710 family with the memories
+    of @image"""
+
+    def __init__(self, rclass, image, **kwargs):
+        Simulator.__init__(self, image, **kwargs)
+        self.live = rclass(None)
+        lo, hi = self.live.get_features().memory_bounds
+        self.memories = {}
+        for mem in self.radio.get_memories(lo, hi):
+            if mem.empty:
+                continue
+            try:
+                self.memories[mem.number] = ",".join(
+                    self.live._make_mem_spec(mem))
+            except Exception:
+                LOG.debug("Skipping memory %i" % mem.number)
+                continue
+            self.memories[mem.number] += "\x00" + mem.name
+
+    def _answer(self, line):
+        if " " in line:
+            cmd, args = line.split(" ", 1)
+        else:
+            cmd, args = line, ""
+        if cmd == "ID":
+            return "ID %s" % self.live.MODEL.split(" ")[0]
+        elif cmd == "AI":
+            return line
+        elif cmd in ("ME", "MN") and "," not in args:
+            number = int(args)
+            if number not in self.memories:
+                return "N"
+            spec, name = self.memories[number].split("\x00")
+            if cmd == "ME":
+                return "ME %03i,%s" % (number, spec)
+            return "MN %03i,%s" % (number, name)
+        return "?"
+
+    def serve(self):
+        line = ""
+        while True:
+            byte = self.read(1)
+            if byte != "\r":
+                line += byte
+                continue
+            self.write(self._answer(line) + "\r")
+            line = ""
+
+    def get_image(self):
+        raise errors.RadioError("A live radio has no image")
+
+
+def get_simulator(rclass, image, **kwargs):
+    """Return a simulator for the protocol of radio class @rclass, holding
+    the memory of @image"""
+    from chirp.drivers import uv5r, yaesu_clone, kenwood_live
+
+    if issubclass(rclass, uv5r.BaofengUV5R):
+        return UV5RSimulator(image, **kwargs)
+    elif issubclass(rclass, btech.BTechMobileCommon):
+        return BTECHSimulator(image, **kwargs)
+    elif issubclass(rclass, yaesu_clone.YaesuCloneModeRadio):
+        return YaesuSimulator(image, **kwargs)
+    elif issubclass(rclass, icf.IcomCloneModeRadio):
+        return IcomCloneSimulator(image, **kwargs)
+    elif issubclass(rclass, kenwood_live.TMD710Radio):
+        return KenwoodLiveSimulator(rclass, image, **kwargs)
+    raise errors.RadioError("No simulator for %s" % rclass.get_name())